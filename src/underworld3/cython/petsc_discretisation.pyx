@@ -4,6 +4,7 @@ import underworld3 as uw
 
 # from cython cimport view  # comment this line to see what will happen
 import numpy as np
+from libc.string cimport memcpy
 
 from underworld3 import _api_tools
 import underworld3.timing as timing
@@ -60,6 +61,186 @@ def petsc_fvm_get_local_cell_sizes(mesh) -> np.array:
         return cell_radii, cell_centroids
 
 
+def petsc_dm_get_closure_points_at_depth(incoming_dm, pStart, pEnd, depth) -> np.ndarray:
+        """
+        Returns the points of the given `depth` (e.g. 0 for vertices) in the transitive closure of each
+        of the points pStart ... pEnd-1 as an array of shape (pEnd-pStart, n). The points are in the same
+        order as `dm.getTransitiveClosure(p)` would return them.
+
+        This is a bulk (C-level) loop that replaces per-point calls from python.
+        NOTE: Assumes uniform element types (every point has the same number of closure points)
+        """
+
+        cdef DM c_dm = incoming_dm
+        cdef PetscInt closure_size = 0
+        cdef PetscInt *closure = NULL
+        cdef PetscInt p, i, q, count, n
+        cdef PetscInt qStart, qEnd
+        cdef PetscInt c_pStart = pStart
+        cdef PetscInt c_pEnd = pEnd
+        cdef long [:, ::1] out_view
+
+        qStart, qEnd = incoming_dm.getDepthStratum(depth)
+
+        if pEnd <= pStart:
+                return np.zeros((0, 0), dtype=np.int64)
+
+        # Number of closure points at this depth (from the first point)
+
+        first_closure = incoming_dm.getTransitiveClosure(pStart)[0]
+        n = np.count_nonzero((first_closure >= qStart) & (first_closure < qEnd))
+
+        out = np.empty((pEnd - pStart, n), dtype=np.int64)
+        out_view = out
+
+        for p in range(c_pStart, c_pEnd):
+                ierr = DMPlexGetTransitiveClosure(c_dm.dm, p, PETSC_TRUE, &closure_size, &closure); CHKERRQ(ierr)
+
+                count = 0
+                for i in range(closure_size):
+                        q = closure[2 * i]
+                        if q >= qStart and q < qEnd:
+                                if count < n:
+                                        out_view[p - c_pStart, count] = q
+                                count += 1
+
+                ierr = DMPlexRestoreTransitiveClosure(c_dm.dm, p, PETSC_TRUE, &closure_size, &closure); CHKERRQ(ierr)
+
+                if count != n:
+                        raise RuntimeError(
+                                f"Point {p} has {count} closure points at depth {depth} (expected {n}) - mixed element types are not supported"
+                        )
+
+        return out
+
+
+def petsc_dm_coordinates_to_reference(incoming_dm, cells, coords) -> np.ndarray:
+        """
+        Maps each point in `coords` to the reference coordinates of the corresponding
+        entry in `cells`. Wraps `DMPlexCoordinatesToReference` which uses a Newton iteration
+        for the (multi)linear map of tensor-product cells. Reference coordinates lie in
+        [-1, 1]^dim if the point is inside the cell.
+        """
+
+        cdef DM c_dm = incoming_dm
+        cdef PetscInt i, n
+        cdef long [::1] cells_view
+        cdef double [:, ::1] coords_view
+        cdef double [:, ::1] ref_view
+
+        cells_c = np.ascontiguousarray(cells, dtype=np.int64)
+        coords_c = np.ascontiguousarray(coords, dtype=np.float64)
+
+        n = cells_c.shape[0]
+        ref = np.zeros((n, incoming_dm.getDimension()), dtype=np.float64)
+
+        if n == 0:
+                return ref
+
+        cells_view = cells_c
+        coords_view = coords_c
+        ref_view = ref
+
+        for i in range(n):
+                ierr = DMPlexCoordinatesToReference(c_dm.dm, cells_view[i], 1, <PetscReal *> &coords_view[i, 0], <PetscReal *> &ref_view[i, 0]); CHKERRQ(ierr)
+
+        return ref
+
+
+def petsc_dm_sync_ghosts(subdms, lvecs, gvecs):
+        """
+        Ghost-value update (local -> global -> local) for a group of (sub)dms and their
+        local / global vectors. The communication for all of the vectors is started
+        before any of it is completed so there is one exchange phase for the group
+        rather than one per vector.
+        """
+
+        cdef DM c_dm
+        cdef Vec c_lvec
+        cdef Vec c_gvec
+
+        n = len(subdms)
+
+        for i in range(n):
+                c_dm = subdms[i]; c_lvec = lvecs[i]; c_gvec = gvecs[i]
+                ierr = DMLocalToGlobalBegin(c_dm.dm, c_lvec.vec, PETSC_INSERT_VALUES, c_gvec.vec); CHKERRQ(ierr)
+
+        for i in range(n):
+                c_dm = subdms[i]; c_lvec = lvecs[i]; c_gvec = gvecs[i]
+                ierr = DMLocalToGlobalEnd(c_dm.dm, c_lvec.vec, PETSC_INSERT_VALUES, c_gvec.vec); CHKERRQ(ierr)
+
+        for i in range(n):
+                c_dm = subdms[i]; c_lvec = lvecs[i]; c_gvec = gvecs[i]
+                ierr = DMGlobalToLocalBegin(c_dm.dm, c_gvec.vec, PETSC_INSERT_VALUES, c_lvec.vec); CHKERRQ(ierr)
+
+        for i in range(n):
+                c_dm = subdms[i]; c_lvec = lvecs[i]; c_gvec = gvecs[i]
+                ierr = DMGlobalToLocalEnd(c_dm.dm, c_gvec.vec, PETSC_INSERT_VALUES, c_lvec.vec); CHKERRQ(ierr)
+
+        return
+
+
+def petsc_dm_set_distribution_name(incoming_dm, name):
+        """
+        Wrapper for PETSc DMPlexDistributionSetName. A named distribution is written
+        with the topology (hdf5 storage version 3) and is restored by topologyLoad
+        when the file is read on the same number of processes.
+        """
+
+        cdef DM c_dm = incoming_dm
+        cdef bytes c_name = name.encode()
+
+        ierr = DMPlexDistributionSetName(c_dm.dm, c_name); CHKERRQ(ierr)
+
+        return
+
+
+def petsc_dm_swarm_copy_points(incoming_dm, fields, src, dst):
+        """
+        Copies the values of swarm points `src` into the slots of points `dst` for each
+        of the named DMSwarm `fields`. The copy is done byte-wise so it works for any
+        field type (petsc4py's getField cannot return PetscInt64 fields such as DMSwarm_pid).
+        The `src` and `dst` points must not overlap.
+        """
+
+        cdef DM c_dm = incoming_dm
+        cdef PetscInt bs
+        cdef PetscDataType ftype
+        cdef size_t size
+        cdef size_t nbytes
+        cdef char *data
+        cdef long [::1] src_view
+        cdef long [::1] dst_view
+        cdef Py_ssize_t i, n
+
+        src_c = np.ascontiguousarray(src, dtype=np.int64)
+        dst_c = np.ascontiguousarray(dst, dtype=np.int64)
+
+        n = src_c.shape[0]
+        if dst_c.shape[0] != n:
+                raise RuntimeError(f"Mismatched point lists ({n} sources, {dst_c.shape[0]} destinations)")
+
+        if n == 0:
+                return
+
+        src_view = src_c
+        dst_view = dst_c
+
+        for name in fields:
+                c_name = name.encode()
+
+                ierr = DMSwarmGetField(c_dm.dm, c_name, &bs, &ftype, <void **> &data); CHKERRQ(ierr)
+                ierr = PetscDataTypeGetSize(ftype, &size); CHKERRQ(ierr)
+
+                nbytes = <size_t> bs * size
+                for i in range(n):
+                        memcpy(data + dst_view[i] * nbytes, data + src_view[i] * nbytes, nbytes)
+
+                ierr = DMSwarmRestoreField(c_dm.dm, c_name, &bs, &ftype, <void **> &data); CHKERRQ(ierr)
+
+        return
+
+
 def petsc_dm_create_submesh_from_label(incoming_dm, boundary_label_name, boundary_label_value, marked_faces=True) -> float:
         """
         Wraps DMPlexCreateSubmesh
@@ -91,12 +272,20 @@ def petsc_dm_find_labeled_points_local(dm, label_name, sectionIndex=False, verbo
         sectionIndex -> False: leave points as indexed by the relevant section on the dm
                         True: index into the local coordinate array
 
-        NOTE: Assumes uniform element types
+        Labelled points of depth 0, 1 and 2 contribute the vertices in their closure.
+        The closures are gathered in a single C-level loop (this is called on every
+        level of a refinement hierarchy, so it should not loop in python).
         '''
 
+        cdef DM c_dm = dm
+        cdef PetscInt closure_size = 0
+        cdef PetscInt *closure = NULL
+        cdef PetscInt i, j, p, q
+        cdef PetscInt c_pStart, c_pEnd
+        cdef long [::1] points_view
+        cdef signed char [::1] mark_view
+
         pStart, pEnd = dm.getDepthStratum(0)
-        eStart, eEnd = dm.getDepthStratum(1)
-        fStart, fEnd = dm.getDepthStratum(2)
 
         label = dm.getLabel(label_name)
         if not label:
@@ -104,45 +293,34 @@ def petsc_dm_find_labeled_points_local(dm, label_name, sectionIndex=False, verbo
                         print(f"Label {label_name} is not present on the dm")
                 return np.array([0])
 
-        pointIS = dm.getStratumIS("depth",0)
-        edgeIS = dm.getStratumIS("depth",1)
-        faceIS = dm.getStratumIS("depth",2)
-
-        # point_indices = pointIS.getIndices()
-        # edge_indices = edgeIS.getIndices()
-        # face_indices = faceIS.getIndices()
-
         _, iset_lab = label.convertToSection()
+        labelled = np.asarray(iset_lab.getIndices(), dtype=np.int64)
 
-        IndicesP = np.intersect1d(iset_lab.getIndices(), pointIS.getIndices())
-        IndicesE = np.intersect1d(iset_lab.getIndices(), edgeIS.getIndices())
-        IndicesF = np.intersect1d(iset_lab.getIndices(), faceIS.getIndices())
-
-        # print(f"Label {label_name}")
-        # print(f"P -> {len(IndicesP)}, E->{len(IndicesE)}, F->{len(IndicesF)},")
-
-        if IndicesF.any():
-                IndicesFe = np.empty((IndicesF.shape[0], dm.getConeSize(fStart)), dtype=int)
-                for f in range(IndicesF.shape[0]):
-                        IndicesFe[f] = dm.getCone(IndicesF[f])
-
-                IndicesE = np.union1d(IndicesE, IndicesFe)
+        depth_points = [dm.getStratumIS("depth", d).getIndices() for d in range(min(2, dm.getDepth()) + 1)]
+        labelled = labelled[np.isin(labelled, np.concatenate(depth_points))]
 
-        # All faces are now recorded as edges
+        c_pStart = pStart
+        c_pEnd = pEnd
 
-        if IndicesE.any():
-                IndicesEp = np.empty((IndicesE.shape[0], dm.getConeSize(eStart)), dtype=int)
-                for e in range(IndicesE.shape[0]):
-                        IndicesEp[e] = dm.getCone(IndicesE[e])
+        mark = np.zeros(pEnd - pStart, dtype=np.int8)
+        mark_view = mark
+        points_view = np.ascontiguousarray(labelled)
 
-                IndicesP = np.union1d(IndicesP, IndicesEp)
+        for i in range(points_view.shape[0]):
+                p = points_view[i]
+                ierr = DMPlexGetTransitiveClosure(c_dm.dm, p, PETSC_TRUE, &closure_size, &closure); CHKERRQ(ierr)
+                for j in range(closure_size):
+                        q = closure[2 * j]
+                        if q >= c_pStart and q < c_pEnd:
+                                mark_view[q - c_pStart] = 1
+                ierr = DMPlexRestoreTransitiveClosure(c_dm.dm, p, PETSC_TRUE, &closure_size, &closure); CHKERRQ(ierr)
 
-        # all faces / edges are now points
+        IndicesP = np.nonzero(mark)[0]
 
-        if IndicesP.any() and not sectionIndex:
-                IndicesP -= pStart
+        if not sectionIndex:
+                return IndicesP
 
-        return IndicesP
+        return IndicesP + pStart
 
 
 ## Todo !
@@ -64,8 +64,27 @@ cdef extern from "petsc.h" nogil:
     PetscErrorCode PetscDSAddBdJacobianPreconditioner( PetscDS, PetscInt, PetscInt, PetscDSBdJacobianFn, PetscDSBdJacobianFn, PetscDSBdJacobianFn, PetscDSBdJacobianFn)
     PetscErrorCode PetscDSAddBdResidual( PetscDS, PetscInt, PetscDSBdResidualFn, PetscDSBdResidualFn )
 
+    PetscErrorCode PetscDSSetConstants( PetscDS, PetscInt, PetscScalar[] )
+
     PetscErrorCode DMPlexCreateSubmesh(PetscDM, PetscDMLabel label, PetscInt value, PetscBool markedFaces, PetscDM *subdm)
+    PetscErrorCode DMPlexGetTransitiveClosure(PetscDM, PetscInt, PetscBool, PetscInt *, PetscInt **)
+    PetscErrorCode DMPlexRestoreTransitiveClosure(PetscDM, PetscInt, PetscBool, PetscInt *, PetscInt **)
+    PetscErrorCode DMPlexCoordinatesToReference(PetscDM, PetscInt, PetscInt, PetscReal[], PetscReal[])
+
+    ctypedef enum PetscInsertMode "InsertMode":
+        PETSC_INSERT_VALUES "INSERT_VALUES"
+
+    PetscErrorCode DMLocalToGlobalBegin(PetscDM, PetscVec, PetscInsertMode, PetscVec)
+    PetscErrorCode DMLocalToGlobalEnd(PetscDM, PetscVec, PetscInsertMode, PetscVec)
+    PetscErrorCode DMGlobalToLocalBegin(PetscDM, PetscVec, PetscInsertMode, PetscVec)
+    PetscErrorCode DMGlobalToLocalEnd(PetscDM, PetscVec, PetscInsertMode, PetscVec)
     PetscErrorCode DMGetLabel(PetscDM dm, const char name[], PetscDMLabel *label)
+    PetscErrorCode DMPlexDistributionSetName(PetscDM, const char[])
+
+    ctypedef int PetscDataType
+    PetscErrorCode PetscDataTypeGetSize(PetscDataType, size_t *)
+    PetscErrorCode DMSwarmGetField(PetscDM, const char[], PetscInt *, PetscDataType *, void **)
+    PetscErrorCode DMSwarmRestoreField(PetscDM, const char[], PetscInt *, PetscDataType *, void **)
 
     # These do not appear to be in the 3.17.2 release
     PetscErrorCode DMProjectCoordinates(PetscDM dm, PetscFE disc)
@@ -4,6 +4,7 @@ import sympy
 from sympy import sympify
 
 from typing import Optional, Union, TypeAlias
+from contextlib import contextmanager
 from petsc4py import PETSc
 
 import underworld3
@@ -48,6 +49,9 @@ class SolverBaseClass(uw_object):
         self.petsc_options_prefix = self.name
         self.petsc_options = PETSc.Options(self.petsc_options_prefix)
 
+        # uw expressions that are passed to the pointwise functions through
+        # the PetscDS constants array (rather than compiled in as numbers)
+        self._constants = []
 
         return
 
@@ -131,6 +135,54 @@ class SolverBaseClass(uw_object):
         def CoordinateSystem(inner_self):
             return inner_self._owning_solver.mesh.CoordinateSystem
 
+    @contextmanager
+    def _constants_as_petsc_symbols(self):
+        """
+        Within this context, the expressions in `self._constants` unwrap to the symbols that
+        are printed as `constants[i]` in the JIT code. Their numerical values are set with
+        `_set_petsc_constants` when the solver is called, so changing them does not
+        trigger a rebuild of the pointwise functions.
+        """
+
+        from underworld3.utilities._jitextension import petsc_constant
+
+        saved = [c._sym for c in self._constants]
+
+        try:
+            for i, c in enumerate(self._constants):
+                c._sym = petsc_constant(i)
+            yield
+        finally:
+            for c, c_sym in zip(self._constants, saved):
+                c._sym = c_sym
+
+        return
+
+    def _set_petsc_constants(self):
+        """Copy the current values of `self._constants` into the PetscDS of the solver"""
+
+        import numpy as np
+
+        cdef DS ds
+        cdef double [::1] values_view
+
+        if len(self._constants) == 0 or self.dm is None:
+            return
+
+        values = np.empty(len(self._constants), dtype=np.float64)
+        for i, c in enumerate(self._constants):
+            values[i] = float(
+                uw.function.expressions.unwrap(c, keep_constants=False, return_self=False)
+            )
+
+        values_view = values
+
+        for dm in self.dm_hierarchy:
+            ds = dm.getDS()
+            ierr = PetscDSSetConstants(ds.ds, values.shape[0], &values_view[0]); CHKERRQ(ierr)
+
+        return
+
     def _object_viewer(self):
         '''This will add specific information about this object to the generic class viewer
         '''
@@ -796,8 +848,9 @@ class SNES_Scalar(SolverBaseClass):
         # f0  = sympy.Array(uw.function.fn_substitute_expressions(self.F0.sym)).reshape(1).as_immutable()
         # F1  = sympy.Array(uw.function.fn_substitute_expressions(self.F1.sym)).reshape(dim).as_immutable()
 
-        f0  = sympy.Array(uw.function.expression.unwrap(self.F0.sym, keep_constants=False, return_self=False)).reshape(1).as_immutable()
-        F1  = sympy.Array(uw.function.expression.unwrap(self.F1.sym, keep_constants=False, return_self=False)).reshape(dim).as_immutable()
+        with self._constants_as_petsc_symbols():
+            f0  = sympy.Array(uw.function.expression.unwrap(self.F0.sym, keep_constants=False, return_self=False)).reshape(1).as_immutable()
+            F1  = sympy.Array(uw.function.expression.unwrap(self.F1.sym, keep_constants=False, return_self=False)).reshape(dim).as_immutable()
 
         self._u_f0 = f0
         self._u_F1 = F1
@@ -987,11 +1040,12 @@ class SNES_Scalar(SolverBaseClass):
             self.is_setup = False
 
         self._build(verbose, debug, debug_name)
+        self._set_petsc_constants()
 
         gvec = self.dm.getGlobalVec()
 
         if not zero_init_guess:
-            with self.mesh.access():
+            with self.mesh.access(read=[self.u]):
                 self.dm.localToGlobal(self.u.vec, gvec)
         else:
             gvec.array[:] = 0.0
@@ -1040,6 +1094,83 @@ class SNES_Scalar(SolverBaseClass):
 
         return
 
+    ## Matrix-free building blocks for explicit time integration (see SNES_AdvectionDiffusion)
+
+    @timing.routine_timer_decorator
+    def _lumped_mass(self):
+        """
+        The lumped (diagonal) mass matrix of the unknown as a global vector.
+        The diagonal of the consistent mass matrix is rescaled to preserve the
+        total mass (HRZ lumping) so that it remains positive for quadratic elements.
+        This is cached until the solver dm is rebuilt.
+        """
+
+        if getattr(self, "_lumped_mass_vec", None) is not None:
+            if self._lumped_mass_dm is self.dm:
+                return self._lumped_mass_vec
+            self._lumped_mass_vec.destroy()
+
+        M = self.dm.createMassMatrix(self.dm)
+        mass_diag = M.getDiagonal()
+
+        ones = mass_diag.duplicate()
+        ones.set(1.0)
+        row_sums = mass_diag.duplicate()
+        M.mult(ones, row_sums)
+
+        mass_diag.scale(row_sums.sum() / mass_diag.sum())
+
+        ones.destroy()
+        row_sums.destroy()
+        M.destroy()
+
+        self._lumped_mass_vec = mass_diag
+        self._lumped_mass_dm = self.dm
+
+        return mass_diag
+
+    @timing.routine_timer_decorator
+    def _evaluate_residual(self, gvec, fvec):
+        """
+        Evaluate the (global) residual of the discrete system for the unknowns in `gvec`.
+        The solver should already be set up (`_build`).
+        """
+
+        cdef DM dm = self.dm
+        self.mesh.update_lvec()
+        cdef Vec cmesh_lvec = self.mesh.lvec
+
+        ierr = DMSetAuxiliaryVec_UW(dm.dm, NULL, 0, 0, cmesh_lvec.vec); CHKERRQ(ierr)
+
+        self.snes.computeFunction(gvec, fvec)
+
+        return
+
+    def _u_to_global(self, gvec):
+        """Copy the unknown `u` into a global vector of the solver dm"""
+
+        with self.mesh.access(read=[self.u]):
+            self.dm.localToGlobal(self.u.vec, gvec)
+
+        return
+
+    def _u_from_global(self, gvec):
+        """Copy a global vector of the solver dm back into `u` (inserting the boundary values)"""
+
+        cdef DM dm = self.dm
+
+        lvec = self.dm.getLocalVec()
+        cdef Vec clvec = lvec
+
+        with self.mesh.access(self.u,):
+            self.dm.globalToLocal(gvec, lvec)
+            ierr = DMPlexSNESComputeBoundaryFEM(dm.dm, <void*>clvec.vec, NULL); CHKERRQ(ierr)
+            self.u.vec.array[:] = lvec.array[:]
+
+        self.dm.restoreLocalVec(lvec)
+
+        return
+
     def _object_viewer(self):
         '''This will add specific information about this object to the generic class viewer
         '''
@@ -1661,7 +1792,7 @@ class SNES_Vector(SolverBaseClass):
         gvec = self.dm.getGlobalVec()
 
         if not zero_init_guess:
-            with self.mesh.access():
+            with self.mesh.access(read=[self.u]):
                 self.dm.localToGlobal(self.u.vec, gvec)
         else:
             gvec.array[:] = 0.
@@ -2809,7 +2940,7 @@ class SNES_Stokes_SaddlePt(SolverBaseClass):
             self.snes.setFromOptions()
             self.snes.solve(None, gvec)
 
-            with self.mesh.access():
+            with self.mesh.access(read=list(self.fields.values())):
                 for name,var in self.fields.items():
                     sgvec = gvec.getSubVector(self._subdict[name][0])  # Get global subvec off solution gvec.
                     subdm   = self._subdict[name][1]                   # Get subdm corresponding to field
@@ -2941,26 +3072,23 @@ class SNES_Stokes_SaddlePt(SolverBaseClass):
     def estimate_dt(self):
         """
         Calculates an appropriate advective timestep for the given
-        mesh and velocity configuration.
+        mesh and velocity configuration. This is done on an element by element
+        basis (cell radius / velocity at the cell centroid) and the per-cell values
+        are retained in `self.dt_adv_cells` for diagnostics.
         """
-        # we'll want to do this on an element by element basis
-        # for more general mesh
-
-        # first let's extract a max global velocity magnitude
-        import math
 
-        with self.mesh.access():
-            vel = self.u.data
-            magvel_squared = vel[:, 0] ** 2 + vel[:, 1] ** 2
-            if self.mesh.dim == 3:
-                magvel_squared += vel[:, 2] ** 2
+        import numpy as np
+        from mpi4py import MPI
 
-            max_magvel = math.sqrt(magvel_squared.max())
+        dt_adv_cells, _ = self.mesh.estimate_dt_per_cell(V_fn=self.u.sym)
+        self.dt_adv_cells = dt_adv_cells
 
-        from mpi4py import MPI
+        if dt_adv_cells.shape[0] > 0:
+            dt_local = dt_adv_cells.min()
+        else:
+            dt_local = np.inf
 
         comm = uw.mpi.comm
-        max_magvel_glob = comm.allreduce(max_magvel, op=MPI.MAX)
+        dt_glob = comm.allreduce(dt_local, op=MPI.MIN)
 
-        min_dx = self.mesh.get_min_radius()
-        return min_dx / max_magvel_glob
+        return dt_glob
@@ -81,9 +81,12 @@ def _from_gmsh(
         options.delValue("dm_plex_gmsh_mark_vertices")
 
     # this process is more efficient done on the root process and then distributed
-    # we do this by saving the mesh as h5 which is more flexible to re-use later
+    # we do this by saving the mesh as h5 which is more flexible to re-use later.
+    # Meshes from the uw.meshing cache already have an up-to-date h5 version.
 
-    if uw.mpi.rank == 0:
+    from underworld3.meshing import _mesh_cache_hit
+
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(filename):
         plex_0 = PETSc.DMPlex().createFromFile(
             filename, interpolate=True, comm=PETSc.COMM_SELF
         )
@@ -133,6 +136,20 @@ def _from_plexh5(
 
     # h5plex = PETSc.DMPlex().createFromFile(filename, comm=comm)
     h5plex = PETSc.DMPlex().create(comm=comm)
+
+    # Files written by Mesh.write_distributed carry the partition that was
+    # used to save them. If we have the same number of processes, ask for
+    # that partition to be restored rather than loading in file order.
+
+    partition = _distributed_mesh_partition(filename)
+    if partition is not None:
+        # The topology is stored under the name of the dm that was saved
+        h5plex.setName(partition.get("dm_name", "uw_mesh"))
+        if partition["comm_size"] == comm.getSize():
+            petsc_discretisation.petsc_dm_set_distribution_name(
+                h5plex, partition["name"]
+            )
+
     sf0 = h5plex.topologyLoad(viewer)
     h5plex.coordinatesLoad(viewer, sf0)
     h5plex.labelsLoad(viewer, sf0)
@@ -147,6 +164,118 @@ def _from_plexh5(
         return sf0, h5plex
 
 
+def _distributed_mesh_partition(filename):
+    """Partition metadata written by Mesh.write_distributed (or None)"""
+
+    import h5py, json
+
+    try:
+        with h5py.File(filename, "r") as f:
+            json_str = f["metadata"].attrs["partition"]
+    except (KeyError, OSError):
+        return None
+
+    return json.loads(json_str)
+
+
+def _write_distributed_arrays(filename, arrays):
+    """
+    Collectively write one array per process for each entry of `arrays`
+    ({group name: local array}, the same names on every process) to the
+    `metadata` group of the hdf5 file. The local arrays are concatenated in
+    rank order into a single dataset (`<group>/values`) through a PETSc Vec,
+    so no process holds more than its own part. Only the shape of each
+    local array is gathered (to `<group>/shapes`) so that each process can
+    find its slab again with `_read_distributed_array`.
+    """
+
+    import h5py
+
+    names = list(arrays.keys())
+    shapes = uw.mpi.comm.gather([numpy.shape(arrays[name]) for name in names], root=0)
+
+    if uw.mpi.rank == 0:
+        with h5py.File(filename, "a") as f:
+            g = f.require_group("metadata")
+            for i, name in enumerate(names):
+                ndim = max(len(rank_shapes[i]) for rank_shapes in shapes)
+                table = numpy.full((len(shapes), ndim), -1, dtype=numpy.int64)
+                for rank, rank_shapes in enumerate(shapes):
+                    table[rank, 0 : len(rank_shapes[i])] = rank_shapes[i]
+
+                group = g.require_group(name)
+                group.create_dataset("shapes", data=table)
+                group.attrs["dtype"] = numpy.asarray(arrays[name]).dtype.str
+
+    uw.mpi.barrier()
+
+    viewer = PETSc.ViewerHDF5().create(filename, "a", comm=PETSc.COMM_WORLD)
+
+    for name in names:
+        values = numpy.asarray(arrays[name], dtype=numpy.float64).reshape(-1)
+
+        vec = PETSc.Vec().createMPI((values.size, PETSc.DECIDE), comm=PETSc.COMM_WORLD)
+        if vec.getSize() > 0:
+            vec.array[...] = values
+            vec.setName("values")
+            viewer.pushGroup(f"/metadata/{name}")
+            viewer(vec)
+            viewer.popGroup()
+        vec.destroy()
+
+    viewer.destroy()
+
+    return
+
+
+def _read_distributed_array(group):
+    """
+    This process's part of an array written by `_write_distributed_arrays`
+    (`group` is the open h5py group of the array).
+    """
+
+    shapes = group["shapes"][()]
+    sizes = numpy.array([numpy.prod(row[row >= 0]) for row in shapes], dtype=numpy.int64)
+
+    shape = tuple(int(n) for n in shapes[uw.mpi.rank] if n >= 0)
+    dtype = numpy.dtype(group.attrs["dtype"])
+
+    start = int(sizes[0 : uw.mpi.rank].sum())
+    end = start + int(sizes[uw.mpi.rank])
+
+    if end == start:
+        return numpy.zeros(shape, dtype=dtype)
+
+    return group["values"][start:end].astype(dtype).reshape(shape)
+
+
+def _distributed_mesh_refined_coordinates(filename, refinement):
+    """
+    The local coordinates of each refinement level of this process's part of the
+    mesh, as saved by Mesh.write_distributed (or None if they cannot be used here).
+    """
+
+    import h5py
+
+    partition = _distributed_mesh_partition(filename)
+    if (
+        partition is None
+        or partition["comm_size"] != uw.mpi.size
+        or partition["refinement"] != refinement
+    ):
+        return None
+
+    with h5py.File(filename, "r") as f:
+        try:
+            g = f["metadata"]["refined_coordinates"]
+            return [
+                _read_distributed_array(g[f"level_{i+1:02d}"]).reshape(-1)
+                for i in range(refinement)
+            ]
+        except KeyError:
+            return None
+
+
 class Mesh(Stateful, uw_object):
     r"""
     Mesh class for uw - documentation needed
@@ -182,6 +311,8 @@ class Mesh(Stateful, uw_object):
         Mesh.mesh_instances += 1
 
         comm = PETSc.COMM_WORLD
+        geometry_file = None
+        distributed_file = None
 
         if isinstance(plex_or_meshfile, PETSc.DMPlex):
             isDistributed = plex_or_meshfile.isDistributed()
@@ -256,6 +387,31 @@ class Mesh(Stateful, uw_object):
                 except KeyError:
                     pass
 
+                # Distributed mesh files record how many times they were refined
+                # and may hold the derived geometry for each process
+                try:
+                    json_str = f["metadata"].attrs["partition"]
+                    partition = json.loads(json_str)
+                    if refinement is None:
+                        refinement = partition["refinement"]
+                    geometry_file = plex_or_meshfile
+                    distributed_file = plex_or_meshfile
+
+                    if (
+                        partition.get("refinement_callback", False)
+                        and partition["comm_size"] != uw.mpi.size
+                        and refinement_callback is None
+                        and uw.mpi.rank == 0
+                    ):
+                        print(
+                            f"Warning: {plex_or_meshfile} was refined with a refinement_callback. "
+                            "Its refined coordinates can only be restored on the same number of "
+                            "processes; pass the same `refinement_callback` to reproduce them.",
+                            flush=True,
+                        )
+                except KeyError:
+                    pass
+
                 f.close()
 
                 # This needs to be done when reading a dm from a checkpoint
@@ -362,27 +518,69 @@ class Mesh(Stateful, uw_object):
 
         uw.mpi.barrier()
 
+        # Wall time (refine, callback) for each level of the hierarchy
+        self._refinement_timings = []
+
         if not refinement is None and refinement > 0:
 
             self.dm.setRefinementUniform()
 
+            # The coarse mesh is distributed first, then every level is refined
+            # in parallel. Refinement and the callbacks (which only see the local
+            # coordinates of each level) need no further communication. The
+            # callback is applied to the coarse level too, so each level is
+            # refined from boundary-conforming coordinates.
+
             if not self.dm.isDistributed():
                 self.dm.distribute()
 
+            if callable(refinement_callback):
+                refinement_callback(self.dm)
+
+            # A distributed mesh file holds the coordinates of each refined level
+            # (e.g. after boundary snapping) which replace the callback on reload
+            refined_coordinates = None
+            if distributed_file is not None:
+                refined_coordinates = _distributed_mesh_refined_coordinates(
+                    distributed_file, refinement
+                )
+
             # self.dm_hierarchy = self.dm.refineHierarchy(refinement)
 
             # This is preferable to the refineHierarchy call
             # because we can repair the refined mesh at each
             # step along the way
 
+            import time
+
             self.dm_hierarchy = [self.dm]
             for i in range(refinement):
+                t0 = time.time()
                 dm_refined = self.dm_hierarchy[i].refine()
                 dm_refined.setCoarseDM(self.dm_hierarchy[i])
+                t1 = time.time()
+
+                stored = None
+                if refined_coordinates is not None:
+                    stored = refined_coordinates[i]
 
-                if callable(refinement_callback):
+                c = dm_refined.getCoordinatesLocal()
+                if stored is not None and stored.size == c.array.size:
+                    c.array[...] = stored.reshape(-1)
+                    dm_refined.setCoordinatesLocal(c)
+                elif callable(refinement_callback):
                     refinement_callback(dm_refined)
 
+                t2 = time.time()
+                self._refinement_timings.append((i + 1, t1 - t0, t2 - t1))
+
+                if verbose and uw.mpi.rank == 0:
+                    print(
+                        f"Refinement level {i+1}: {dm_refined.getChart()[1]} local points, "
+                        f"refine {t1-t0:.3f}s, callback {t2-t1:.3f}s",
+                        flush=True,
+                    )
+
                 self.dm_hierarchy.append(dm_refined)
 
             # self.dm_hierarchy = [self.dm] + self.dm_hierarchy
@@ -390,11 +588,6 @@ class Mesh(Stateful, uw_object):
             self.dm_h = self.dm_hierarchy[-1]
             self.dm_h.setName("uw_hierarchical_dm")
 
-            # Is this needed here, after the above calls ?
-            if callable(refinement_callback):
-                for dm in self.dm_hierarchy:
-                    refinement_callback(dm)
-
             # Single level equivalent dm (needed for aux vars ?? Check this - LM)
             self.dm = self.dm_h.clone()
 
@@ -430,6 +623,9 @@ class Mesh(Stateful, uw_object):
             self.dm_hierarchy = [self.dm]
             self.dm_h = self.dm.clone()
 
+        # Connectivity arrays are (re)built lazily for the final topology
+        self._invalidate_topology_caches()
+
         # This will be done anyway - the mesh maybe in a
         # partially adapted state
 
@@ -506,6 +702,10 @@ class Mesh(Stateful, uw_object):
         self._quadrature = False
         self._stale_lvec = True
         self._lvec = None
+        self._field_decomposition = None
+        self._pending_ghost_sync = {}
+        self._stale_proxies = {}
+        self._solver_variables = set()
         self.petsc_fe = None
 
         self.degree = degree
@@ -573,6 +773,10 @@ class Mesh(Stateful, uw_object):
         else:
             self.vector = uw.maths.vector_calculus(mesh=self)
 
+        # Derived geometry saved with a distributed mesh file
+        if geometry_file is not None:
+            self._load_geometry_arrays(geometry_file)
+
         super().__init__()
 
     @property
@@ -888,6 +1092,9 @@ class Mesh(Stateful, uw_object):
 
         self._coord_array = {}
 
+        # the coordinate discretisation is re-created below
+        self._destroy_coordinate_interpolation()
+
         # let's go ahead and do an initial projection from linear (the default)
         # to linear. this really is a nothing operation, but a
         # side effect of this operation is that coordinate DM DMField is
@@ -916,6 +1123,20 @@ class Mesh(Stateful, uw_object):
         else:
             self.dm.setCoordinateDisc(disc=self.petsc_fe, project=False)
 
+        self._invalidate_coordinate_caches()
+
+        self.dm.copyDS(self.dm_hierarchy[-1])
+
+        return
+
+    def _invalidate_coordinate_caches(self):
+        """
+        Discard everything that is derived from the mesh coordinates: the coordinate
+        arrays for other bases, the cell-search k-d trees, the face control points and
+        the cell sizes / centroids. Apart from the native coordinate array, these are
+        rebuilt lazily on first use. Topology-dependent data (connectivity) is retained.
+        """
+
         # now set copy of this array into dictionary
 
         arr = self.dm.getCoordinatesLocal().array
@@ -926,20 +1147,274 @@ class Mesh(Stateful, uw_object):
             True,
         )  # True here assumes continuous basis for coordinates ...
 
+        self._coord_array = {}
         self._coord_array[key] = arr.reshape(-1, self.cdim).copy()
 
-        # invalidate the cell-search k-d tree and the mesh centroid data / rebuild
+        # interpolation operators are rebuilt for the new coordinates
+        self._destroy_coordinate_interpolation(matrices_only=True)
+
+        # invalidate the cell-search k-d tree and the mesh centroid data
         self._index = None
+        self._centroid_index = None
+
+        self.faces_inner_control_points = None
+        self.faces_outer_control_points = None
+        self.boundary_face_control_points = None
+        self.boundary_face_control_points_kdtree = None
+        self.boundary_face_control_points_sign = None
+
+        self._mesh_sizes = None
+        self._partition_map = None
+
+        # a lattice layout only describes the undeformed mesh
+        self._lattice = None
+
+        return
+
+    def _get_cached_mesh_sizes(self):
+        if getattr(self, "_mesh_sizes", None) is None:
+            self._mesh_sizes = self._get_mesh_sizes()
+
+        return self._mesh_sizes
+
+    @property
+    def _min_size(self):
+        return self._get_cached_mesh_sizes()[0]
+
+    @property
+    def _radii(self):
+        return self._get_cached_mesh_sizes()[1]
+
+    @property
+    def _centroids(self):
+        return self._get_cached_mesh_sizes()[2]
+
+    @property
+    def _search_lengths(self):
+        return self._get_cached_mesh_sizes()[3]
+
+    def _geometry_checksum(self):
+        """
+        Checksum of the local topology and coordinates. Derived geometry that was
+        saved for a mesh is only valid if this matches on reload.
+        """
+
+        import hashlib
+
+        checksum = hashlib.sha1()
+        checksum.update(numpy.array(self.dm.getChart(), dtype=numpy.int64).tobytes())
+        checksum.update(numpy.ascontiguousarray(self.cell_vertices).tobytes())
+        checksum.update(numpy.ascontiguousarray(self.data).tobytes())
+
+        return checksum.hexdigest()
+
+    def _get_geometry_arrays(self):
+        """
+        The derived geometry of the local mesh (cell-search control points, face
+        control points and cell sizes / centroids) as a dictionary of arrays.
+        Anything not yet computed is built first.
+        """
+
         self._build_kd_tree_index()
+        self._mark_faces_inside_and_out()
+        self._mark_local_boundary_faces_inside_and_out()
+
+        min_size, radii, centroids, search_lengths = self._get_cached_mesh_sizes()
+
+        return {
+            "index_coords": self._indexCoords,
+            "index_map": self._indexMap,
+            "faces_inner_control_points": self.faces_inner_control_points,
+            "faces_outer_control_points": self.faces_outer_control_points,
+            "boundary_face_control_points": self.boundary_face_control_points,
+            "boundary_face_control_points_sign": self.boundary_face_control_points_sign,
+            "min_size": numpy.array(min_size),
+            "radii": radii,
+            "centroids": centroids,
+            "search_lengths": search_lengths,
+        }
+
+    def _set_geometry_arrays(self, arrays):
+        """
+        Restore derived geometry from the arrays returned by `_get_geometry_arrays`.
+        Only the k-d trees are rebuilt (from the stored control points).
+        """
 
-        (
-            self._min_size,
-            self._radii,
-            self._centroids,
-            self._search_lengths,
-        ) = self._get_mesh_sizes()
+        self._indexCoords = numpy.ascontiguousarray(arrays["index_coords"])
+        self._indexMap = numpy.asarray(arrays["index_map"], dtype=numpy.int64)
+        self._index = uw.kdtree.KDTree(self._indexCoords, leafsize=8)
 
-        self.dm.copyDS(self.dm_hierarchy[-1])
+        self.faces_inner_control_points = numpy.ascontiguousarray(
+            arrays["faces_inner_control_points"]
+        )
+        self.faces_outer_control_points = numpy.ascontiguousarray(
+            arrays["faces_outer_control_points"]
+        )
+
+        self.boundary_face_control_points = numpy.ascontiguousarray(
+            arrays["boundary_face_control_points"]
+        )
+        self.boundary_face_control_points_sign = numpy.asarray(
+            arrays["boundary_face_control_points_sign"]
+        )
+        self.boundary_face_control_points_kdtree = uw.kdtree.KDTree(
+            self.boundary_face_control_points
+        )
+
+        centroids = numpy.ascontiguousarray(arrays["centroids"])
+
+        min_size = numpy.asarray(arrays["min_size"])
+        if min_size.ndim == 0:
+            min_size = float(min_size)
+
+        self._mesh_sizes = (
+            min_size,
+            numpy.asarray(arrays["radii"]),
+            centroids,
+            numpy.asarray(arrays["search_lengths"]),
+        )
+
+        self._centroid_index = uw.kdtree.KDTree(centroids)
+
+        return
+
+    def _load_geometry_arrays(self, filename):
+        """
+        Restore the derived geometry of this process's part of the mesh from a file
+        written by `write_distributed(..., store_geometry=True)`. Returns False (and
+        leaves the caches to be rebuilt lazily) if the file does not hold geometry
+        for this partition or the checksum does not match.
+        """
+
+        import h5py
+
+        partition = _distributed_mesh_partition(filename)
+        if partition is None or partition["comm_size"] != uw.mpi.size:
+            return False
+
+        with h5py.File(filename, "r") as f:
+            try:
+                g = f["metadata"]["geometry"]
+                checksum = g["checksums"][uw.mpi.rank]
+            except KeyError:
+                return False
+
+            if checksum.decode() != self._geometry_checksum():
+                return False
+
+            arrays = {
+                name: _read_distributed_array(g[name])
+                for name in g.keys()
+                if name != "checksums"
+            }
+
+        self._set_geometry_arrays(arrays)
+
+        return True
+
+    def _get_field_decomposition(self):
+        """
+        The field decomposition of the mesh dm (index sets and sub-dms, one per
+        mesh variable) together with a persistent global vector for the combined fields
+        and the state of each variable when it was last copied in. This is cached for
+        as long as the dm (and its fields) are unchanged.
+        """
+
+        cached = getattr(self, "_field_decomposition", None)
+
+        if (
+            cached is not None
+            and cached["dm"] is self.dm
+            and len(cached["isets"]) == self.dm.getNumFields()
+        ):
+            return cached
+
+        self._destroy_field_decomposition()
+
+        # The field decomposition seems to fail if coarse DMs are present
+        names, isets, dms = self.dm.createFieldDecomposition()
+
+        self._field_decomposition = {
+            "dm": self.dm,
+            "isets": isets,
+            "dms": dms,
+            "gvec": self.dm.createGlobalVec(),
+            "states": {},
+        }
+
+        return self._field_decomposition
+
+    def _destroy_field_decomposition(self):
+        cached = getattr(self, "_field_decomposition", None)
+
+        if cached is not None:
+            for iset in cached["isets"]:
+                iset.destroy()
+            for dm in cached["dms"]:
+                dm.destroy()
+            cached["gvec"].destroy()
+
+        self._field_decomposition = None
+
+    def _sync_ghosts(self, variables):
+        """
+        Update the ghost values of the given mesh variables from their owned
+        values, in a single communication phase, using the cached sub-dms.
+        """
+
+        if len(variables) == 0:
+            return
+
+        from underworld3.cython.petsc_discretisation import petsc_dm_sync_ghosts
+
+        subdms = self._get_field_decomposition()["dms"]
+
+        petsc_dm_sync_ghosts(
+            [subdms[var.field_id] for var in variables],
+            [var._lvec for var in variables],
+            [var._gvec for var in variables],
+        )
+
+        for var in variables:
+            self._pending_ghost_sync.pop(var.clean_name, None)
+
+        return
+
+    def _sync_pending_ghosts(self):
+        """
+        Complete the ghost updates that were deferred in `access(..., defer_sync=True)`.
+        This is called before the variable data are used by solvers, evaluations and
+        when the variables are saved.
+        """
+
+        self._sync_ghosts(list(self._pending_ghost_sync.values()))
+
+        return
+
+    def _update_stale_proxies(self, names=None):
+        """
+        Rebuild the swarm-variable proxies (mesh variables) that are out of date
+        because their swarm has moved or their values were changed. `names` restricts
+        this to the given mesh variables (by `clean_name`), otherwise all stale
+        proxies are rebuilt. This is collective, like the proxy updates themselves.
+        """
+
+        if not self._stale_proxies:
+            return
+
+        if names is None:
+            names = list(self._stale_proxies.keys())
+
+        for name in names:
+            swarm_var_ref = self._stale_proxies.get(name, None)
+            if swarm_var_ref is None:
+                continue
+
+            swarm_var = swarm_var_ref()
+            if swarm_var is None:
+                self._stale_proxies.pop(name, None)
+            else:
+                swarm_var.update_proxy()
 
         return
 
@@ -948,8 +1423,16 @@ class Mesh(Stateful, uw_object):
         """
         This method creates and/or updates the mesh variable local vector.
         If the local vector is already up to date, this method will do nothing.
+        Only the variables that have been modified since the last update
+        (according to their state) are copied into the combined vector.
+        Out-of-date swarm proxies are rebuilt first if a compiled solver reads them.
         """
 
+        self._update_stale_proxies(
+            [name for name in self._stale_proxies if name in self._solver_variables]
+        )
+        self._sync_pending_ghosts()
+
         if self._stale_lvec:
             if not self._lvec:
                 self.dm.clearDS()
@@ -957,28 +1440,31 @@ class Mesh(Stateful, uw_object):
                 # create the local vector (memory chunk) and attach to original dm
                 self._lvec = self.dm.createLocalVec()
 
-            # push avar arrays into the parent dm array
-            a_global = self.dm.getGlobalVec()
+            decomposition = self._get_field_decomposition()
+            a_global = decomposition["gvec"]
+            states = decomposition["states"]
 
-            # The field decomposition seems to fail if coarse DMs are present
-            names, isets, dms = self.dm.createFieldDecomposition()
+            modified = [
+                (var, subiset, subdm)
+                for var, subiset, subdm in zip(
+                    self.vars.values(), decomposition["isets"], decomposition["dms"]
+                )
+                if states.get(var.clean_name) != var._get_state()
+            ]
 
-            with self.access():
+            # push modified var arrays into the parent dm array
+            with self.access(read=[var for var, _, _ in modified]):
                 # traverse subdms, taking user generated data in the subdm
                 # local vec, pushing it into a global sub vec
-                for var, subiset, subdm in zip(self.vars.values(), isets, dms):
+                for var, subiset, subdm in modified:
                     lvec = var.vec
                     subvec = a_global.getSubVector(subiset)
                     subdm.localToGlobal(lvec, subvec, addv=False)
                     a_global.restoreSubVector(subiset, subvec)
 
-            for iset in isets:
-                iset.destroy()
-            for dm in dms:
-                dm.destroy()
+                    states[var.clean_name] = var._get_state()
 
             self.dm.globalToLocal(a_global, self._lvec)
-            self.dm.restoreGlobalVec(a_global)
             self._stale_lvec = False
 
     @property
@@ -996,13 +1482,21 @@ class Mesh(Stateful, uw_object):
     def __del__(self):
         if hasattr(self, "_lvec") and self._lvec:
             self._lvec.destroy()
+        if hasattr(self, "_field_decomposition"):
+            self._destroy_field_decomposition()
 
-    def deform_mesh(self, new_coords: numpy.ndarray, verbose=False):
+    def deform_mesh(
+        self, new_coords: numpy.ndarray, verbose=False, full_rebuild=False
+    ):
         """
         This method will update the mesh coordinates and reset any cached coordinates in
         the mesh and in equation systems that are registered on the mesh.
 
         The coord array that is passed in should match the shape of self.data
+
+        Only the coordinate-dependent data (k-d trees, cell sizes, coordinate arrays)
+        are discarded and they are rebuilt when next needed. Set `full_rebuild=True`
+        to also re-create the discretisation (as when the mesh is first built).
         """
 
         coord_vec = self.dm.getCoordinatesLocal()
@@ -1010,7 +1504,14 @@ class Mesh(Stateful, uw_object):
         coords[...] = new_coords[...]
 
         self.dm.setCoordinatesLocal(coord_vec)
-        self.nuke_coords_and_rebuild()
+
+        # The topology and the discretisation are unchanged, only the
+        # coordinate-derived data need to be refreshed (lazily)
+
+        if full_rebuild:
+            self.nuke_coords_and_rebuild()
+        else:
+            self._invalidate_coordinate_caches()
 
         # This should not be necessary any more as we now check the
         # coordinates on the DM to see if they have changed (and we rebuild the
@@ -1021,7 +1522,9 @@ class Mesh(Stateful, uw_object):
 
         return
 
-    def access(self, *writeable_vars: "MeshVariable"):
+    def access(
+        self, *writeable_vars: "MeshVariable", read=None, write=None, defer_sync=False
+    ):
         """
         This context manager makes the underlying mesh variables data available to
         the user. The data should be accessed via the variables `data` handle.
@@ -1033,6 +1536,16 @@ class Mesh(Stateful, uw_object):
         ----------
         writeable_vars
             The variables for which data write access is required.
+        read, write
+            Lists of variables for read-only / write access. If either is given,
+            only these variables (and `writeable_vars`) are made available, otherwise
+            every variable on the mesh is available (read-only unless writeable).
+        defer_sync
+            The ghost values of the modified variables are normally updated when the
+            context manager exits (one communication phase for all of them).
+            If `True`, this is postponed until the data are next needed by a solver
+            or evaluation (or are saved). Useful when many small access blocks
+            modify the same variables.
 
         Example
         -------
@@ -1049,13 +1562,38 @@ class Mesh(Stateful, uw_object):
         timing._incrementDepth()
         stime = time.time()
 
+        writeable_vars = tuple(writeable_vars) + tuple(write or ())
+
+        if read is None and write is None:
+            requested_vars = list(self.vars.values())
+        else:
+            requested_vars = []
+            for var in tuple(read or ()) + writeable_vars:
+                if var.mesh is not self:
+                    raise RuntimeError(
+                        f"Variable {var.clean_name} is not defined on this mesh."
+                    )
+                if var not in requested_vars:
+                    requested_vars.append(var)
+
+        # Out-of-date swarm-variable proxies are rebuilt before they are opened, but
+        # only if they are asked for by name (the unscoped form opens every variable
+        # and the others are rebuilt in place if they are used within the block)
+        self._update_stale_proxies(
+            [
+                var.clean_name
+                for var in tuple(read or ()) + writeable_vars
+                if not var._is_accessed
+            ]
+        )
+
         if writeable_vars is not None:
             self._evaluation_hash = None
             self._evaluation_interpolated_results = None
 
         self._accessed = True
         deaccess_list = []
-        for var in self.vars.values():
+        for var in requested_vars:
             # if already accessed within higher level context manager, continue.
             if var._is_accessed == True:
                 continue
@@ -1095,26 +1633,25 @@ class Mesh(Stateful, uw_object):
                 pass
 
             def __exit__(self, *args):
-                for var in self.mesh.vars.values():
-                    # only de-access variables we have set access for.
-                    if var not in deaccess_list:
-                        continue
+                modified_vars = []
+                # only de-access variables we have set access for.
+                for var in deaccess_list:
                     # set this back, although possibly not required.
                     if var not in writeable_vars:
                         var._data.flags.writeable = var._old_data_flag
-                    # perform sync for any modified vars.
+                    # collect modified vars for the ghost sync (below)
 
                     if var in writeable_vars:
-                        indexset, subdm = self.mesh.dm.createSubDM(var.field_id)
-
-                        # sync ghost values
-                        subdm.localToGlobal(var.vec, var._gvec, addv=False)
-                        subdm.globalToLocal(var._gvec, var.vec, addv=False)
-
-                        indexset.destroy()
-                        subdm.destroy()
+                        modified_vars.append(var)
                         self.mesh._stale_lvec = True
 
+                        # (the state was recorded on entry, so make sure the
+                        # final values are copied in the next update_lvec)
+                        if self.mesh._field_decomposition is not None:
+                            self.mesh._field_decomposition["states"].pop(
+                                var.clean_name, None
+                            )
+
                     var._data = None
                     var._set_vec(available=False)
                     var._is_accessed = False
@@ -1127,6 +1664,13 @@ class Mesh(Stateful, uw_object):
                                 data=f"MeshVariable[...].data is only available within mesh.access() context",
                             )
 
+                # sync ghost values of all the modified vars together (or later)
+                if defer_sync:
+                    for var in modified_vars:
+                        self.mesh._pending_ghost_sync[var.clean_name] = var
+                else:
+                    self.mesh._sync_ghosts(modified_vars)
+
                 timing._decrementDepth()
                 timing.log_result(time.time() - stime, "Mesh.access", 1)
 
@@ -1294,6 +1838,9 @@ class Mesh(Stateful, uw_object):
 
         from underworld3.utilities import generateXdmf
 
+        self._update_stale_proxies()
+        self._sync_pending_ghosts()
+
         ### save mesh vars
         fname = f"./{outputPath}{'_step_'}{index:05d}.h5"
         xfname = f"./{outputPath}{'_step_'}{index:05d}.xdmf"
@@ -1344,6 +1891,9 @@ class Mesh(Stateful, uw_object):
         else:
             self.write(filename + f".mesh.{index:05}.h5")
 
+        self._update_stale_proxies()
+        self._sync_pending_ghosts()
+
         # Checkpoint file
 
         if unique_id:
@@ -1435,6 +1985,107 @@ class Mesh(Stateful, uw_object):
 
         uw.mpi.barrier()
 
+    @timing.routine_timer_decorator
+    def write_distributed(self, filename: str, store_geometry: bool = False):
+        """
+        Save the distributed mesh, including its partition, to the specified hdf5 file.
+
+        Reading this file back with `Mesh(filename, ...)` on the same number of
+        processes restores the saved partition (and point SF) directly instead of
+        partitioning the mesh again. On a different number of processes the file
+        is read like any other DMPlex h5 file.
+
+        The unrefined mesh is stored: any refinement levels are rebuilt from it
+        on reload, which is a process-local operation. The coordinates of each
+        refined level are stored as well so that meshes whose refinement callback
+        moves points (e.g. snapping to curved boundaries) are restored exactly on the
+        same number of processes. On a different number of processes, the same
+        `refinement_callback` must be passed when the file is read.
+
+        Parameters
+        ----------
+        filename :
+            The filename for the distributed mesh file.
+        store_geometry :
+            Also store the derived geometry of each process's part of the mesh
+            (cell-search control points, face control points, cell sizes and centroids)
+            with a checksum of the local mesh. These are restored on reload instead of
+            being recomputed if the checksum still matches.
+
+        """
+
+        import h5py, json
+
+        partition = {
+            "name": f"uw_partition_{uw.mpi.size}",
+            "dm_name": "uw_mesh",
+            "comm_size": uw.mpi.size,
+            "refinement": len(self.dm_hierarchy) - 1,
+            "refinement_callback": callable(self.refinement_callback),
+        }
+
+        dm = self.dm_hierarchy[0]
+        dm_name = dm.getName()
+        dm.setName(partition["dm_name"])
+
+        # The partition is only stored with the version 3 hdf5 layout
+        options = PETSc.Options()
+        options["dm_plex_view_hdf5_storage_version"] = "3.0.0"
+
+        petsc_discretisation.petsc_dm_set_distribution_name(dm, partition["name"])
+
+        viewer = PETSc.ViewerHDF5().create(filename, "w", comm=PETSc.COMM_WORLD)
+        dm.topologyView(viewer)
+        dm.coordinatesView(viewer)
+        dm.labelsView(viewer)
+        viewer.destroy()
+
+        options.delValue("dm_plex_view_hdf5_storage_version")
+        dm.setName(dm_name)
+
+        # The refined levels are rebuilt on reload, but their coordinates
+        # (which may have been moved by the refinement callback) are kept.
+        # These, and the geometry, are written collectively by all processes.
+        arrays = {}
+        for i, level in enumerate(self.dm_hierarchy[1:]):
+            arrays[f"refined_coordinates/level_{i+1:02d}"] = (
+                level.getCoordinatesLocal().array
+            )
+
+        if store_geometry:
+            for name, array in self._get_geometry_arrays().items():
+                arrays[f"geometry/{name}"] = array
+
+            checksums = uw.mpi.comm.gather(self._geometry_checksum(), root=0)
+
+        if uw.mpi.rank == 0:
+            f = h5py.File(filename, "a")
+            g = f.create_group("metadata")
+
+            boundaries_dict = {i.name: i.value for i in self.boundaries}
+            g.attrs["boundaries"] = json.dumps(boundaries_dict)
+
+            coordinates_type_dict = {
+                "name": self.CoordinateSystemType.name,
+                "value": self.CoordinateSystemType.value,
+            }
+            g.attrs["coordinate_system_type"] = json.dumps(coordinates_type_dict)
+            g.attrs["partition"] = json.dumps(partition)
+
+            if store_geometry:
+                g.create_dataset(
+                    "geometry/checksums",
+                    data=numpy.array(checksums, dtype="S40"),
+                )
+
+            f.close()
+
+        uw.mpi.barrier()
+
+        _write_distributed_arrays(filename, arrays)
+
+        uw.mpi.barrier()
+
     def vtk(self, filename: str):
         """
         Save mesh to the specified file
@@ -1498,6 +2149,76 @@ class Mesh(Stateful, uw_object):
             )
             return self._coord_array[key]
 
+    def _get_coordinate_interpolation(self, degree, continuous):
+        """
+        The coordinate DM / FE for the given basis and the interpolation matrix
+        from the mesh coordinates, cached per (degree, continuity). The matrix is
+        rebuilt after the mesh is deformed, the DM and FE are retained unless
+        the coordinate discretisation is rebuilt.
+        """
+
+        key = (degree, continuous)
+
+        entry = self._coord_interpolation.get(key)
+
+        if entry is None:
+            dmold = self.dm.getCoordinateDM()
+            dmold.createDS()
+            dmnew = dmold.clone()
+
+            options = PETSc.Options()
+            options["coordinterp_petscspace_degree"] = degree
+            options["coordinterp_petscdualspace_lagrange_continuity"] = continuous
+            options["coordinterp_petscdualspace_lagrange_node_endpoints"] = False
+
+            dmfe = PETSc.FE().createDefault(
+                self.dim,
+                self.cdim,
+                self.isSimplex,
+                self.qdegree,
+                "coordinterp_",
+                PETSc.COMM_SELF,
+            )
+
+            dmnew.setField(0, dmfe)
+            dmnew.createDS()
+
+            entry = {"dm": dmnew, "fe": dmfe, "matrix": None}
+            self._coord_interpolation[key] = entry
+
+        if entry["matrix"] is None:
+            dmold = self.dm.getCoordinateDM()
+            matInterp, vecScale = dmold.createInterpolation(entry["dm"])
+            entry["matrix"] = matInterp
+            if vecScale is not None:
+                vecScale.destroy()
+
+        return entry
+
+    def _destroy_coordinate_interpolation(self, matrices_only=False):
+        """
+        Release the cached coordinate interpolation operators (and, unless
+        `matrices_only`, the cached DMs / FEs as well).
+        """
+
+        cache = getattr(self, "_coord_interpolation", None)
+
+        if cache is None:
+            self._coord_interpolation = {}
+            return
+
+        for key, entry in list(cache.items()):
+            if entry["matrix"] is not None:
+                entry["matrix"].destroy()
+                entry["matrix"] = None
+
+            if not matrices_only:
+                entry["dm"].destroy()
+                entry["fe"].destroy()
+                del cache[key]
+
+        return
+
     def _get_coords_for_basis(self, degree, continuous):
         """
         This function returns the vertex array for the
@@ -1505,32 +2226,13 @@ class Mesh(Stateful, uw_object):
         it is first created and then returned.
         """
 
-        dmold = self.dm.getCoordinateDM()
-        dmold.createDS()
-        dmnew = dmold.clone()
-
-        options = PETSc.Options()
-        options["coordinterp_petscspace_degree"] = degree
-        options["coordinterp_petscdualspace_lagrange_continuity"] = continuous
-        options["coordinterp_petscdualspace_lagrange_node_endpoints"] = False
-
-        dmfe = PETSc.FE().createDefault(
-            self.dim,
-            self.cdim,
-            self.isSimplex,
-            self.qdegree,
-            "coordinterp_",
-            PETSc.COMM_SELF,
-        )
-
-        dmnew.setField(0, dmfe)
-        dmnew.createDS()
+        entry = self._get_coordinate_interpolation(degree, continuous)
+        dmnew = entry["dm"]
 
-        matInterp, vecScale = dmold.createInterpolation(dmnew)
         coordsOld = self.dm.getCoordinates()
         coordsNewL = dmnew.getLocalVec()
         coordsNewG = dmnew.getGlobalVec()
-        matInterp.mult(coordsOld, coordsNewG)
+        entry["matrix"].mult(coordsOld, coordsNewG)
         dmnew.globalToLocal(coordsNewG, coordsNewL)
 
         arr = coordsNewL.array
@@ -1538,8 +2240,6 @@ class Mesh(Stateful, uw_object):
 
         dmnew.restoreGlobalVec(coordsNewG)
         dmnew.restoreLocalVec(coordsNewL)
-        dmnew.destroy()
-        dmfe.destroy()
 
         return arrcopy
 
@@ -1566,79 +2266,226 @@ class Mesh(Stateful, uw_object):
 
         return
 
-    def _build_kd_tree_index(self):
+    def _invalidate_topology_caches(self):
+        """
+        Discard the cached connectivity arrays. Only needed when the mesh topology
+        changes (coordinate changes do not affect these).
+        """
 
-        if hasattr(self, "_index") and self._index is not None:
-            return
+        self._cell_vertices = None
+        self._cell_faces = None
+        self._face_vertices = None
+        self._boundary_faces = None
+        self._boundary_face_cells = None
+        self._cell_neighbours = None
 
-        dim = self.dim
-        # def mesh_face_skeleton_kdtree(mesh):
+        return
+
+    @property
+    def cell_vertices(self) -> numpy.ndarray:
+        """
+        Cell -> vertex connectivity of the local cells, shape `(n_cells, n_vertices_per_cell)`.
+        Entries index the rows of `mesh.data`. Computed once and cached.
+        """
+        return self._get_cell_vertices()
+
+    @property
+    def cell_faces(self) -> numpy.ndarray:
+        """
+        Cell -> face connectivity of the local cells, shape `(n_cells, n_faces_per_cell)`.
+        Entries are dmplex face points (`fStart <= f < fEnd`). Computed once and cached.
+        """
+        return self._get_cell_faces()
+
+    @property
+    def face_vertices(self) -> numpy.ndarray:
+        """
+        Face -> vertex connectivity of all local faces, shape `(n_faces, n_vertices_per_face)`.
+        Row `f - fStart` belongs to face `f`; entries index the rows of `mesh.data`.
+        Computed once and cached.
+        """
+        return self._get_face_vertices()
+
+    @property
+    def boundary_faces(self) -> numpy.ndarray:
+        """
+        The local faces that belong to a single cell (domain boundary and, in parallel,
+        the partition boundary). Computed once and cached.
+        """
+        return self._get_boundary_faces()[0]
+
+    @property
+    def boundary_face_cells(self) -> numpy.ndarray:
+        """
+        The cell that owns each of `mesh.boundary_faces`.
+        """
+        return self._get_boundary_faces()[1]
+
+    @property
+    def cell_neighbours(self) -> numpy.ndarray:
+        """
+        The local cell on the other side of each face in `mesh.cell_faces`,
+        shape `(n_cells, n_faces_per_cell)`, or -1 if the face is on the boundary of
+        the local domain. Computed once and cached.
+        """
+        return self._get_cell_neighbours()
+
+    def _get_cell_vertices(self):
+        """
+        Cell -> vertex connectivity for the local cells (vertex indices are
+        relative to the start of the vertex stratum and so index `mesh.data`).
+        The vertices are in the order returned by `dm.getTransitiveClosure`.
+        This depends only on the topology and is cached.
+        """
+
+        if getattr(self, "_cell_vertices", None) is not None:
+            return self._cell_vertices
+
+        from underworld3.cython.petsc_discretisation import (
+            petsc_dm_get_closure_points_at_depth,
+        )
+
+        cStart, cEnd = self.dm.getHeightStratum(0)
+        pStart, pEnd = self.dm.getDepthStratum(0)
+
+        self._cell_vertices = (
+            petsc_dm_get_closure_points_at_depth(self.dm, cStart, cEnd, 0) - pStart
+        )
+
+        return self._cell_vertices
+
+    def _get_cell_faces(self):
+        """
+        Cell -> face connectivity for the local cells (face points as numbered in the dm,
+        in `dm.getCone(cell)` order). This depends only on the topology and is cached.
+        """
+
+        if getattr(self, "_cell_faces", None) is not None:
+            return self._cell_faces
+
+        from underworld3.cython.petsc_discretisation import (
+            petsc_dm_get_closure_points_at_depth,
+        )
 
         cStart, cEnd = self.dm.getHeightStratum(0)
+        fStart, fEnd = self.dm.getHeightStratum(1)
+        face_depth = self.dm.getPointDepth(fStart)
+
+        self._cell_faces = petsc_dm_get_closure_points_at_depth(
+            self.dm, cStart, cEnd, face_depth
+        )
+
+        return self._cell_faces
+
+    def _get_face_vertices(self):
+        """
+        Face -> vertex connectivity for all local faces (fStart ... fEnd-1) with
+        vertex indices relative to the start of the vertex stratum (closure order).
+        This depends only on the topology and is cached.
+        """
+
+        if getattr(self, "_face_vertices", None) is not None:
+            return self._face_vertices
+
+        from underworld3.cython.petsc_discretisation import (
+            petsc_dm_get_closure_points_at_depth,
+        )
+
         fStart, fEnd = self.dm.getHeightStratum(1)
         pStart, pEnd = self.dm.getDepthStratum(0)
-        cell_num_faces = self.element.entities[1]
-        cell_num_points = self.element.entities[self.dim]
-        face_num_points = self.element.face_entities[self.dim]
 
-        control_points_list = []
-        control_points_cell_list = []
+        self._face_vertices = (
+            petsc_dm_get_closure_points_at_depth(self.dm, fStart, fEnd, 0) - pStart
+        )
 
-        for cell, cell_id in enumerate(range(cStart, cEnd)):
+        return self._face_vertices
 
-            cell_faces = self.dm.getCone(cell_id)
-            points = self.dm.getTransitiveClosure(cell_id)[0][-cell_num_points:]
-            cell_point_coords = self.data[points - pStart]
-            cell_centroid = cell_point_coords.mean(axis=0)
+    def _get_boundary_faces(self):
+        """
+        The local faces with a single supporting cell (boundary of the local domain,
+        including any partition boundaries) and the cell that each belongs to.
+        Obtained in bulk from the cell -> face connectivity; cached (topology only).
+        """
 
-            # for face in range(cell_num_faces):
+        if getattr(self, "_boundary_faces", None) is not None:
+            return self._boundary_faces, self._boundary_face_cells
 
-            #     points = self.dm.getTransitiveClosure(cell_faces[face])[0][
-            #         -face_num_points:
-            #     ]
-            #     point_coords = self.data[points - pStart]
+        cStart, cEnd = self.dm.getHeightStratum(0)
+        fStart, fEnd = self.dm.getHeightStratum(1)
 
-            #     face_centroid = point_coords.mean(axis=0)
-            #     cell_centroid = cell_point_coords.mean(axis=0)
+        cell_faces = self.cell_faces
+        support_size = numpy.bincount(
+            cell_faces.reshape(-1) - fStart, minlength=fEnd - fStart
+        )
 
-            #     # 2D case
-            #     if self.dim == 2:
-            #         vector = point_coords[1] - point_coords[0]
-            #         normal = numpy.array((-vector[1], vector[0]))
+        boundary_faces = numpy.where(support_size == 1)[0] + fStart
 
-            #     # 3D simplex case (probably also OK for hexes)
-            #     else:
-            #         normal = numpy.cross(
-            #             (point_coords[1] - point_coords[0]),
-            #             (point_coords[2] - point_coords[0]),
-            #         )
+        face_cell = numpy.empty(fEnd - fStart, dtype=numpy.int64)
+        face_cell[cell_faces.reshape(-1) - fStart] = numpy.repeat(
+            numpy.arange(cStart, cEnd), cell_faces.shape[1]
+        )
 
-            #     inward_outward = numpy.sign(normal.dot(face_centroid - cell_centroid))
-            #     normal *= inward_outward / numpy.sqrt(normal.dot(normal))
+        self._boundary_faces = boundary_faces
+        self._boundary_face_cells = face_cell[boundary_faces - fStart]
 
-            #     inside_control_point = -1e-3 * normal + face_centroid
+        return self._boundary_faces, self._boundary_face_cells
 
-            #     control_points_list.append(inside_control_point)
-            #     control_points_cell_list.append(cell_id)
-            #     control_points_list.append(cell_centroid)
-            #     control_points_cell_list.append(cell_id)
+    def _get_cell_neighbours(self):
+        """
+        Cell -> neighbouring cell across each face (in `cell_faces` order), -1 where there
+        is no local neighbour. Faces shared by two cells appear as adjacent entries once
+        the face list is sorted. This depends only on the topology and is cached.
+        """
 
-            # Add points near the cell vertices
+        if getattr(self, "_cell_neighbours", None) is not None:
+            return self._cell_neighbours
 
-            for i in range(cell_point_coords.shape[0]):
-                control_points_list.append(
-                    0.99 * cell_point_coords[i] + 0.01 * cell_centroid
-                )
-                control_points_cell_list.append(cell_id)
+        cStart, cEnd = self.dm.getHeightStratum(0)
+
+        cell_faces = self.cell_faces
+        faces = cell_faces.reshape(-1)
+        cells = numpy.repeat(numpy.arange(cStart, cEnd), cell_faces.shape[1])
+
+        order = numpy.argsort(faces, kind="stable")
+        shared = faces[order[1:]] == faces[order[:-1]]
+
+        neighbours = numpy.full(faces.shape[0], -1, dtype=numpy.int64)
+        neighbours[order[:-1][shared]] = cells[order[1:][shared]]
+        neighbours[order[1:][shared]] = cells[order[:-1][shared]]
+
+        self._cell_neighbours = neighbours.reshape(cell_faces.shape)
+
+        return self._cell_neighbours
+
+    def _build_kd_tree_index(self):
+
+        if hasattr(self, "_index") and self._index is not None:
+            return
+
+        # Control points near each cell vertex and the cell centroid, built in bulk
+        # from the cell -> vertex connectivity (shape: cells x points per cell x dim)
+
+        cStart, cEnd = self.dm.getHeightStratum(0)
+
+        cell_vertex_coords = self.data[self.cell_vertices]
+        cell_centroids = cell_vertex_coords.mean(axis=1)
 
-            # Add centroid
-            control_points_list.append(cell_centroid)
-            control_points_cell_list.append(cell_id)
+        control_points = numpy.concatenate(
+            (
+                0.99 * cell_vertex_coords + 0.01 * cell_centroids[:, numpy.newaxis, :],
+                cell_centroids[:, numpy.newaxis, :],
+            ),
+            axis=1,
+        )
+
+        points_per_cell = control_points.shape[1]
 
-        self._indexCoords = numpy.array(control_points_list)
+        self._indexCoords = control_points.reshape(-1, self.cdim)
         self._index = uw.kdtree.KDTree(self._indexCoords, leafsize=8)
         # self._index.build_index()
-        self._indexMap = numpy.array(control_points_cell_list, dtype=numpy.int64)
+        self._indexMap = numpy.repeat(
+            numpy.arange(cStart, cEnd, dtype=numpy.int64), points_per_cell
+        )
 
         # We don't need an indexMap for this one because there is only one point per cell
         # and the returned kdtree value IS the index.
@@ -1722,64 +2569,50 @@ class Mesh(Stateful, uw_object):
         ):
             return
 
-        dim = self.dim
-        # def mesh_face_skeleton_kdtree(mesh):
+        # All elements in our mesh are a single type. The geometry is computed
+        # in bulk with shapes (cells, faces per cell, points per face, dim)
 
-        cStart, cEnd = self.dm.getHeightStratum(0)
         fStart, fEnd = self.dm.getHeightStratum(1)
-        pStart, pEnd = self.dm.getDepthStratum(0)
-        num_local_cells = self.dm.getHeightStratum(0)[1]
-        cell_num_faces = self.element.entities[1]
-        cell_num_points = self.element.entities[self.dim]
-        face_num_points = self.element.face_entities[self.dim]
-
-        # All elements in our mesh are a single type
-
-        mesh_cell_outer_control_points = numpy.ndarray(
-            shape=(cell_num_faces, num_local_cells, self.dim)
-        )
-        mesh_cell_inner_control_points = numpy.ndarray(
-            shape=(cell_num_faces, num_local_cells, self.dim)
-        )
 
-        for cell, cell_id in enumerate(range(cStart, cEnd)):
-            cell_faces = self.dm.getCone(cell_id)
-            points = self.dm.getTransitiveClosure(cell_id)[0][-cell_num_points:]
-            cell_point_coords = self.data[points - pStart]
+        cell_centroids = self.data[self.cell_vertices].mean(axis=1)
 
-            for face in range(cell_num_faces):
+        cell_face_vertices = self.face_vertices[self.cell_faces - fStart]
+        point_coords = self.data[cell_face_vertices]
 
-                points = self.dm.getTransitiveClosure(cell_faces[face])[0][
-                    -face_num_points:
-                ]
-                point_coords = self.data[points - pStart]
-
-                face_centroid = point_coords.mean(axis=0)
-                cell_centroid = cell_point_coords.mean(axis=0)
+        face_centroids = point_coords.mean(axis=2)
 
-                # 2D case
-                if self.dim == 2:
-                    vector = point_coords[1] - point_coords[0]
-                    normal = numpy.array((-vector[1], vector[0]))
+        # 2D case
+        if self.dim == 2:
+            vector = point_coords[:, :, 1, :] - point_coords[:, :, 0, :]
+            normals = numpy.stack((-vector[:, :, 1], vector[:, :, 0]), axis=-1)
 
-                # 3D simplex case (probably also OK for hexes)
-                else:
-                    normal = numpy.cross(
-                        (point_coords[1] - point_coords[0]),
-                        (point_coords[2] - point_coords[0]),
-                    )
+        # 3D simplex case (probably also OK for hexes)
+        else:
+            normals = numpy.cross(
+                (point_coords[:, :, 1, :] - point_coords[:, :, 0, :]),
+                (point_coords[:, :, 2, :] - point_coords[:, :, 0, :]),
+            )
 
-                inward_outward = numpy.sign(normal.dot(face_centroid - cell_centroid))
-                normal *= inward_outward / numpy.sqrt(normal.dot(normal))
+        inward_outward = numpy.sign(
+            (normals * (face_centroids - cell_centroids[:, numpy.newaxis, :])).sum(
+                axis=-1
+            )
+        )
+        normals *= (
+            inward_outward / numpy.sqrt((normals * normals).sum(axis=-1))
+        )[:, :, numpy.newaxis]
 
-                outside_control_point = 1e-3 * normal + face_centroid
-                inside_control_point = -1e-3 * normal + face_centroid
+        outside_control_points = 1e-3 * normals + face_centroids
+        inside_control_points = -1e-3 * normals + face_centroids
 
-                mesh_cell_outer_control_points[face, cell, :] = outside_control_point
-                mesh_cell_inner_control_points[face, cell, :] = inside_control_point
+        # stored as (faces per cell, cells, dim)
 
-        self.faces_inner_control_points = mesh_cell_inner_control_points
-        self.faces_outer_control_points = mesh_cell_outer_control_points
+        self.faces_inner_control_points = numpy.ascontiguousarray(
+            inside_control_points.transpose(1, 0, 2)
+        )
+        self.faces_outer_control_points = numpy.ascontiguousarray(
+            outside_control_points.transpose(1, 0, 2)
+        )
 
         return
 
@@ -1814,6 +2647,212 @@ class Mesh(Stateful, uw_object):
 
         return numpy.all(insiders, axis=1)
 
+    def _points_in_cells_exact(self, points, cells, tolerance=1.0e-8):
+        """
+        Determine if the given points lie in the suggested cells using the
+        barycentric coordinates (simplices) or the inverse of the (multi)linear
+        cell map (quads / hexes, by Newton iteration). Degenerate simplices fall
+        back to `test_if_points_in_cells`. For surface meshes (cdim > dim) the
+        points are projected onto the plane of each cell.
+
+        Exact for a linear mesh (to within `tolerance` in reference coordinates).
+        """
+
+        assert points.shape[0] == cells.shape[0]
+
+        if cells.shape[0] == 0:
+            return numpy.zeros((0,), dtype=bool)
+
+        cStart, cEnd = self.dm.getHeightStratum(0)
+
+        if self.isSimplex:
+            from underworld3.utilities.geometry_tools import (
+                points_barycentric_in_simplices,
+            )
+
+            vertices = self.data[self.cell_vertices[cells - cStart]]
+            lam = points_barycentric_in_simplices(points, vertices)
+
+            inside = numpy.all(lam >= -tolerance, axis=1)
+
+            # Degenerate cells have no barycentric coordinates, use the face test
+            undefined = numpy.isnan(lam).any(axis=1)
+            if numpy.any(undefined):
+                inside[undefined] = self.test_if_points_in_cells(
+                    points[undefined], cells[undefined]
+                )
+
+            return inside
+
+        else:
+            from underworld3.cython.petsc_discretisation import (
+                petsc_dm_coordinates_to_reference,
+            )
+
+            xi = petsc_dm_coordinates_to_reference(self.dm, cells, points)
+
+            return numpy.all(numpy.abs(xi) <= 1.0 + tolerance, axis=1)
+
+    def _locate_points_by_walking(self, coords, cells, max_steps=25):
+        """
+        Starting from an initial guess for the owning cell, test each point exactly
+        and, if it is not inside, step to the neighbouring cell across the face that
+        the point lies furthest beyond. Continues until the point is found,
+        the walk leaves the local domain or `max_steps` is reached.
+
+        Returns the owning cell of each point (-1 if not found).
+        """
+
+        self._mark_faces_inside_and_out()
+
+        cStart, cEnd = self.dm.getHeightStratum(0)
+        neighbours = self.cell_neighbours
+
+        found = numpy.full(coords.shape[0], -1, dtype=numpy.int64)
+        active = numpy.arange(coords.shape[0])
+        current = numpy.array(cells, dtype=numpy.int64)
+
+        for step in range(max_steps):
+            if active.shape[0] == 0:
+                break
+
+            inside = self._points_in_cells_exact(coords[active], current)
+            found[active[inside]] = current[inside]
+
+            active = active[~inside]
+            current = current[~inside]
+            points = coords[active]
+
+            # Outward distance beyond each face (the control points are a small,
+            # fixed distance either side of each face along its unit normal)
+
+            outer = self.faces_outer_control_points[:, current - cStart]
+            inner = self.faces_inner_control_points[:, current - cStart]
+            beyond = ((inner - points) ** 2).sum(axis=-1) - (
+                (outer - points) ** 2
+            ).sum(axis=-1)
+
+            exit_face = numpy.argmax(beyond, axis=0)
+            current = neighbours[current - cStart, exit_face]
+
+            still_local = current != -1
+            active = active[still_local]
+            current = current[still_local]
+
+        return found
+
+    def _set_lattice_layout(self, minCoords, maxCoords, tolerance=1.0e-6):
+        """
+        Record that the cells of this (undeformed) mesh tile a regular lattice
+        between `minCoords` and `maxCoords` so that points can be located with
+        integer arithmetic. The lattice spacing is obtained from the vertex
+        coordinates (so refined meshes are also handled) and is checked against
+        every vertex. If the mesh does not fit a lattice, nothing is recorded and
+        the generic (kd-tree) point location is used.
+        """
+
+        self._lattice = None
+
+        cStart, cEnd = self.dm.getHeightStratum(0)
+        if cEnd == cStart or self.cdim != self.dim:
+            return
+
+        origin = numpy.array(minCoords, dtype=float)
+        extent = numpy.array(maxCoords, dtype=float) - origin
+        vertices = self.data
+
+        spacing = numpy.empty(self.dim)
+        for d in range(self.dim):
+            x = numpy.unique(numpy.round((vertices[:, d] - origin[d]) / extent[d], 10))
+            gaps = numpy.diff(x)
+            gaps = gaps[gaps > tolerance]
+            if gaps.shape[0] == 0:
+                return
+            spacing[d] = gaps.min() * extent[d]
+
+        n = numpy.round(extent / spacing).astype(numpy.int64)
+        spacing = extent / n
+
+        nodes = (vertices - origin) / spacing
+        if not numpy.allclose(nodes, numpy.round(nodes), atol=tolerance):
+            return
+
+        # Lattice box of each local cell (its vertices must span exactly one box)
+        # and the box -> cells map over the local part of the lattice
+
+        cell_nodes = numpy.round(nodes[self.cell_vertices]).astype(numpy.int64)
+        ijk = cell_nodes.min(axis=1)
+
+        if numpy.any(cell_nodes.max(axis=1) - ijk != 1):
+            return
+
+        lo = ijk.min(axis=0)
+        shape = ijk.max(axis=0) - lo + 1
+        box = numpy.ravel_multi_index(tuple((ijk - lo).T), tuple(shape))
+
+        order = numpy.argsort(box, kind="stable")
+        sorted_box = box[order]
+        slot = numpy.arange(box.shape[0]) - numpy.searchsorted(sorted_box, sorted_box)
+
+        per_box = slot.max() + 1
+        if not self.isSimplex and per_box != 1:
+            return
+
+        cell_map = numpy.full((numpy.prod(shape), per_box), -1, dtype=numpy.int64)
+        cell_map[sorted_box, slot] = order + cStart
+
+        self._lattice = {
+            "origin": origin,
+            "spacing": spacing,
+            "n": n,
+            "lo": lo,
+            "shape": shape,
+            "cell_map": cell_map,
+        }
+
+        return
+
+    def _lattice_locate(self, coords, tolerance=1.0e-8):
+        """
+        Owning local cell of each point from the lattice layout (-1 if the point is
+        not in a local cell). Tensor-product cells fill one lattice box each, simplices
+        are tested exactly against the few cells that share the box.
+        """
+
+        lattice = self._lattice
+
+        cells = numpy.full(coords.shape[0], -1, dtype=numpy.int64)
+
+        rel = (coords[:, 0 : self.dim] - lattice["origin"]) / lattice["spacing"]
+        ijk = numpy.floor(rel).astype(numpy.int64)
+
+        # points on the lower / upper edge of the lattice belong to the edge cells
+        n = lattice["n"]
+        ijk = numpy.where((ijk == -1) & (rel >= -tolerance), 0, ijk)
+        ijk = numpy.where((ijk == n) & (rel <= n + tolerance), n - 1, ijk)
+
+        local_ijk = ijk - lattice["lo"]
+        valid = numpy.where(
+            numpy.all((local_ijk >= 0) & (local_ijk < lattice["shape"]), axis=1)
+        )[0]
+
+        box = numpy.ravel_multi_index(tuple(local_ijk[valid].T), tuple(lattice["shape"]))
+        candidates = lattice["cell_map"][box]
+
+        if candidates.shape[1] == 1:
+            cells[valid] = candidates[:, 0]
+            return cells
+
+        for k in range(candidates.shape[1]):
+            untested = (candidates[:, k] != -1) & (cells[valid] == -1)
+            points = valid[untested]
+            inside = self._points_in_cells_exact(
+                coords[points], candidates[untested, k]
+            )
+            cells[points[inside]] = candidates[untested, k][inside]
+
+        return cells
+
     def _mark_local_boundary_faces_inside_and_out(self):
         """
         Create a collection of control point pairs that are slightly inside
@@ -1830,74 +2869,58 @@ class Mesh(Stateful, uw_object):
         ):
             return
 
-        cStart, cEnd = self.dm.getHeightStratum(0)
         fStart, fEnd = self.dm.getHeightStratum(1)
-        pStart, pEnd = self.dm.getDepthStratum(0)
-        cell_num_faces = self.element.entities[1]
-        cell_num_points = self.element.entities[self.dim]
-        face_num_points = self.element.face_entities[self.dim]
-
-        boundary_faces = []
-        for face in range(fStart, fEnd):
-            if self.dm.getJoin(face).shape[0] == 1:
-                boundary_faces.append(face)
-
-        boundary_faces = numpy.array(boundary_faces)
-
-        control_points_list = []
-        control_point_sign_list = []
+        cStart, cEnd = self.dm.getHeightStratum(0)
 
-        for face in boundary_faces:
-            cell = self.dm.getJoin(face)[0]
-            points = self.dm.getTransitiveClosure(face)[0][-face_num_points:]
-            point_coords = self.data[points - pStart]
-            face_centroid = point_coords.mean(axis=0)
-            cell_centroid = self._centroids[cell - cStart]
+        boundary_faces, boundary_face_cells = self._get_boundary_faces()
 
-            # 2D case
-            if self.dim == 2:
-                vector = point_coords[1] - point_coords[0]
-                normal = numpy.array((-vector[1], vector[0]))
-
-            else:
-                # 3D simplex case (probably also OK for hexes)
-                normal = numpy.cross(
-                    (point_coords[1] - point_coords[0]),
-                    (point_coords[2] - point_coords[0]),
-                )
+        point_coords = self.data[self.face_vertices[boundary_faces - fStart]]
+        face_centroids = point_coords.mean(axis=1)
+        cell_centroids = self._centroids[boundary_face_cells - cStart]
 
-            inward_outward = numpy.sign(normal.dot(face_centroid - cell_centroid))
-            normal *= inward_outward / numpy.sqrt(normal.dot(normal))
+        # 2D case
+        if self.dim == 2:
+            vector = point_coords[:, 1, :] - point_coords[:, 0, :]
+            normals = numpy.stack((-vector[:, 1], vector[:, 0]), axis=-1)
 
-            # Control points near centroid
+        else:
+            # 3D simplex case (probably also OK for hexes)
+            normals = numpy.cross(
+                (point_coords[:, 1, :] - point_coords[:, 0, :]),
+                (point_coords[:, 2, :] - point_coords[:, 0, :]),
+            )
 
-            outside_control_point = 1e-8 * normal + face_centroid
-            control_points_list.append(outside_control_point)
-            control_point_sign_list.append(-1)
+        inward_outward = numpy.sign(
+            (normals * (face_centroids - cell_centroids)).sum(axis=-1)
+        )
+        normals *= (inward_outward / numpy.sqrt((normals * normals).sum(axis=-1)))[
+            :, numpy.newaxis
+        ]
 
-            inside_control_point = -1e-8 * normal + face_centroid
-            control_points_list.append(inside_control_point)
-            control_point_sign_list.append(1)
+        # Control points near the face centroid and closer to the face nodes,
+        # each as an (outside, inside) pair: shape (faces, 1 + points per face, dim)
 
-            # Control points closer to face nodes
+        sample_points = numpy.concatenate(
+            (
+                face_centroids[:, numpy.newaxis, :],
+                0.8 * point_coords + 0.2 * face_centroids[:, numpy.newaxis, :],
+            ),
+            axis=1,
+        )
 
-            for pt in range(0, face_num_points):
+        offsets = 1e-8 * normals[:, numpy.newaxis, :]
 
-                outside_control_point = (
-                    1e-8 * normal + 0.8 * points[pt] + 0.2 * face_centroid
-                )
-                control_points_list.append(outside_control_point)
-                control_point_sign_list.append(-1)
+        control_points = numpy.stack(
+            (sample_points + offsets, sample_points - offsets), axis=2
+        ).reshape(-1, self.dim)
 
-                inside_control_point = (
-                    -1e-8 * normal + 0.8 * points[pt] + 0.2 * face_centroid
-                )
-                control_points_list.append(inside_control_point)
-                control_point_sign_list.append(1)
+        control_point_sign = numpy.tile(
+            numpy.array((-1, 1)), control_points.shape[0] // 2
+        )
 
-        control_point_kdtree = uw.kdtree.KDTree(numpy.array(control_points_list))
-        control_point_sign = numpy.array(control_point_sign_list)
+        control_point_kdtree = uw.kdtree.KDTree(control_points)
 
+        self.boundary_face_control_points = control_points
         self.boundary_face_control_points_kdtree = control_point_kdtree
         self.boundary_face_control_points_sign = control_point_sign
 
@@ -1912,13 +2935,16 @@ class Mesh(Stateful, uw_object):
 
         """
 
+        if points.shape[0] == 0:
+            return False
+
+        if getattr(self, "_lattice", None) is not None:
+            return self._lattice_locate(points) != -1
+
         self._mark_local_boundary_faces_inside_and_out()
 
         max_radius = self.get_max_radius()
 
-        if points.shape[0] == 0:
-            return False
-
         dist2, closest_control_points_ext = (
             self.boundary_face_control_points_kdtree.query(points, k=1, sqr_dists=True)
         )
@@ -1968,6 +2994,22 @@ class Mesh(Stateful, uw_object):
         """
         import numpy as np
 
+        # Structured meshes: points in local cells are found directly
+
+        if getattr(self, "_lattice", None) is not None and len(coords) > 0:
+            cells = self._lattice_locate(coords)
+            not_local = np.where(cells == -1)[0]
+            if not_local.shape[0] > 0:
+                cells[not_local] = self._get_closest_cells_from_index(
+                    coords[not_local]
+                )
+            return cells
+
+        return self._get_closest_cells_from_index(coords)
+
+    def _get_closest_cells_from_index(self, coords):
+        import numpy as np
+
         self._build_kd_tree_index()
 
         if len(coords) > 0:
@@ -2008,7 +3050,8 @@ class Mesh(Stateful, uw_object):
         """
         import numpy as np
 
-        import numpy as np
+        if getattr(self, "_lattice", None) is not None and len(coords) > 0:
+            return self._lattice_locate(coords)
 
         # Create index if required
         self._build_kd_tree_index()
@@ -2028,11 +3071,17 @@ class Mesh(Stateful, uw_object):
         cells = self._indexMap[closest_points]
         cStart, cEnd = self.dm.getHeightStratum(0)
 
-        inside = self.test_if_points_in_cells(coords, cells)
-        cells[~inside] = -1
-        lost_points = np.where(inside == False)[0]
+        # Part 1 - exact test in the cell of the closest control point and walk
+        # across faces to the neighbouring cells if the point lies outside
 
-        # Part 2 - try to find the lost points by walking nearby cells
+        cells = self._locate_points_by_walking(coords, cells)
+        lost_points = np.where(cells == -1)[0]
+
+        if lost_points.shape[0] == 0:
+            return cells
+
+        # Part 2 - walks can terminate at the edge of a non-convex local domain,
+        # so check the nearby cells of any points that were not found
 
         num_local_cells = self._centroid_index.data_pts.shape[0]
         num_testable_neighbours = min(num_local_cells, 50)
@@ -2040,18 +3089,22 @@ class Mesh(Stateful, uw_object):
         dist2, closest_centroids = self._centroid_index.query(
             coords[lost_points], k=num_testable_neighbours, sqr_dists=True
         )
+        closest_centroids = closest_centroids.reshape(lost_points.shape[0], -1)
 
         # This number is close to the point-point coordination value in 3D unstructured
         # grids (by inspection)
 
         for i in range(0, num_testable_neighbours):
 
-            inside = self.test_if_points_in_cells(
-                coords[lost_points], closest_centroids[:, i]
+            inside = self._points_in_cells_exact(
+                coords[lost_points], closest_centroids[:, i] + cStart
             )
-            cells[lost_points[inside]] = closest_centroids[inside, i]
+            cells[lost_points[inside]] = closest_centroids[inside, i] + cStart
+
+            lost_points = lost_points[~inside]
+            closest_centroids = closest_centroids[~inside]
 
-            if np.count_nonzero(cells == -1) == 0:
+            if lost_points.shape[0] == 0:
                 break
 
         return cells
@@ -2068,21 +3121,26 @@ class Mesh(Stateful, uw_object):
         import numpy as np
 
         cStart, cEnd = self.dm.getHeightStratum(0)
-        pStart, pEnd = self.dm.getDepthStratum(0)
-        cell_length = np.empty(centroids.shape[0])
-        cell_min_r = np.empty(centroids.shape[0])
-        cell_r = np.empty(centroids.shape[0])
 
-        for cell in range(cEnd - cStart):
-            cell_num_points = self.dm.getConeSize(cell)
-            cell_points = self.dm.getTransitiveClosure(cell)[0][-cell_num_points:]
-            cell_coords = self.data[cell_points - pStart]
+        if cEnd == cStart:
+            empty = np.empty(0)
+            return empty, empty.copy(), centroids, empty.copy()
+
+        # Each vertex is queried once, then the (squared) distances are gathered per cell.
+        # As before, the sample is the last `coneSize` closure vertices of each cell
+
+        cell_num_points = self.dm.getConeSize(cStart)
+        cell_points = self.cell_vertices[:, -cell_num_points:]
+
+        vertex_distsq, _ = centroids_kd_tree.query(
+            np.ascontiguousarray(self.data), k=1, sqr_dists=True
+        )
 
-            distsq, _ = centroids_kd_tree.query(cell_coords, k=1, sqr_dists=True)
+        distsq = vertex_distsq.reshape(-1)[cell_points]
 
-            cell_length[cell] = np.sqrt(distsq.max())
-            cell_r[cell] = np.sqrt(distsq.mean())
-            cell_min_r[cell] = np.sqrt(distsq.min())
+        cell_length = np.sqrt(distsq.max(axis=1))
+        cell_r = np.sqrt(distsq.mean(axis=1))
+        cell_min_r = np.sqrt(distsq.min(axis=1))
 
         return cell_min_r, cell_r, centroids, cell_length
 
@@ -2116,6 +3174,113 @@ class Mesh(Stateful, uw_object):
         all_centroids = gather_data(domain_centroid, bcast=True).reshape(-1, self.dim)
         return all_centroids
 
+    def _get_partition_map(self):
+        """
+        A coarse, global map of the mesh partition. The bounding box of the whole mesh
+        is divided into a uniform grid of bins and each bin is assigned to the rank that
+        owns most of the cell centroids falling inside it (-1 if there are none).
+
+        This is a collective operation. The map is cached until the mesh coordinates
+        change so that every swarm on this mesh can look up particle destinations
+        without any further communication.
+
+        Returns:
+        --------
+        (lower, spacing, shape, owners, domain_kdtree):
+            the origin and bin size of the grid, the number of bins in each direction,
+            the owning rank of each (flattened) bin and a kd-tree of the domain
+            centroids for points that land in empty bins.
+        """
+
+        if getattr(self, "_partition_map", None) is not None:
+            return self._partition_map
+
+        import numpy as np
+        from mpi4py import MPI
+
+        comm = uw.mpi.comm
+
+        coords = self.data.reshape(-1, self.cdim)[:, 0 : self.dim]
+        centroids = self._centroids.reshape(-1, self.dim)
+
+        local_lower = np.full(self.dim, np.inf)
+        local_upper = np.full(self.dim, -np.inf)
+        if coords.shape[0] > 0:
+            local_lower[:] = coords.min(axis=0)
+            local_upper[:] = coords.max(axis=0)
+
+        lower = np.empty_like(local_lower)
+        upper = np.empty_like(local_upper)
+        comm.Allreduce(local_lower, lower, op=MPI.MIN)
+        comm.Allreduce(local_upper, upper, op=MPI.MAX)
+
+        n_cells = comm.allreduce(centroids.shape[0], op=MPI.SUM)
+
+        # A few cells per bin is enough to resolve the partition boundaries
+        # while keeping the (replicated) map small
+
+        n_bins = int(np.clip(n_cells // 4, 64 * uw.mpi.size, 2**20))
+
+        extent = upper - lower
+        extent = np.maximum(extent, 1.0e-12 * max(1.0, extent.max()))
+        spacing = np.full(self.dim, (np.prod(extent) / n_bins) ** (1.0 / self.dim))
+        shape = np.maximum(np.ceil(extent / spacing).astype(int), 1)
+        spacing = extent / shape
+
+        bins = self._partition_map_bins(centroids, lower, spacing, shape)
+        counts = np.bincount(bins, minlength=np.prod(shape)).astype(np.int64)
+
+        max_counts = np.empty_like(counts)
+        comm.Allreduce(counts, max_counts, op=MPI.MAX)
+
+        # Ties go to the lowest rank
+        proposal = np.where(
+            np.logical_and(counts > 0, counts == max_counts), uw.mpi.rank, uw.mpi.size
+        ).astype(np.int64)
+        owners = np.empty_like(proposal)
+        comm.Allreduce(proposal, owners, op=MPI.MIN)
+        owners[owners == uw.mpi.size] = -1
+
+        domain_kdtree = uw.kdtree.KDTree(self._get_domain_centroids())
+
+        self._partition_map = (lower, spacing, shape, owners, domain_kdtree)
+
+        return self._partition_map
+
+    @staticmethod
+    def _partition_map_bins(points, lower, spacing, shape):
+        import numpy as np
+
+        index = np.floor((points - lower) / spacing).astype(int)
+        index = np.clip(index, 0, shape - 1)
+
+        return np.ravel_multi_index(index.T, shape)
+
+    def _partition_lookup(self, points):
+        """
+        Vectorised lookup of the rank that (most likely) owns each of the given points
+        using the coarse partition map. Points outside the mesh are assigned to the
+        owner of the nearest bin. The result is a guess near partition boundaries
+        which the caller is expected to check.
+        """
+
+        import numpy as np
+
+        lower, spacing, shape, owners, domain_kdtree = self._get_partition_map()
+
+        points = np.asarray(points).reshape(-1, self.dim)
+        if points.shape[0] == 0:
+            return np.zeros(0, dtype=int)
+
+        ranks = owners[self._partition_map_bins(points, lower, spacing, shape)]
+
+        empty = ranks == -1
+        if np.any(empty):
+            _, closest = domain_kdtree.query(points[empty], k=1)
+            ranks[empty] = np.asarray(closest).reshape(-1)
+
+        return ranks.astype(int)
+
     def get_min_radius_old(self) -> float:
         """
         This method returns the global minimum distance from any cell centroid to a face.
@@ -2167,6 +3332,71 @@ class Mesh(Stateful, uw_object):
 
         return all_max_radii.max()
 
+    @timing.routine_timer_decorator
+    def estimate_dt_per_cell(self, V_fn=None, diffusivity=None):
+        r"""
+        Element-by-element timestep limits for the local cells of the mesh.
+        Each cell uses its own radius (`mesh._radii`) together with the velocity
+        and diffusivity evaluated at its centroid so that a small cell in a
+        slow region does not constrain the timestep of the whole model.
+
+            - ${\delta t}_\textrm{adv} = r_e / |\mathbf{v}_e|$
+            - ${\delta t}_\textrm{diff} = r_e^2 / \kappa_e$
+
+        Parameters:
+        -----------
+        V_fn:
+            A (vector) sympy expression / mesh variable for the velocity or `None`
+        diffusivity:
+            A scalar sympy expression or number for the diffusivity or `None`
+
+        Returns:
+        --------
+        (dt_adv, dt_diff):
+            Two arrays of shape (n_local_cells,). Cells where the relevant
+            limit does not apply (zero velocity / diffusivity) are `numpy.inf`.
+            The global minimum is obtained with `numpy.min` followed by an
+            `MPI.MIN` reduction.
+        """
+
+        import numpy as np
+
+        radii = self._radii
+        centroids = self._centroids
+
+        dt_adv = np.full_like(radii, np.inf)
+        dt_diff = np.full_like(radii, np.inf)
+
+        if radii.shape[0] == 0:
+            return dt_adv, dt_diff
+
+        if V_fn is not None:
+            if hasattr(V_fn, "sym"):
+                V_fn = V_fn.sym
+
+            vel = uw.function.evaluate(V_fn, centroids, self.N)
+            magvel = np.linalg.norm(vel.reshape(radii.shape[0], -1), axis=1)
+
+            moving = magvel > 0.0
+            dt_adv[moving] = radii[moving] / magvel[moving]
+
+        if diffusivity is not None:
+            if isinstance(diffusivity, sympy.Basic):
+                if uw.function.fn_is_constant_expr(diffusivity):
+                    k = uw.function.evaluate(diffusivity, np.zeros((1, self.dim)))
+                    k = np.full_like(radii, float(np.asarray(k).reshape(-1)[0]))
+                else:
+                    k = uw.function.evaluate(
+                        sympy.sympify(diffusivity), centroids, self.N
+                    ).reshape(-1)
+            else:
+                k = np.full_like(radii, float(diffusivity))
+
+            diffusing = k > 0.0
+            dt_diff[diffusing] = radii[diffusing] ** 2 / k[diffusing]
+
+        return dt_adv, dt_diff
+
     # This should be deprecated in favour of using integrals
     def stats(self, uw_function, uw_meshVariable, basis=None):
         """
@@ -2708,6 +3938,8 @@ class _MeshVariable(Stateful, uw_object):
             might correspond to the timestep (for example).
         """
 
+        self.mesh._update_stale_proxies([self.clean_name])
+        self.mesh._sync_pending_ghosts()
         self._set_vec(available=False)
 
         viewer = PETSc.ViewerHDF5().create(filename, "a", comm=PETSc.COMM_WORLD)
@@ -2744,31 +3976,16 @@ class _MeshVariable(Stateful, uw_object):
             The filename of the mesh checkpoint file
         """
 
+        self.mesh._update_stale_proxies([self.clean_name])
+        self.mesh._sync_pending_ghosts()
         self._set_vec(available=False)
 
         # Variable coordinates - let's put those in the file to
         # make it a standalone "swarm"
 
-        dmold = self.mesh.dm.getCoordinateDM()
-        dmold.createDS()
-        dmnew = dmold.clone()
-
-        options = PETSc.Options()
-        options["coordinterp_petscspace_degree"] = self.degree
-        options["coordinterp_petscdualspace_lagrange_continuity"] = self.continuous
-        options["coordinterp_petscdualspace_lagrange_node_endpoints"] = False
-
-        dmfe = PETSc.FE().createDefault(
-            self.mesh.dim,
-            self.mesh.cdim,
-            self.mesh.isSimplex,
-            self.mesh.qdegree,
-            "coordinterp_",
-            PETSc.COMM_SELF,
-        )
-
-        dmnew.setField(0, dmfe)
-        dmnew.createDS()
+        dmnew = self.mesh._get_coordinate_interpolation(self.degree, self.continuous)[
+            "dm"
+        ]
 
         lvec = dmnew.getLocalVec()
         gvec = dmnew.getGlobalVec()
@@ -2789,7 +4006,6 @@ class _MeshVariable(Stateful, uw_object):
 
         uw.mpi.barrier()
         viewer.destroy()
-        dmfe.destroy()
 
         return
 
@@ -2895,7 +4111,7 @@ class _MeshVariable(Stateful, uw_object):
             data_name = self.clean_name
 
         with self.mesh.access(self):
-            indexset, subdm = self.mesh.dm.createSubDM(self.field_id)
+            subdm = self.mesh._get_field_decomposition()["dms"][self.field_id]
 
             old_name = self._gvec.getName()
             viewer = PETSc.ViewerHDF5().create(filename, "r", comm=PETSc.COMM_WORLD)
@@ -3020,7 +4236,7 @@ class _MeshVariable(Stateful, uw_object):
 
     def _set_vec(self, available):
         if self._lvec == None:
-            indexset, subdm = self.mesh.dm.createSubDM(self.field_id)
+            subdm = self.mesh._get_field_decomposition()["dms"][self.field_id]
 
             self._lvec = subdm.createLocalVector()
             self._lvec.zeroEntries()  # not sure if required, but to be sure.
@@ -171,7 +171,8 @@ def evaluate(   expr,
                 simplify=True,
                 verbose=False,
                 evalf=False,
-                rbf=False,):
+                rbf=False,
+                cells=None,):
     """
     Evaluate a given expression at a list of coordinates.
 
@@ -191,7 +192,18 @@ def evaluate(   expr,
         Dictionary of other arguments necessary to evaluate function.
         Not yet implemented.
 
+    cells: numpy.ndarray
+        Optional guess for the (local) cell containing each coordinate, used in place of
+        the k-d tree search for the interpolation hints (e.g. cells from a previous
+        evaluation at nearby points).
 
+    Notes
+    -----
+    Swarm variable proxies are rebuilt on demand. If the expression contains a proxy
+    that is out of date (the swarm has moved or the variable has changed since the
+    proxy was last used), it is rebuilt here and this call becomes collective: it must
+    then be made on all processes, not just on one rank. Calling
+    `SwarmVariable.update_proxy()` collectively beforehand avoids this.
     """
 
 
@@ -244,6 +256,10 @@ def evaluate(   expr,
             if mesh != varfn.meshvar().mesh:
                 raise RuntimeError("In this expression there are functions defined on different meshes. This is not supported")
 
+    # Swarm variable proxies in the expression are only rebuilt when needed
+    if mesh is not None:
+        mesh._update_stale_proxies([varfn.meshvar().clean_name for varfn in varfns])
+
 
     # If there are no mesh variables, then we have no need of a mesh to
     # help us to evaluate the expression. The evalf flag will force rbf_evaluation and
@@ -278,7 +294,8 @@ def evaluate(   expr,
                                     coord_sys,
                                     mesh,
                                     simplify=simplify,
-                                    verbose=verbose, )
+                                    verbose=verbose,
+                                    cells=None if cells is None else cells[in_or_not], )
 
         if np.count_nonzero(in_or_not == False) > 0:
             evaluation_exterior = rbf_evaluate( expr,
@@ -309,7 +326,8 @@ def petsc_interpolate(   expr,
                 mesh=None,
                 other_arguments=None,
                 simplify=True,
-                verbose=False, ):
+                verbose=False,
+                cells=None, ):
     """
     Evaluate a given expression at a list of coordinates.
 
@@ -415,7 +433,7 @@ def petsc_interpolate(   expr,
     # 2. Evaluate all mesh variables - there is no real
     # computational benefit in interpolating a subset.
 
-    def interpolate_vars_on_mesh( varfns, np.ndarray coords ):
+    def interpolate_vars_on_mesh( varfns, np.ndarray coords, hint_cells=None ):
         """
         This function performs the interpolation for the given variables
         on a single mesh.
@@ -488,7 +506,9 @@ def petsc_interpolate(   expr,
         # INTERPOLATE ALL VARIABLES ON THE DM
 
         # grab closest cells to use as hint for DMInterpolationSetUp
-        cdef np.ndarray cells = mesh.get_closest_cells(coords)
+        if hint_cells is None:
+            hint_cells = mesh.get_closest_cells(coords)
+        cdef np.ndarray cells = np.ascontiguousarray(hint_cells, dtype=np.int64)
         cdef long unsigned int* cells_buff = <long unsigned int*> cells.data
         ierr = DMInterpolationSetUp_UW(ipInfo, dm.dm, 0, 0, <size_t*> cells_buff)
 
@@ -530,7 +550,7 @@ def petsc_interpolate(   expr,
     # Get map of all variable functions
     interpolated_results = {}
     for key, vals in interpolant_varfns.items():
-        interpolated_var_values = interpolate_vars_on_mesh(vals, coords)
+        interpolated_var_values = interpolate_vars_on_mesh(vals, coords, cells)
         interpolated_results.update(interpolated_var_values)
 
     # 3. Replace mesh variables in the expression with sympy symbols
@@ -85,16 +85,7 @@ class KDTree(_oKDTree):
             # only use nearest neighbour raw data
             return data[closest_n]
 
-        # can decompose weighting vecotrs as IDW is a linear relationship
-        # build normalise weight vectors and multiply that with known data
-        epsilon = 1e-12
-        weights = 1 / np.power(epsilon + distance_n[:], p)
-        n_weights = (weights.T / np.sum(weights, axis=1)).T
-        kdata = data[closest_n[:]]
-
-        # magic with einstein summation power
-        vals = np.einsum("sdc,sd->sc", kdata, n_weights)
-        # print(valz)
+        vals = rbf_interpolate_from_neighbours(data, distance_n, closest_n, p)
 
         if verbose and uw.mpi.rank == 0:
             print(f"Mapping values  ... finished", flush=True)
@@ -102,4 +93,41 @@ class KDTree(_oKDTree):
         return vals
 
 
+def rbf_interpolate_from_neighbours(data, distance_n, closest_n, p=2):
+    """
+    The inverse distance weighted average of `data` over previously computed
+    neighbours, as returned by `KDTree.query(coords, k=nnn)`. This lets several
+    data arrays on the same points share one kd-tree search.
+
+    Args:
+    data       : ndarray,
+                The known data to map from (one row per kd-tree point).
+    distance_n : ndarray,
+                The distances to the neighbours of each target point, shape (n, nnn).
+    closest_n  : ndarray,
+                The indices of the neighbours of each target point, shape (n, nnn).
+    p          : int,
+                The power index to calculate weights, ie. pow(distance, -p)
+    """
+
+    distance_n = distance_n.reshape(closest_n.shape[0], -1)
+    closest_n = closest_n.reshape(closest_n.shape[0], -1)
+
+    if closest_n.shape[1] == 1:
+        # only use nearest neighbour raw data
+        return data[closest_n[:, 0]]
+
+    # can decompose weighting vecotrs as IDW is a linear relationship
+    # build normalise weight vectors and multiply that with known data
+    epsilon = 1e-12
+    weights = 1 / np.power(epsilon + distance_n[:], p)
+    n_weights = (weights.T / np.sum(weights, axis=1)).T
+    kdata = data[closest_n[:]]
+
+    # magic with einstein summation power
+    vals = np.einsum("sdc,sd->sc", kdata, n_weights)
+
+    return vals
+
+
 ## NB the rbf interpolator TO kdtree is missing (and we need that one that we introduced to do a better job of mapping values from swarms to nodes for proxy variables)
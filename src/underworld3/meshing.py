@@ -17,6 +17,181 @@ import underworld3.timing as timing
 
 import sympy
 
+## Mesh generation cache
+##
+## Meshes built by the constructors in this module (with filename=None) are
+## stored in `mesh_cache_directory` under a name derived from a hash of the
+## constructor arguments and the gmsh version. If the converted DMPlex h5 file
+## already exists, gmsh is skipped entirely and the h5 file is loaded directly.
+## Arguments without a canonical value (e.g. callables) disable the cache.
+## The directory is pruned (least recently used first) when it grows beyond
+## `mesh_cache_size_limit` bytes. Setting the limit to 0 disables pruning.
+
+mesh_cache_directory = ".meshes"
+mesh_cache_size_limit = int(
+    float(os.environ.get("UW_MESH_CACHE_SIZE_MB", 1024)) * 1024 * 1024
+)
+
+# Bump this if the layout of the generated meshes changes in a way that
+# the constructor arguments cannot capture.
+_MESH_CACHE_VERSION = 1
+
+def _mesh_cache_key(value):
+    """Canonical, hashable text for a mesh constructor argument.
+
+    Scalars are written exactly, numpy arrays by dtype, shape and raw bytes,
+    and containers element by element. Returns None for values that have no
+    stable representation (callables, arbitrary objects).
+    """
+
+    if isinstance(value, np.generic):
+        return _mesh_cache_key(value.item())
+
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return f"{type(value).__name__}:{value!r}"
+
+    if isinstance(value, Enum):
+        return f"{type(value).__qualname__}.{value.name}:{_mesh_cache_key(value.value)}"
+
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return None
+        import hashlib
+
+        data = np.ascontiguousarray(value)
+        digest = hashlib.sha1(data.tobytes()).hexdigest()
+        return f"ndarray:{data.dtype.str}:{data.shape}:{digest}"
+
+    if isinstance(value, (list, tuple)):
+        items = [_mesh_cache_key(item) for item in value]
+        if any(item is None for item in items):
+            return None
+        return f"{type(value).__name__}:(" + ",".join(items) + ")"
+
+    if isinstance(value, dict):
+        items = []
+        for k in sorted(value, key=repr):
+            key, item = _mesh_cache_key(k), _mesh_cache_key(value[k])
+            if key is None or item is None:
+                return None
+            items.append(f"{key}={item}")
+        return "dict:{" + ",".join(items) + "}"
+
+    return None
+
+
+def _mesh_cache_filename(kind, **params):
+    """Content-addressed cache filename for a mesh constructor.
+
+    `params` are the constructor arguments that determine the generated mesh
+    file (arguments that only act after the file is built, such as `degree`
+    or `refinement`, should not be passed). The hash covers their canonical
+    values (see `_mesh_cache_key`), the gmsh version and the cache version.
+
+    If any parameter cannot be hashed reliably (a callable, for example),
+    caching is disabled: the returned name lies outside the cache directory
+    so the mesh is always regenerated.
+    """
+
+    import gmsh
+    import hashlib
+
+    key = [
+        f"kind={kind}",
+        f"gmsh={getattr(gmsh, '__version__', None)}",
+        f"api={getattr(gmsh, 'GMSH_API_VERSION', None)}",
+        f"cache={_MESH_CACHE_VERSION}",
+    ]
+
+    for name in sorted(params):
+        value = _mesh_cache_key(params[name])
+        if value is None:
+            uw_filename = os.path.join(mesh_cache_directory, "uncached", f"uw_{kind}.msh")
+            if uw.mpi.rank == 0:
+                os.makedirs(os.path.dirname(uw_filename), exist_ok=True)
+            return uw_filename
+
+        key.append(f"{name}={value}")
+
+    digest = hashlib.sha1("\n".join(key).encode()).hexdigest()[0:16]
+
+    uw_filename = os.path.join(mesh_cache_directory, f"uw_{kind}_{digest}.msh")
+
+    if uw.mpi.rank == 0:
+        os.makedirs(mesh_cache_directory, exist_ok=True)
+        _prune_mesh_cache(keep=uw_filename)
+
+    return uw_filename
+
+
+def _mesh_cache_hit(uw_filename):
+    """True if `uw_filename` is a cache entry with an up-to-date h5 conversion.
+
+    Files outside the cache directory (user supplied filenames) never count
+    as a hit. A hit refreshes the timestamp of the entry for pruning.
+    """
+
+    cache_dir = os.path.abspath(mesh_cache_directory)
+    if os.path.dirname(os.path.abspath(uw_filename)) != cache_dir:
+        return False
+
+    h5_filename = uw_filename + ".h5"
+    if not (os.path.exists(uw_filename) and os.path.exists(h5_filename)):
+        return False
+
+    if os.path.getmtime(h5_filename) < os.path.getmtime(uw_filename):
+        return False
+
+    try:
+        os.utime(h5_filename, None)
+    except OSError:
+        pass
+
+    return True
+
+
+def _prune_mesh_cache(keep=None, size_limit=None):
+    """Remove least recently used entries until the cache fits in `size_limit`.
+
+    `keep` is a cache filename that should never be removed (usually the
+    mesh that is just being built). Only called on rank 0.
+    """
+
+    if size_limit is None:
+        size_limit = mesh_cache_size_limit
+
+    if size_limit <= 0 or not os.path.isdir(mesh_cache_directory):
+        return
+
+    entries = {}
+    for name in os.listdir(mesh_cache_directory):
+        if not name.startswith("uw_"):
+            continue
+        path = os.path.join(mesh_cache_directory, name)
+        stem = path[: -len(".h5")] if path.endswith(".msh.h5") else path
+        if not stem.endswith(".msh"):
+            continue
+        stat = os.stat(path)
+        size, last_used = entries.get(stem, (0, 0.0))
+        entries[stem] = (size + stat.st_size, max(last_used, stat.st_mtime))
+
+    total = sum(size for size, _ in entries.values())
+
+    keep = os.path.abspath(keep) if keep is not None else None
+    for stem, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+        if total <= size_limit:
+            break
+        if os.path.abspath(stem) == keep:
+            continue
+        for path in (stem, stem + ".h5"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+
+    return
+
 
 @timing.routine_timer_decorator
 def UnstructuredSimplexBox(
@@ -84,14 +259,17 @@ def UnstructuredSimplexBox(
         boundary_normals = boundary_normals_3D
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_simplexbox_minC{minCoords}_maxC{maxCoords}_csize{cellSize}_reg{regular}.msh"
+        uw_filename = _mesh_cache_filename(
+            "simplexbox",
+            minCoords=minCoords,
+            maxCoords=maxCoords,
+            cellSize=cellSize,
+            regular=regular,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -244,6 +422,9 @@ def UnstructuredSimplexBox(
         verbose=verbose,
     )
 
+    if regular:
+        new_mesh._set_lattice_layout(minCoords, maxCoords)
+
     return new_mesh
 
 
@@ -319,16 +500,16 @@ def StructuredQuadBox(
         boundary_normals = boundary_normals_3D
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = (
-            f".meshes/uw_structuredQuadBox_minC{minCoords}_maxC{maxCoords}.msh"
+        uw_filename = _mesh_cache_filename(
+            "structuredQuadBox",
+            elementRes=elementRes,
+            minCoords=minCoords,
+            maxCoords=maxCoords,
         )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         gmsh.initialize()
         gmsh.option.setNumber("General.Verbosity", gmsh_verbosity)
         gmsh.model.add("Box")
@@ -560,6 +741,8 @@ def StructuredQuadBox(
         verbose=verbose,
     )
 
+    new_mesh._set_lattice_layout(minCoords, maxCoords)
+
     return new_mesh
 
 
@@ -583,14 +766,16 @@ def SphericalShell(
     import gmsh
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_spherical_shell_ro{radiusOuter}_ri{radiusInner}_csize{cellSize}.msh"
+        uw_filename = _mesh_cache_filename(
+            "spherical_shell",
+            radiusOuter=radiusOuter,
+            radiusInner=radiusInner,
+            cellSize=cellSize,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         gmsh.initialize()
         gmsh.option.setNumber("General.Verbosity", gmsh_verbosity)
         gmsh.model.add("Sphere")
@@ -801,10 +986,13 @@ def SphericalShellInternalBoundary(
     import gmsh
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_spherical_shell_ro{radiusOuter}_rint{radiusInternal}_ri{radiusInner}_csize{cellSize}.msh"
+        uw_filename = _mesh_cache_filename(
+            "spherical_shell_internalBoundary",
+            radiusOuter=radiusOuter,
+            radiusInternal=radiusInternal,
+            radiusInner=radiusInner,
+            cellSize=cellSize,
+        )
     else:
         uw_filename = filename
 
@@ -812,7 +1000,7 @@ def SphericalShellInternalBoundary(
     if radiusInner <= 0:
         raise ValueError("The inner radius must be greater than 0.")
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         gmsh.initialize()
         gmsh.option.setNumber("General.Verbosity", gmsh_verbosity)
         gmsh.model.add("SphereShell_with_Internal_Surface")
@@ -1045,10 +1233,15 @@ def SegmentofSphere(
     import gmsh
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_segmentofsphere_ro{radiusOuter}_ri{radiusInner}_longext{longitudeExtent}_latext{latitudeExtent}_csize{cellSize}.msh"
+        uw_filename = _mesh_cache_filename(
+            "segmentofsphere",
+            radiusOuter=radiusOuter,
+            radiusInner=radiusInner,
+            longitudeExtent=longitudeExtent,
+            latitudeExtent=latitudeExtent,
+            cellSize=cellSize,
+            centroid=centroid,
+        )
     else:
         uw_filename = filename
 
@@ -1063,7 +1256,7 @@ def SegmentofSphere(
             "and longitudeExtent and latitudeExtent must be within the range (0, 180)."
         )
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
 
         def getSphericalXYZ(point):
             """
@@ -1263,16 +1456,18 @@ def QuarterAnnulus(
         Centre = 10
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = (
-            f"uw_QuarterAnnulus_ro{radiusOuter}_ri{radiusInner}_csize{cellSize}.msh"
+        uw_filename = _mesh_cache_filename(
+            "quarter_annulus",
+            radiusOuter=radiusOuter,
+            radiusInner=radiusInner,
+            angle=angle,
+            cellSize=cellSize,
+            centre=centre,
         )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -1431,11 +1626,14 @@ def Annulus(
         Centre = 10
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = (
-            f".meshes/uw_annulus_ro{radiusOuter}_ri{radiusInner}_csize{cellSize}.msh"
+        uw_filename = _mesh_cache_filename(
+            "annulus",
+            radiusOuter=radiusOuter,
+            radiusInner=radiusInner,
+            cellSize=cellSize,
+            cellSizeOuter=cellSizeOuter,
+            cellSizeInner=cellSizeInner,
+            centre=centre,
         )
     else:
         uw_filename = filename
@@ -1446,7 +1644,7 @@ def Annulus(
     if cellSizeOuter is None:
         cellSizeOuter = cellSize
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -1668,10 +1866,14 @@ def SegmentofAnnulus(
         Centre = 10
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f"uw_SegmentOfAnnulus_ro{radiusOuter}_ri{radiusInner}_extent{angleExtent}_csize{cellSize}.msh"
+        uw_filename = _mesh_cache_filename(
+            "segment_of_annulus",
+            radiusOuter=radiusOuter,
+            radiusInner=radiusInner,
+            angleExtent=angleExtent,
+            cellSize=cellSize,
+            centre=centre,
+        )
     else:
         uw_filename = filename
 
@@ -1683,7 +1885,7 @@ def SegmentofAnnulus(
             "and angleExtent must be within the range (0, 180)."
         )
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -1868,17 +2070,22 @@ def AnnulusWithSpokes(
         Spokes = 99
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_annulus_ro{radiusOuter}_ri{radiusInner}_csize{cellSizeOuter}.msh"
+        uw_filename = _mesh_cache_filename(
+            "annulus_spokes",
+            radiusOuter=radiusOuter,
+            radiusInner=radiusInner,
+            cellSizeOuter=cellSizeOuter,
+            cellSizeInner=cellSizeInner,
+            centre=centre,
+            spokes=spokes,
+        )
     else:
         uw_filename = filename
 
     if cellSizeInner is None:
         cellSizeInner = cellSizeOuter
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -2135,14 +2342,21 @@ def AnnulusInternalBoundary(
         cellSize_Internal = cellSize
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_annulus_internalBoundary_rO{radiusOuter}rInt{radiusInternal}_rI{radiusInner}_csize{cellSize}_csizefs{cellSize_Outer}.msh"
+        uw_filename = _mesh_cache_filename(
+            "annulus_internalBoundary",
+            radiusOuter=radiusOuter,
+            radiusInternal=radiusInternal,
+            radiusInner=radiusInner,
+            cellSize=cellSize,
+            cellSize_Outer=cellSize_Outer,
+            cellSize_Inner=cellSize_Inner,
+            cellSize_Internal=cellSize_Internal,
+            centre=centre,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -2351,14 +2565,21 @@ def DiscInternalBoundaries(
         cellSize_Centre = cellSize
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_disc_internalBoundaries_rO{radiusUpper}rInt{radiusInternal}_rI{radiusLower}_csize{cellSize}_csizefs{cellSize_Upper}.msh"
+        uw_filename = _mesh_cache_filename(
+            "disc_internalBoundaries",
+            radiusUpper=radiusUpper,
+            radiusInternal=radiusInternal,
+            radiusLower=radiusLower,
+            cellSize=cellSize,
+            cellSize_Upper=cellSize_Upper,
+            cellSize_Lower=cellSize_Lower,
+            cellSize_Internal=cellSize_Internal,
+            cellSize_Centre=cellSize_Centre,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -2551,13 +2772,17 @@ def CubedSphere(
     r2 = radiusOuter / np.sqrt(3)
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_cubed_spherical_shell_ro{radiusOuter}_ri{radiusInner}_elts{numElements}_plex{simplex}.msh"
+        uw_filename = _mesh_cache_filename(
+            "cubed_spherical_shell",
+            radiusOuter=radiusOuter,
+            radiusInner=radiusInner,
+            numElements=numElements,
+            simplex=simplex,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -2836,13 +3061,21 @@ def RegionalSphericalBox(
     # r2 = radiusOuter / np.sqrt(3)
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_cubed_spherical_shell_ro{radiusOuter}_ri{radiusInner}_elts{numElementsDepth}_plex{simplex}.msh"
+        uw_filename = _mesh_cache_filename(
+            "regional_spherical_box",
+            radiusOuter=radiusOuter,
+            radiusInner=radiusInner,
+            SWcorner=SWcorner,
+            NEcorner=NEcorner,
+            numElementsLon=numElementsLon,
+            numElementsLat=numElementsLat,
+            numElementsDepth=numElementsDepth,
+            simplex=simplex,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -3067,13 +3300,16 @@ def SegmentedSphericalSurface2D(
     meshRes = cellSize
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_segmented_spherical_surface_r{radius}_csize{cellSize}_segs{num_segments}.msh"
+        uw_filename = _mesh_cache_filename(
+            "segmented_spherical_surface",
+            radius=radius,
+            cellSize=cellSize,
+            numSegments=numSegments,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         options = PETSc.Options()
@@ -3244,13 +3480,18 @@ def SegmentedSphericalShell(
         coordinate_system = CoordinateSystemType.SPHERICAL
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_segmented_sphere_ro{radiusOuter}_ri{radiusInner}_csize{cellSize}_segs{num_segments}.msh"
+        uw_filename = _mesh_cache_filename(
+            "segmented_sphere",
+            radiusOuter=radiusOuter,
+            radiusInner=radiusInner,
+            cellSize=cellSize,
+            numSegments=numSegments,
+            coordinatesNative=coordinatesNative,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         options = PETSc.Options()
@@ -3648,13 +3889,17 @@ def SegmentedSphericalBall(
         coordinate_system = CoordinateSystemType.SPHERICAL
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_segmented_ball_ro{radius}_csize{cellSize}_segs{num_segments}.msh"
+        uw_filename = _mesh_cache_filename(
+            "segmented_ball",
+            radius=radius,
+            cellSize=cellSize,
+            numSegments=numSegments,
+            coordinatesNative=coordinatesNative,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         options = PETSc.Options()
@@ -4053,17 +4298,28 @@ def BoxInternalBoundary(
     dim = len(minCoords)
 
     if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        if not simplex:
-            # structuredQuadBoxIB
-            uw_filename = f".meshes/uw_sqbIB_minC{minCoords}_maxC{maxCoords}.msh"
-        else:
-            uw_filename = f".meshes/uw_usbIB_minC{minCoords}_maxC{maxCoords}.msh"
+        uw_filename = _mesh_cache_filename(
+            "box_internalBoundary",
+            elementRes=elementRes,
+            zelementRes=zelementRes,
+            cellSize=cellSize,
+            minCoords=minCoords,
+            maxCoords=maxCoords,
+            zintCoord=zintCoord,
+            simplex=simplex,
+        )
     else:
         uw_filename = filename
 
-    if uw.mpi.rank == 0:
+    # needed on all ranks (and when gmsh is skipped)
+    if dim == 2:
+        boundaries = boundaries_2D
+        boundary_normals = boundary_normals_2D
+    else:
+        boundaries = boundaries_3D
+        boundary_normals = boundary_normals_3D
+
+    if uw.mpi.rank == 0 and not _mesh_cache_hit(uw_filename):
         import gmsh
 
         gmsh.initialize()
@@ -6,6 +6,7 @@ import sympy
 import h5py
 import os
 import warnings
+import contextlib
 from typing import Optional, Tuple
 
 import underworld3 as uw
@@ -180,6 +181,9 @@ class SwarmVariable(Stateful, uw_object):
 
         # proxy variable
         self._proxy = _proxy
+        self._proxy_stale = False
+        self._proxy_rebuilding = False
+        self.proxy_rebuilds_avoided = 0
         self._vtype = vtype
         self._proxy_degree = proxy_degree
         self._proxy_continuous = proxy_continuous
@@ -265,18 +269,79 @@ class SwarmVariable(Stateful, uw_object):
                 varsymbol=r"\left<" + self.symbol + r"\right>",
             )
 
+    def _proxy_variables(self):
+        """The proxy mesh variables that represent this swarm variable."""
+
+        if not self._meshVar:
+            return []
+
+        return [self._meshVar]
+
     def _update(self):
         """
-        This method updates the proxy mesh variable for the current
-        swarm & particle variable state.
+        This method marks the proxy mesh variable as out of date for the current
+        swarm & particle variable state. The proxy is rebuilt when it is next
+        needed: when a compiled solver or `uw.function.evaluate` reads it, when it
+        is saved, or when `update_proxy` is called.
+
+        `proxy_rebuilds_avoided` counts the updates that were superseded before
+        anything read the proxy.
         """
 
+        proxies = self._proxy_variables()
+
         # if not proxied, nothing to do. return.
-        if not self._meshVar:
+        if not proxies:
             return
 
-        else:
-            self._rbf_to_meshVar(self._meshVar)
+        if self._proxy_stale:
+            self.proxy_rebuilds_avoided += 1
+
+        self._proxy_stale = True
+
+        import weakref
+
+        for meshVar in proxies:
+            self.swarm.mesh._stale_proxies[meshVar.clean_name] = weakref.ref(self)
+
+        return
+
+    def update_proxy(self):
+        """
+        Rebuild the proxy mesh variable now if the swarm or the variable
+        have changed since it was last computed.
+
+        This is collective (the rebuild updates the ghost values of the proxy),
+        and so are `uw.function.evaluate` and `Mesh.access` calls that involve
+        out-of-date proxies. A proxy that is open in an enclosing `Mesh.access`
+        block is rebuilt in place.
+        """
+
+        if not self._proxy_stale or self._proxy_rebuilding:
+            return
+
+        proxies = self._proxy_variables()
+
+        self._proxy_rebuilding = True
+        try:
+            self._rebuild_proxy()
+        finally:
+            self._proxy_rebuilding = False
+
+        # only marked current once the rebuild has succeeded
+        self._proxy_stale = False
+        for meshVar in proxies:
+            self.swarm.mesh._stale_proxies.pop(meshVar.clean_name, None)
+
+        return
+
+    def _rebuild_proxy(self):
+        """
+        This method updates the proxy mesh variable for the current
+        swarm & particle variable state.
+        """
+
+        self._rbf_to_meshVar(self._meshVar)
 
         return
 
@@ -302,7 +367,7 @@ class SwarmVariable(Stateful, uw_object):
 
         Values = self.rbf_interpolate(new_coords, verbose=verbose, nnn=nnn)
 
-        with meshVar.mesh.access(meshVar):
+        with _proxy_write_access(meshVar):
             meshVar.data[...] = Values[...]
 
         return
@@ -331,7 +396,7 @@ class SwarmVariable(Stateful, uw_object):
 
         kd = uw.kdtree.KDTree(meshVar.coords)
 
-        with self.swarm.access():
+        with self.swarm.access(read=[self, self.swarm.particle_coordinates]):
             d, n = kd.query(self.swarm.data, k=1)
 
             node_values = np.zeros((meshVar.coords.shape[0], self.num_components))
@@ -351,7 +416,7 @@ class SwarmVariable(Stateful, uw_object):
 
         p_nnmap = self.swarm._get_map(self)
 
-        with self.swarm.mesh.access(meshVar), self.swarm.access():
+        with _proxy_write_access(meshVar), self.swarm.access(read=[self]):
             meshVar.data[...] = node_values[...]
             meshVar.data[np.where(w == 0.0), :] = self.data[
                 p_nnmap[np.where(w == 0.0)], :
@@ -366,7 +431,7 @@ class SwarmVariable(Stateful, uw_object):
 
         import numpy as np
 
-        with self.swarm.access():
+        with self.swarm.access(read=[self]):
             data_size = self.data.shape
 
         # What to do if there are no particles
@@ -379,23 +444,29 @@ class SwarmVariable(Stateful, uw_object):
         if nnn > data_size[0]:
             nnn = data_size[0]
 
-        with self.swarm.access():
-            if self.swarm.recycle_rate > 1:
+        if self.swarm.recycle_rate > 1:
+            with self.swarm.access():
                 not_remeshed = self.swarm._remeshed.data[:, 0] != 0
                 D = self.data[not_remeshed].copy()
 
                 kdt = uw.kdtree.KDTree(
                     self.swarm.particle_coordinates.data[not_remeshed, :]
                 )
-            else:
-                D = self.data.copy()
-                kdt = uw.kdtree.KDTree(self.swarm.particle_coordinates.data[:, :])
 
-            # kdt.build_index()
+                # kdt.build_index()
+
+                values = kdt.rbf_interpolator_local(new_coords, D, nnn, 2, verbose)
+
+                del kdt
 
-            values = kdt.rbf_interpolator_local(new_coords, D, nnn, 2, verbose)
+        else:
+            # The neighbour search is shared by all variables on this swarm
+            distance_n, closest_n = _particle_neighbours(self.swarm, new_coords, nnn)
 
-            del kdt
+            with self.swarm.access(read=[self]):
+                values = uw.kdtree.rbf_interpolate_from_neighbours(
+                    self.data, distance_n, closest_n, 2
+                )
 
         return values
 
@@ -498,6 +569,7 @@ class SwarmVariable(Stateful, uw_object):
                 print("No proxy mesh variable that can be saved", flush=True)
             return
 
+        self.update_proxy()
         self._meshVar.write(filename)
 
         return
@@ -697,7 +769,10 @@ class IndexSwarmVariable(SwarmVariable):
             print(f"IndexSwarmVariable {self}")
             print(f"Numer of indices {self.indices}")
 
-    def _update(self):
+    def _proxy_variables(self):
+        return self._meshLevelSetVars
+
+    def _rebuild_proxy(self):
         """
         This method updates the proxy mesh (vector) variable for the index variable on the current swarm locations
 
@@ -716,23 +791,18 @@ class IndexSwarmVariable(SwarmVariable):
         update_type 1: calculate the material property value on mesh_levelset nodes from the nearest N particles directly.
 
         """
+        # The neighbour searches are shared with the other variables on this swarm
         if self.update_type == 0:
-            kd = uw.kdtree.KDTree(self._meshLevelSetVars[0].coords)
-
-            with self.swarm.access():
-                n_distance, n_indices = kd.query(
-                    self.swarm.particle_coordinates.data, k=self.nnn
-                )
-                kd_swarm = uw.kdtree.KDTree(self.swarm.particle_coordinates.data)
-                # n, d, b = kd_swarm.find_closest_point(self._meshLevelSetVars[0].coords)
-                d, n = kd_swarm.query(
-                    self._meshLevelSetVars[0].coords, k=1, sqr_dist=True
-                )
+            n_distance, n_indices = _point_neighbours(
+                self.swarm, self._meshLevelSetVars[0].coords, self.nnn
+            )
+            d, n = _particle_neighbours(self.swarm, self._meshLevelSetVars[0].coords, 1)
+            n = n[:, 0]
 
             for ii in range(self.indices):
                 meshVar = self._meshLevelSetVars[ii]
 
-                with self.swarm.mesh.access(meshVar), self.swarm.access():
+                with _proxy_write_access(meshVar), self.swarm.access():
                     node_values = np.zeros((meshVar.data.shape[0],))
                     w = np.zeros((meshVar.data.shape[0],))
 
@@ -760,15 +830,14 @@ class IndexSwarmVariable(SwarmVariable):
                         if len(ind_) > 0:
                             meshVar.data[ind_w0[ind_]] = 1.0
         elif self.update_type == 1:
-            with self.swarm.access():
-                kd = uw.kdtree.KDTree(self.swarm.particle_coordinates.data)
-                n_distance, n_indices = kd.query(
-                    self._meshLevelSetVars[0].coords, k=self.nnn, sqr_dist=True
-                )
+            n_distance, n_indices = _particle_neighbours(
+                self.swarm, self._meshLevelSetVars[0].coords, self.nnn
+            )
+            n_distance = n_distance**2
 
             for ii in range(self.indices):
                 meshVar = self._meshLevelSetVars[ii]
-                with self.swarm.mesh.access(meshVar), self.swarm.access():
+                with _proxy_write_access(meshVar), self.swarm.access():
                     node_values = np.zeros((meshVar.data.shape[0],))
                     w = np.zeros((meshVar.data.shape[0],))
                     for i in range(meshVar.data.shape[0]):
@@ -804,6 +873,212 @@ class IndexSwarmVariable(SwarmVariable):
         return
 
 
+## Neighbour searches shared by all the variables of a swarm (Swarm or PICSwarm).
+## The particle kd-tree and the query results for each set of points (e.g. the
+## nodes of a proxy mesh variable) are cached for the current swarm state.
+
+
+def _swarm_neighbour_cache(swarm):
+    state = (swarm._get_state(), swarm.dm.getLocalSize())
+    if swarm._index_state != state:
+        swarm._index = None
+        swarm._nnmapdict = {}
+        swarm._index_state = state
+
+    return swarm._nnmapdict
+
+
+def _coords_digest(coords):
+    import xxhash
+
+    h = xxhash.xxh64()
+    h.update(np.ascontiguousarray(coords))
+
+    return h.intdigest()
+
+
+def _particle_kdtree(swarm):
+    """The kd-tree of the (local) particle coordinates of `swarm`."""
+
+    _swarm_neighbour_cache(swarm)
+
+    if swarm._index is None:
+        with swarm.access(read=[swarm.particle_coordinates]):
+            swarm._index = uw.kdtree.KDTree(swarm.particle_coordinates.data)
+
+    return swarm._index
+
+
+def _particle_neighbours(swarm, coords, nnn):
+    """
+    The `nnn` nearest particles to each of the points `coords`, as
+    (distances, indices), both of shape (n, nnn).
+    """
+
+    cache = _swarm_neighbour_cache(swarm)
+    key = ("particles", _coords_digest(coords), nnn)
+
+    if key not in cache:
+        distance_n, closest_n = _particle_kdtree(swarm).query(
+            np.ascontiguousarray(coords), k=nnn
+        )
+        cache[key] = (distance_n.reshape(-1, nnn), closest_n.reshape(-1, nnn))
+
+    return cache[key]
+
+
+def _point_neighbours(swarm, coords, nnn):
+    """
+    The `nnn` nearest of the points `coords` to each particle, as
+    (distances, indices), both of shape (n_particles, nnn).
+    """
+
+    cache = _swarm_neighbour_cache(swarm)
+    key = ("points", _coords_digest(coords), nnn)
+
+    if key not in cache:
+        kd = uw.kdtree.KDTree(np.ascontiguousarray(coords))
+        with swarm.access(read=[swarm.particle_coordinates]):
+            distance_n, closest_n = kd.query(swarm.particle_coordinates.data, k=nnn)
+        cache[key] = (distance_n.reshape(-1, nnn), closest_n.reshape(-1, nnn))
+
+    return cache[key]
+
+
+@contextlib.contextmanager
+def _proxy_write_access(meshVar):
+    """
+    Write access to the proxy mesh variable `meshVar` while it is rebuilt. If the
+    proxy is already open in an enclosing (unscoped) `Mesh.access` block it is
+    written in place and its ghost values are synchronised here, because the
+    enclosing block will not do that for a read-only variable.
+    """
+
+    mesh = meshVar.mesh
+
+    if not meshVar._is_accessed:
+        with mesh.access(write=[meshVar]):
+            yield
+        return
+
+    writeable = meshVar.data.flags.writeable
+    meshVar.data.flags.writeable = True
+    try:
+        yield
+    finally:
+        meshVar.data.flags.writeable = writeable
+
+    meshVar._increment()
+    mesh._stale_lvec = True
+    if mesh._field_decomposition is not None:
+        mesh._field_decomposition["states"].pop(meshVar.clean_name, None)
+
+    mesh._sync_ghosts([meshVar])
+
+    return
+
+
+## Explicit Runge-Kutta schemes for particle advection. Each stage is
+## launched from the start point: X_i = X0 + a_i * dt * k_(i-1), and the
+## step is X0 + dt * sum(b_i * k_i). Any other order falls back to
+## forward Euler.
+
+_advection_schemes = {
+    1: ((0.0,), (1.0,)),
+    2: ((0.0, 0.5), (0.0, 1.0)),
+    4: ((0.0, 0.5, 0.5, 1.0), (1.0 / 6.0, 1.0 / 3.0, 1.0 / 3.0, 1.0 / 6.0)),
+}
+
+
+def _advect_particle_coordinates(
+    swarm,
+    V_fn,
+    delta_t,
+    order=2,
+    substeps=1,
+    restore_points_to_domain_func=None,
+    evalf=False,
+):
+    """
+    Move the particles of `swarm` (a Swarm or PICSwarm) through the velocity field
+    `V_fn` over `delta_t` in `substeps` equal steps. All components of the velocity are
+    evaluated together at each stage, the stage points are written straight into the
+    particle coordinate array, and the owning cells of one stage are the starting
+    guess (by walking the mesh) for the next stage's interpolation hints.
+
+    The launch points of each sub-step are stored in `swarm._X0`.
+    """
+
+    a, b = _advection_schemes.get(order, _advection_schemes[1])
+
+    mesh = swarm.mesh
+    X0 = swarm._X0
+    V_fn_matrix = mesh.vector.to_matrix(V_fn)
+    h = delta_t / substeps
+
+    def stage_velocity(points, cells):
+        if points.shape[0] == 0:
+            return np.zeros_like(points), cells
+
+        if evalf:
+            cells = None
+        elif cells is None:
+            cells = mesh.get_closest_cells(points)
+        else:
+            known = np.where(cells != -1)[0]
+            cells[known] = mesh._locate_points_by_walking(
+                points[known], cells[known], max_steps=4
+            )
+            lost = np.where(cells == -1)[0]
+            if lost.shape[0] > 0:
+                cells[lost] = mesh.get_closest_cells(points[lost])
+
+        velocity = uw.function.evaluate(
+            V_fn_matrix,
+            points,
+            evalf=evalf,
+            cells=cells,
+        ).reshape(points.shape[0], -1)
+
+        return velocity, cells
+
+    for step in range(0, substeps):
+        # Swarms that track their owning cells provide the first hints
+        if hasattr(swarm, "_get_owning_cells") and not evalf:
+            cells = swarm._get_owning_cells().copy()
+        else:
+            cells = None
+
+        with swarm.access(swarm.particle_coordinates, X0):
+            coords = swarm.particle_coordinates.data
+            X0.data[...] = coords
+
+            increment = np.zeros_like(coords)
+
+            for a_i, b_i in zip(a, b):
+                # stage point (the first stage is the launch point)
+                if a_i != 0.0:
+                    np.multiply(velocity, a_i * h, out=coords)
+                    coords += X0.data
+
+                    # validate_coords to ensure they live within the domain (or there will be trouble)
+                    if restore_points_to_domain_func is not None:
+                        coords[...] = restore_points_to_domain_func(coords)
+
+                velocity, cells = stage_velocity(coords, cells)
+
+                if b_i != 0.0:
+                    increment += b_i * velocity
+
+            np.multiply(increment, h, out=coords)
+            coords += X0.data
+
+            if restore_points_to_domain_func is not None:
+                coords[...] = restore_points_to_domain_func(coords)
+
+    return
+
+
 ## This should be the basic swarm, and we can then create a sub-class that will
 ## be a PIC swarm
 
@@ -996,6 +1271,7 @@ class PICSwarm(Stateful, uw_object):
 
         self._X0_uninitialised = True
         self._index = None
+        self._index_state = None
         self._nnmapdict = {}
 
         super().__init__()
@@ -1567,7 +1843,7 @@ class PICSwarm(Stateful, uw_object):
     def vars(self):
         return self._vars
 
-    def access(self, *writeable_vars: SwarmVariable):
+    def access(self, *writeable_vars: SwarmVariable, read=None, write=None):
         """
         This context manager makes the underlying swarm variables data available to
         the user. The data should be accessed via the variables `data` handle.
@@ -1584,6 +1860,10 @@ class PICSwarm(Stateful, uw_object):
         ----------
         writeable_vars
             The variables for which data write access is required.
+        read, write
+            Lists of variables for read-only / write access. If either is given, only
+            these variables (and `writeable_vars`) are retrieved from the swarm,
+            otherwise every swarm variable is available (read-only unless writeable).
 
         Example
         -------
@@ -1600,8 +1880,22 @@ class PICSwarm(Stateful, uw_object):
         uw.timing._incrementDepth()
         stime = time.time()
 
+        writeable_vars = tuple(writeable_vars) + tuple(write or ())
+
+        if read is None and write is None:
+            requested_vars = list(self._vars.values())
+        else:
+            requested_vars = []
+            for var in tuple(read or ()) + writeable_vars:
+                if var.swarm is not self:
+                    raise RuntimeError(
+                        f"Variable {var.clean_name} is not defined on this swarm."
+                    )
+                if var not in requested_vars:
+                    requested_vars.append(var)
+
         deaccess_list = []
-        for var in self._vars.values():
+        for var in requested_vars:
             # if already accessed within higher level context manager, continue.
             if var._is_accessed == True:
                 continue
@@ -1645,10 +1939,8 @@ class PICSwarm(Stateful, uw_object):
 
             def __exit__(self, *args):
 
-                for var in self.em_swarm.vars.values():
-                    # only de-access variables we have set access for.
-                    if var not in deaccess_list:
-                        continue
+                # only de-access variables we have set access for.
+                for var in deaccess_list:
                     # set this back, although possibly not required.
                     if var not in writeable_vars:
                         var._data.flags.writeable = var._old_data_flag
@@ -1747,26 +2039,14 @@ class PICSwarm(Stateful, uw_object):
 
     @timing.routine_timer_decorator
     def _get_map(self, var):
-        # generate tree if not avaiable
-        if not self._index:
-            with self.access():
-                self._index = uw.kdtree.KDTree(self.data)
-
-        # get or generate map
-        meshvar_coords = var._meshVar.coords
-        # we can't use numpy arrays directly as keys in python dicts, so
-        # we'll use `xxhash` to generate a hash of array.
-        # this shouldn't be an issue performance wise but we should test to be
-        # sufficiently confident of this.
-        import xxhash
-
-        h = xxhash.xxh64()
-        h.update(meshvar_coords)
-        digest = h.intdigest()
-        if digest not in self._nnmapdict:
-            # self._nnmapdict[digest] = self._index.find_closest_point(meshvar_coords)[0]
-            self._nnmapdict[digest] = self._index.query(meshvar_coords, k=1)[0]
-        return self._nnmapdict[digest]
+        """
+        The nearest particle to each node of the proxy variable of `var`. This
+        uses the shared particle kd-tree and is cached for the current swarm state.
+        """
+
+        distance_n, closest_n = _particle_neighbours(self, var._meshVar.coords, 1)
+
+        return closest_n[:, 0]
 
     @timing.routine_timer_decorator
     def advection(
@@ -1779,6 +2059,12 @@ class PICSwarm(Stateful, uw_object):
         evalf=False,
         step_limit=True,
     ):
+        """
+        Advect the particles through the velocity field `V_fn` over `delta_t`
+        with an explicit Runge-Kutta scheme: `order` 2 (midpoint) or 4, anything
+        else is forward Euler. With `step_limit`, the step is split into sub-steps
+        that do not exceed the advective time-step limit (see `estimate_dt`).
+        """
 
         dt_limit = self.estimate_dt(V_fn)
 
@@ -1790,155 +2076,19 @@ class PICSwarm(Stateful, uw_object):
         if uw.mpi.rank == 0 and self.verbose:
             print(f"Substepping {substeps} / {abs(delta_t) / dt_limit}, {delta_t} ")
 
-        # X0 holds the particle location at the start of advection
-        # This is needed because the particles may be migrated off-proc
+        # The launch points of each sub-step are held in self._X0
+        # because the particles may be migrated off-proc
         # during timestepping.
 
-        X0 = self._X0
-
-        V_fn_matrix = self.mesh.vector.to_matrix(V_fn)
-
-        # Use current velocity to estimate where the particles would have
-        # landed in an implicit step. WE CANT DO THIS WITH SUB-STEPPING unless
-        # We have a lot more information about the previous launch point / timestep
-        # Also: how does this interact with the particle restoration function ?
-
-        # if corrector == True and not self._X0_uninitialised:
-        #     with self.access(self.particle_coordinates):
-        #         v_at_Vpts = np.zeros_like(self.data)
-
-        #         if evalf:
-        #             for d in range(self.dim):
-        #                 v_at_Vpts[:, d] = uw.function.evalf(
-        #                     V_fn_matrix[d], self.data
-        #                 ).reshape(-1)
-        #         else:
-        #             for d in range(self.dim):
-        #                 v_at_Vpts[:, d] = uw.function.evaluate(
-        #                     V_fn_matrix[d], self.data
-        #                 ).reshape(-1)
-
-        #         corrected_position = X0.data.copy() + delta_t * v_at_Vpts
-        #         if restore_points_to_domain_func is not None:
-        #             corrected_position = restore_points_to_domain_func(
-        #                 corrected_position
-        #             )
-
-        #         updated_current_coords = 0.5 * (corrected_position + self.data.copy())
-
-        #         # validate_coords to ensure they live within the domain (or there will be trouble)
-
-        #         if restore_points_to_domain_func is not None:
-        #             updated_current_coords = restore_points_to_domain_func(
-        #                 updated_current_coords
-        #             )
-
-        #         self.data[...] = updated_current_coords[...]
-
-        #         del updated_current_coords
-        #         del v_at_Vpts
-
-        print(f"{ uw.mpi.rank}: Peace", flush=True)
-
-        # Wrap this whole thing in sub-stepping loop
-        for step in range(0, substeps):
-
-            with self.access(X0):
-                X0.data[...] = self.particle_coordinates.data[...]
-
-            # Mid point algorithm (2nd order)
-
-            if order == 2:
-                with self.access(self.particle_coordinates):
-                    v_at_Vpts = np.zeros_like(self.particle_coordinates.data)
-
-                    # if evalf:
-                    #     for d in range(self.dim):
-                    #         v_at_Vpts[:, d] = uw.function.evalf(
-                    #             V_fn_matrix[d], self.particle_coordinates.data
-                    #         ).reshape(-1)
-                    # else:
-                    for d in range(self.dim):
-                        v_at_Vpts[:, d] = uw.function.evaluate(
-                            V_fn_matrix[d],
-                            self.particle_coordinates.data,
-                            evalf=evalf,
-                        ).reshape(-1)
-
-                    mid_pt_coords = (
-                        self.particle_coordinates.data[...]
-                        + 0.5 * delta_t * v_at_Vpts / substeps
-                    )
-
-                    # validate_coords to ensure they live within the domain (or there will be trouble)
-
-                    if restore_points_to_domain_func is not None:
-                        mid_pt_coords = restore_points_to_domain_func(mid_pt_coords)
-
-                    self.particle_coordinates.data[...] = mid_pt_coords[...]
-
-                    del mid_pt_coords
-
-                    ## Let the swarm be updated, and then move the rest of the way
-
-                    v_at_Vpts = np.zeros_like(self.data)
-
-                    # if evalf:
-                    #     for d in range(self.dim):
-                    #         v_at_Vpts[:, d] = uw.function.evalf(
-                    #             V_fn_matrix[d], self.particle_coordinates.data
-                    #         ).reshape(-1)
-                    # else:
-                    #
-                    for d in range(self.dim):
-                        v_at_Vpts[:, d] = uw.function.evaluate(
-                            V_fn_matrix[d],
-                            self.particle_coordinates.data,
-                            evalf=evalf,
-                        ).reshape(-1)
-
-                    # if (uw.mpi.rank == 0):
-                    #     print("Re-launch from X0", flush=True)
-
-                    new_coords = X0.data[...] + delta_t * v_at_Vpts / substeps
-
-                    # validate_coords to ensure they live within the domain (or there will be trouble)
-                    if restore_points_to_domain_func is not None:
-                        new_coords = restore_points_to_domain_func(new_coords)
-
-                    self.particle_coordinates.data[...] = new_coords[...]
-
-                    del new_coords
-                    del v_at_Vpts
-
-            # forward Euler (1st order)
-            else:
-                with self.access(self.particle_coordinates):
-                    v_at_Vpts = np.zeros_like(self.data)
-
-                    # if evalf:
-                    #     for d in range(self.dim):
-                    #         v_at_Vpts[:, d] = uw.function.evalf(
-                    #             V_fn_matrix[d], self.data
-                    #         ).reshape(-1)
-                    # else:
-                    for d in range(self.dim):
-                        v_at_Vpts[:, d] = uw.function.evaluate(
-                            V_fn_matrix[d],
-                            self.data,
-                            evalf=evalf,
-                        ).reshape(-1)
-
-                    new_coords = self.data + delta_t * v_at_Vpts / substeps
-
-                    # validate_coords to ensure they live within the domain (or there will be trouble)
-
-                    if restore_points_to_domain_func is not None:
-                        new_coords = restore_points_to_domain_func(new_coords)
-
-                    self.data[...] = new_coords[...].copy()
-
-        ## End of substepping loop
+        _advect_particle_coordinates(
+            self,
+            V_fn,
+            delta_t,
+            order=order,
+            substeps=substeps,
+            restore_points_to_domain_func=restore_points_to_domain_func,
+            evalf=evalf,
+        )
 
         ## Cycling of the swarm is a cheap and cheerful version of population control for particles. It turns the
         ## swarm into a streak-swarm where particles are Lagrangian for a number of steps and then reset to their
@@ -2018,38 +2168,42 @@ class PICSwarm(Stateful, uw_object):
     def estimate_dt(self, V_fn):
         """
         Calculates an appropriate advective timestep for the given
-        mesh and velocity configuration.
+        mesh and velocity configuration. Each particle is limited by the
+        size of the cell that it occupies (rather than the smallest cell in the
+        mesh) and the per-particle values are retained in `self.dt_adv_particles`
+        for diagnostics.
         """
-        # we'll want to do this on an element by element basis
-        # for more general mesh
 
-        # first let's extract a max global velocity magnitude
-        import math
+        import numpy as np
+        from mpi4py import MPI
 
         with self.access():
-            vel = uw.function.evaluate(V_fn, self.particle_coordinates.data, evalf=True)
-            try:
-                magvel_squared = vel[:, 0] ** 2 + vel[:, 1] ** 2
-                if self.mesh.dim == 3:
-                    magvel_squared += vel[:, 2] ** 2
-
-                max_magvel = math.sqrt(magvel_squared.max())
+            coords = self.particle_coordinates.data
+            self.dt_adv_particles = np.full(coords.shape[0], np.inf)
 
-            except (ValueError, IndexError):
-                max_magvel = 0.0
+            if coords.shape[0] > 0:
+                vel = uw.function.evaluate(V_fn, coords, evalf=True)
+                magvel = np.linalg.norm(vel.reshape(coords.shape[0], -1), axis=1)
 
-        from mpi4py import MPI
+                cells = self.mesh.get_closest_cells(coords)
+                moving = magvel > 0.0
+                self.dt_adv_particles[moving] = (
+                    self.mesh._radii[cells[moving]] / magvel[moving]
+                )
 
-        max_magvel_glob = comm.allreduce(max_magvel, op=MPI.MAX)
+        if self.dt_adv_particles.shape[0] > 0:
+            dt_local = self.dt_adv_particles.min()
+        else:
+            dt_local = np.inf
 
-        min_dx = self.mesh.get_min_radius()
+        dt_glob = comm.allreduce(dt_local, op=MPI.MIN)
 
         # The assumption should be that we cross one or two elements (2-4 radii), not more,
         # in a single step (order 2, means one element per half-step or something
         # that we can broadly interpret that way)
 
-        if max_magvel_glob != 0.0:
-            return min_dx / max_magvel_glob
+        if np.isfinite(dt_glob):
+            return dt_glob
         else:
             return None
 
@@ -2275,6 +2429,9 @@ class Swarm(Stateful, uw_object):
 
     instances = 0
 
+    # Fields that DMSwarm registers itself (not exposed as swarm variables)
+    _builtin_fields = ("DMSwarm_pid", "DMSwarm_rank")
+
     @timing.routine_timer_decorator
     def __init__(self, mesh, recycle_rate=0, verbose=False):
         Swarm.instances += 1
@@ -2335,8 +2492,24 @@ class Swarm(Stateful, uw_object):
                 rebuild_on_cycle=False,
             )
 
+        # The (local) cell that owns each particle. This moves with the particles
+        # and is updated incrementally (see `_get_owning_cells`)
+        self._cell_var = uw.swarm.SwarmVariable(
+            "DMSwarm_cell",
+            self,
+            1,
+            dtype=int,
+            _register=True,
+            _proxy=False,
+            rebuild_on_cycle=False,
+        )
+
+        self._owning_cells = None
+        self._owning_cells_state = None
+
         self._X0_uninitialised = True
         self._index = None
+        self._index_state = None
         self._nnmapdict = {}
 
         super().__init__()
@@ -2384,6 +2557,10 @@ class Swarm(Stateful, uw_object):
         coords[...] = newp_coords[...]
         self.dm.restoreField("DMSwarmPIC_coor")
 
+        cells = self.dm.getField("DMSwarm_cell")
+        cells[...] = newp_cells[...]
+        self.dm.restoreField("DMSwarm_cell")
+
         if self.recycle_rate > 1:
             with self.access():
                 # This is a mesh-local quantity, so let's just
@@ -2432,8 +2609,12 @@ class Swarm(Stateful, uw_object):
         """
         Migrate swarm across processes after coordinates have been updated.
 
-        The algorithm uses a global kD-tree for the centroids of the domains to decide the particle mpi.rank (send to the closest)
-        If the particles are mis-assigned to a particular mpi.rank, the next choice is the second-closest and so on.
+        Particles that are not in a local cell are sent to the rank given by the mesh's
+        coarse partition map (`mesh._partition_lookup`), which is built once per mesh and
+        needs no communication to query, so almost all particles move in a single
+        `migrate`. The few that land on the wrong process (close to a partition boundary)
+        are then sent to the closest, second-closest ... domain centroid until they are
+        claimed or the number of unclaimed points stops changing.
 
         A few particles are still not found after this distribution process which probably means they are just outside the mesh.
         If some points remain lost, they will be deleted if `delete_lost_points` is set.
@@ -2443,40 +2624,18 @@ class Swarm(Stateful, uw_object):
             which has this field pre-defined. (We'd need to add a cellid field as well, and re-compute it upon landing)
         """
 
-        from time import time
-
-        time_c = time()
-        centroids = self.mesh._get_domain_centroids()
-        mesh_domain_kdtree = uw.kdtree.KDTree(centroids)
-
-        time0 = time()
-        time1 = time()
-
         # This will only worry about particles that are not already claimed !
         #
 
-        swarm_coord_array = self.dm.getField("DMSwarmPIC_coor").reshape((-1, self.dim))
-        in_or_not = self.mesh.points_in_domain(swarm_coord_array)
-        self.dm.restoreField("DMSwarmPIC_coor")
-
-        num_points_in_domain = np.count_nonzero(in_or_not == True)
-        num_points_not_in_domain = np.count_nonzero(in_or_not == False)
+        # Particles that have a local owning cell stay here
+        in_or_not = self._get_owning_cells() != -1
         not_my_points = np.where(in_or_not == False)[0]
 
-        uw.mpi.barrier()
-
-        global_unclaimed_points = int(
-            uw.utilities.gather_data(
-                num_points_not_in_domain, bcast=True, dtype=int
-            ).sum()
-        )
-
-        global_claimed_points = int(
-            uw.utilities.gather_data(num_points_in_domain, bcast=True, dtype=int).sum()
+        global_unclaimed_points, global_claimed_points = uw.mpi.comm.allreduce(
+            np.array([not_my_points.shape[0], in_or_not.shape[0] - not_my_points.shape[0]]),
         )
 
         # Unlikely, but we should check this
-        uw.mpi.barrier()
         if global_unclaimed_points == 0:
             return
 
@@ -2485,59 +2644,73 @@ class Swarm(Stateful, uw_object):
         # and tidy up.
 
         if uw.mpi.size > 1:
+
+            # Collective, but only the first call for this mesh does any work
+            self.mesh._get_partition_map()
+            mesh_domain_kdtree = None
+
             for it in range(0, min(max_its, uw.mpi.size)):
 
-                # Send unclaimed points to next processor in line
+                # Send unclaimed points to the partition map's choice of
+                # process first, then to the next-closest processors in line
 
                 swarm_rank_array = self.dm.getField("DMSwarm_rank")
+                swarm_cell_array = self.dm.getField("DMSwarm_cell")
                 swarm_coord_array = self.dm.getField("DMSwarmPIC_coor").reshape(
                     (-1, self.dim)
                 )
 
-                if len(swarm_coord_array > 0):
-                    dist, rank = mesh_domain_kdtree.query(
-                        swarm_coord_array[not_my_points],
-                        k=it + 1,
-                    )
+                if not_my_points.shape[0] > 0:
+                    if it == 0:
+                        rank = self.mesh._partition_lookup(
+                            swarm_coord_array[not_my_points]
+                        )
+                    else:
+                        if mesh_domain_kdtree is None:
+                            mesh_domain_kdtree = self.mesh._get_partition_map()[-1]
+
+                        # the it-th closest domain that is not this one
+                        dist, closest = mesh_domain_kdtree.query(
+                            swarm_coord_array[not_my_points],
+                            k=it + 1,
+                        )
+                        closest = closest.reshape(-1, it + 1)
+                        others = closest != uw.mpi.rank
+                        choice = np.argmax(
+                            np.logical_and(others, np.cumsum(others, axis=1) == it),
+                            axis=1,
+                        )
+                        rank = closest[np.arange(closest.shape[0]), choice]
 
-                    swarm_rank_array[not_my_points, 0] = rank.reshape(-1, it + 1)[:, it]
+                    swarm_rank_array[not_my_points, 0] = rank
+
+                    # cell numbers are not meaningful on the receiving process
+                    swarm_cell_array[not_my_points] = -1
 
                 self.dm.restoreField("DMSwarmPIC_coor")
+                self.dm.restoreField("DMSwarm_cell")
                 self.dm.restoreField("DMSwarm_rank")
 
                 # Now we send the points (basic migration)
                 self.dm.migrate(remove_sent_points=True)
-                uw.mpi.barrier()
-
-                swarm_coord_array = self.dm.getField("DMSwarmPIC_coor").reshape(
-                    (-1, self.dim)
-                )
+                self._owning_cells = None
 
-                in_or_not = self.mesh.points_in_domain(swarm_coord_array)
-                self.dm.restoreField("DMSwarmPIC_coor")
-
-                num_points_in_domain = np.count_nonzero(in_or_not == True)
-                num_points_not_in_domain = np.count_nonzero(in_or_not == False)
+                in_or_not = self._get_owning_cells() != -1
                 not_my_points = np.where(in_or_not == False)[0]
 
                 unclaimed_points_last_iteration = global_unclaimed_points
                 claimed_points_last_iteration = global_claimed_points
 
-                global_unclaimed_points = int(
-                    uw.utilities.gather_data(
-                        num_points_not_in_domain,
-                        bcast=True,
-                        dtype=int,
-                    ).sum()
+                global_unclaimed_points, global_claimed_points = uw.mpi.comm.allreduce(
+                    np.array(
+                        [
+                            not_my_points.shape[0],
+                            in_or_not.shape[0] - not_my_points.shape[0],
+                        ]
+                    ),
                 )
 
-                global_claimed_points = int(
-                    uw.utilities.gather_data(
-                        num_points_in_domain, bcast=True, dtype=int
-                    ).sum()
-                )
-
-                if (
+                if global_unclaimed_points == 0 or (
                     global_unclaimed_points == unclaimed_points_last_iteration
                     and global_claimed_points == claimed_points_last_iteration
                 ):
@@ -2551,11 +2724,10 @@ class Swarm(Stateful, uw_object):
             #     flush=True,
             # )
 
-            uw.mpi.barrier()
-            if len(not_my_points > 0):
-                indices = np.sort(not_my_points)[::-1]
-                for index in indices:
-                    self.dm.removePointAtIndex(index)
+            if not_my_points.shape[0] > 0:
+                lost = np.zeros(self.dm.getLocalSize(), dtype=bool)
+                lost[not_my_points] = True
+                self._remove_particles(lost)
 
             # print(
             #     f"{uw.mpi.rank} - final swarm size {self.dm.getLocalSize()}",
@@ -2564,6 +2736,98 @@ class Swarm(Stateful, uw_object):
 
         return
 
+    @timing.routine_timer_decorator
+    def remove_particles(self, mask) -> int:
+        """
+        Remove the local particles flagged in `mask` (a boolean array with one entry per
+        local particle) from the swarm, along with the values of all swarm variables
+        that they carry. The proxy mesh variables are updated to reflect the new particle
+        distribution.
+
+        This is a local operation (particles on other processes are not affected) and
+        must be called outside of an `access` block.
+
+        Returns:
+        --------
+        The number of particles removed from this process.
+        """
+
+        n_removed = self._remove_particles(mask)
+
+        if n_removed > 0:
+            self._index = None
+            self._nnmapdict = {}
+
+            for var in self._vars.values():
+                var._update()
+
+        return n_removed
+
+    def _remove_particles(self, mask):
+        """
+        Compact the swarm in one pass: the surviving particles that lie beyond the
+        new end of the swarm are copied into the slots of the removed ones (for every
+        field, including the DMSwarm built-in ones such as `DMSwarm_pid`) and the swarm
+        is then truncated. As with `DMSwarm.removePointAtIndex`, the order of the
+        particles is not preserved.
+        """
+
+        n_local = self.dm.getLocalSize()
+
+        mask = np.asarray(mask, dtype=bool).reshape(-1)
+        if mask.shape[0] != n_local:
+            raise RuntimeError(
+                f"Particle mask has {mask.shape[0]} entries, but there are {n_local} local particles"
+            )
+
+        n_removed = int(np.count_nonzero(mask))
+        if n_removed == 0:
+            return 0
+
+        n_keep = n_local - n_removed
+
+        # Removed particles below the new size are holes, kept particles
+        # above it fill them
+        holes = np.where(mask[0:n_keep])[0]
+        movers = n_keep + np.where(~mask[n_keep:])[0]
+
+        if self._owning_cells is not None and self._owning_cells_state == (
+            self._get_state(),
+            n_local,
+        ):
+            owning_cells = self._owning_cells.copy()
+            owning_cells[holes] = owning_cells[movers]
+            owning_cells = owning_cells[0:n_keep]
+        else:
+            owning_cells = None
+
+        if holes.shape[0] > 0:
+            from underworld3.cython.petsc_discretisation import (
+                petsc_dm_swarm_copy_points,
+            )
+
+            # Every field in the DMSwarm has to move, including the built-in ones
+            # (variables that are not registered with the DMSwarm have no field)
+            fields = [var.clean_name for var in self._vars.values() if var._register]
+            for field in self._builtin_fields:
+                if field not in fields:
+                    fields.append(field)
+
+            petsc_dm_swarm_copy_points(self.dm, fields, movers, holes)
+
+        self.dm.setLocalSizes(n_keep, 0)
+
+        self._increment()
+
+        # The owning cells move with the particles, so the cache is still valid
+        if owning_cells is not None:
+            self._owning_cells = owning_cells
+            self._owning_cells_state = (self._get_state(), n_keep)
+        else:
+            self._owning_cells = None
+
+        return n_removed
+
     @timing.routine_timer_decorator
     def add_particles_with_coordinates(self, coordinatesArray) -> int:
         """
@@ -3014,7 +3278,7 @@ class Swarm(Stateful, uw_object):
     def vars(self):
         return self._vars
 
-    def access(self, *writeable_vars: SwarmVariable):
+    def access(self, *writeable_vars: SwarmVariable, read=None, write=None):
         """
         This context manager makes the underlying swarm variables data available to
         the user. The data should be accessed via the variables `data` handle.
@@ -3031,6 +3295,10 @@ class Swarm(Stateful, uw_object):
         ----------
         writeable_vars
             The variables for which data write access is required.
+        read, write
+            Lists of variables for read-only / write access. If either is given, only
+            these variables (and `writeable_vars`) are retrieved from the swarm,
+            otherwise every swarm variable is available (read-only unless writeable).
 
         Example
         -------
@@ -3047,8 +3315,22 @@ class Swarm(Stateful, uw_object):
         uw.timing._incrementDepth()
         stime = time.time()
 
+        writeable_vars = tuple(writeable_vars) + tuple(write or ())
+
+        if read is None and write is None:
+            requested_vars = list(self._vars.values())
+        else:
+            requested_vars = []
+            for var in tuple(read or ()) + writeable_vars:
+                if var.swarm is not self:
+                    raise RuntimeError(
+                        f"Variable {var.clean_name} is not defined on this swarm."
+                    )
+                if var not in requested_vars:
+                    requested_vars.append(var)
+
         deaccess_list = []
-        for var in self._vars.values():
+        for var in requested_vars:
             # if already accessed within higher level context manager, continue.
             if var._is_accessed == True:
                 continue
@@ -3092,10 +3374,8 @@ class Swarm(Stateful, uw_object):
 
             def __exit__(self, *args):
 
-                for var in self.em_swarm.vars.values():
-                    # only de-access variables we have set access for.
-                    if var not in deaccess_list:
-                        continue
+                # only de-access variables we have set access for.
+                for var in deaccess_list:
                     # set this back, although possibly not required.
                     if var not in writeable_vars:
                         var._data.flags.writeable = var._old_data_flag
@@ -3183,28 +3463,65 @@ class Swarm(Stateful, uw_object):
         if self.vtype == uw.VarType.MATRIX:
             return i + j * self.shape[0]
 
+    @timing.routine_timer_decorator
+    def _get_owning_cells(self):
+        """
+        The local cell that contains each particle (-1 if the particle is not in
+        the local domain). Cells are tracked in the `DMSwarm_cell` field: after the
+        particles move, each one is located by walking the mesh from its previous
+        cell, which is usually the right cell or a neighbour. Only particles that
+        are new, came from another process or leave the walk are located by
+        searching the mesh.
+
+        This is cached until the particles are moved, added or removed.
+        Must be called outside of an `access` block.
+        """
+
+        state = (self._get_state(), self.dm.getLocalSize())
+        if self._owning_cells is not None and self._owning_cells_state == state:
+            return self._owning_cells
+
+        cStart, cEnd = self.mesh.dm.getHeightStratum(0)
+
+        coords = self.dm.getField("DMSwarmPIC_coor").reshape((-1, self.dim))
+        cell_field = self.dm.getField("DMSwarm_cell").reshape(-1)
+
+        cells = np.array(cell_field, dtype=np.int64)
+
+        # Values not in the local range were never set (or are stale)
+        known = np.where((cells >= cStart) & (cells < cEnd))[0]
+        unknown = np.where((cells < cStart) | (cells >= cEnd))[0]
+
+        if known.shape[0] > 0:
+            cells[known] = self.mesh._locate_points_by_walking(
+                coords[known], cells[known], max_steps=4
+            )
+            unknown = np.union1d(unknown, known[cells[known] == -1])
+
+        if unknown.shape[0] > 0:
+            cells[unknown] = self.mesh.get_closest_local_cells(coords[unknown])
+
+        cell_field[...] = cells
+
+        self.dm.restoreField("DMSwarm_cell")
+        self.dm.restoreField("DMSwarmPIC_coor")
+
+        self._owning_cells = cells
+        self._owning_cells_state = state
+
+        return cells
+
     ## Check this - the interface to kdtree has changed, are we picking the correct field ?
     @timing.routine_timer_decorator
     def _get_map(self, var):
-        # generate tree if not avaiable
-        if not self._index:
-            with self.access():
-                self._index = uw.kdtree.KDTree(self.data)
-
-        # get or generate map
-        meshvar_coords = var._meshVar.coords
-        # we can't use numpy arrays directly as keys in python dicts, so
-        # we'll use `xxhash` to generate a hash of array.
-        # this shouldn't be an issue performance wise but we should test to be
-        # sufficiently confident of this.
-        import xxhash
-
-        h = xxhash.xxh64()
-        h.update(meshvar_coords)
-        digest = h.intdigest()
-        if digest not in self._nnmapdict:
-            self._nnmapdict[digest] = self._index.query(meshvar_coords, k=1)[1]
-        return self._nnmapdict[digest]
+        """
+        The nearest particle to each node of the proxy variable of `var`. This
+        uses the shared particle kd-tree and is cached for the current swarm state.
+        """
+
+        distance_n, closest_n = _particle_neighbours(self, var._meshVar.coords, 1)
+
+        return closest_n[:, 0]
 
     @timing.routine_timer_decorator
     def advection(
@@ -3217,6 +3534,12 @@ class Swarm(Stateful, uw_object):
         evalf=False,
         step_limit=False,
     ):
+        """
+        Advect the particles through the velocity field `V_fn` over `delta_t`
+        with an explicit Runge-Kutta scheme: `order` 2 (midpoint) or 4, anything
+        else is forward Euler. With `step_limit`, the step is split into sub-steps
+        that do not exceed the advective time-step limit (see `estimate_dt`).
+        """
 
         dt_limit = self.estimate_dt(V_fn)
 
@@ -3228,159 +3551,19 @@ class Swarm(Stateful, uw_object):
         if uw.mpi.rank == 0 and self.verbose:
             print(f"Substepping {substeps} / {abs(delta_t) / dt_limit}, {delta_t} ")
 
-        # X0 holds the particle location at the start of advection
-        # This is needed because the particles may be migrated off-proc
+        # The launch points of each sub-step are held in self._X0
+        # because the particles may be migrated off-proc
         # during timestepping.
 
-        X0 = self._X0
-
-        V_fn_matrix = self.mesh.vector.to_matrix(V_fn)
-
-        # Use current velocity to estimate where the particles would have
-        # landed in an implicit step. WE CANT DO THIS WITH SUB-STEPPING unless
-        # We have a lot more information about the previous launch point / timestep
-        # Also: how does this interact with the particle restoration function ?
-
-        # if corrector == True and not self._X0_uninitialised:
-        #     with self.access(self.particle_coordinates):
-        #         v_at_Vpts = np.zeros_like(self.data)
-
-        #         if evalf:
-        #             for d in range(self.dim):
-        #                 v_at_Vpts[:, d] = uw.function.evalf(
-        #                     V_fn_matrix[d], self.data
-        #                 ).reshape(-1)
-        #         else:
-        #             for d in range(self.dim):
-        #                 v_at_Vpts[:, d] = uw.function.evaluate(
-        #                     V_fn_matrix[d], self.data
-        #                 ).reshape(-1)
-
-        #         corrected_position = X0.data.copy() + delta_t * v_at_Vpts
-        #         if restore_points_to_domain_func is not None:
-        #             corrected_position = restore_points_to_domain_func(
-        #                 corrected_position
-        #             )
-
-        #         updated_current_coords = 0.5 * (corrected_position + self.data.copy())
-
-        #         # validate_coords to ensure they live within the domain (or there will be trouble)
-
-        #         if restore_points_to_domain_func is not None:
-        #             updated_current_coords = restore_points_to_domain_func(
-        #                 updated_current_coords
-        #             )
-
-        #         self.data[...] = updated_current_coords[...]
-
-        #         del updated_current_coords
-        #         del v_at_Vpts
-
-        # Wrap this whole thing in sub-stepping loop
-        for step in range(0, substeps):
-
-            with self.access(X0):
-                X0.data[...] = self.particle_coordinates.data[...]
-
-            # Mid point algorithm (2nd order)
-
-            if order == 2:
-                with self.access(self.particle_coordinates):
-                    v_at_Vpts = np.zeros_like(self.particle_coordinates.data)
-
-                    ##
-                    ## Here we should check for particles which are interpolated and
-                    ## those which can only be extrapolated. For the former, evalf is
-                    ## not needed but for the latter it is essential
-                    ##
-
-                    # if evalf:
-                    #     for d in range(self.dim):
-                    #         v_at_Vpts[:, d] = uw.function.evalf(
-                    #             V_fn_matrix[d], self.particle_coordinates.data
-                    #         ).reshape(-1)
-                    # else:
-                    for d in range(self.dim):
-                        v_at_Vpts[:, d] = uw.function.evaluate(
-                            V_fn_matrix[d],
-                            self.particle_coordinates.data,
-                            evalf=evalf,
-                        ).reshape(-1)
-
-                    mid_pt_coords = (
-                        self.particle_coordinates.data[...]
-                        + 0.5 * delta_t * v_at_Vpts / substeps
-                    )
-
-                    # validate_coords to ensure they live within the domain (or there will be trouble)
-
-                    if restore_points_to_domain_func is not None:
-                        mid_pt_coords = restore_points_to_domain_func(mid_pt_coords)
-
-                    self.particle_coordinates.data[...] = mid_pt_coords[...]
-
-                    del mid_pt_coords
-
-                    ## Let the swarm be updated, and then move the rest of the way
-
-                    v_at_Vpts = np.zeros_like(self.data)
-
-                    # if evalf:
-                    #     for d in range(self.dim):
-                    #         v_at_Vpts[:, d] = uw.function.evalf(
-                    #             V_fn_matrix[d], self.particle_coordinates.data
-                    #         ).reshape(-1)
-                    # else:
-                    for d in range(self.dim):
-                        v_at_Vpts[:, d] = uw.function.evaluate(
-                            V_fn_matrix[d],
-                            self.particle_coordinates.data,
-                            evalf=evalf,
-                        ).reshape(-1)
-
-                    # if (uw.mpi.rank == 0):
-                    #     print("Re-launch from X0", flush=True)
-
-                    new_coords = X0.data[...] + delta_t * v_at_Vpts / substeps
-
-                    # validate_coords to ensure they live within the domain (or there will be trouble)
-                    if restore_points_to_domain_func is not None:
-                        new_coords = restore_points_to_domain_func(new_coords)
-
-                    self.particle_coordinates.data[...] = new_coords[...]
-
-                    del new_coords
-                    del v_at_Vpts
-
-            # forward Euler (1st order)
-            else:
-
-                with self.access(self.particle_coordinates):
-                    v_at_Vpts = np.zeros_like(self.data)
-
-                    # if evalf:
-                    #     for d in range(self.dim):
-                    #         v_at_Vpts[:, d] = uw.function.evalf(
-                    #             V_fn_matrix[d], self.data
-                    #         ).reshape(-1)
-                    # else:
-                    for d in range(self.dim):
-                        v_at_Vpts[:, d] = uw.function.evaluate(
-                            V_fn_matrix[d],
-                            self.data,
-                            evalf=evalf,
-                        ).reshape(-1)
-
-                    new_coords = self.data + delta_t * v_at_Vpts / substeps
-
-                    # validate_coords to ensure they live within the domain (or there will be trouble)
-
-                    if restore_points_to_domain_func is not None:
-                        new_coords = restore_points_to_domain_func(new_coords)
-
-                    self.data[...] = new_coords[...].copy()
-
-        ## End of substepping loop
+        _advect_particle_coordinates(
+            self,
+            V_fn,
+            delta_t,
+            order=order,
+            substeps=substeps,
+            restore_points_to_domain_func=restore_points_to_domain_func,
+            evalf=evalf,
+        )
 
         ## Cycling of the swarm is a cheap and cheerful version of population control for particles. It turns the
         ## swarm into a streak-swarm where particles are Lagrangian for a number of steps and then reset to their
@@ -3470,38 +3653,46 @@ class Swarm(Stateful, uw_object):
     def estimate_dt(self, V_fn):
         """
         Calculates an appropriate advective timestep for the given
-        mesh and velocity configuration.
+        mesh and velocity configuration. Each particle is limited by the
+        size of the cell that it occupies (rather than the smallest cell in the
+        mesh) and the per-particle values are retained in `self.dt_adv_particles`
+        for diagnostics.
         """
-        # we'll want to do this on an element by element basis
-        # for more general mesh
 
-        # first let's extract a max global velocity magnitude
-        import math
-
-        with self.access():
-            vel = uw.function.evaluate(V_fn, self.particle_coordinates.data, evalf=True)
-            try:
-                magvel_squared = vel[:, 0] ** 2 + vel[:, 1] ** 2
-                if self.mesh.dim == 3:
-                    magvel_squared += vel[:, 2] ** 2
-
-                max_magvel = math.sqrt(magvel_squared.max())
+        import numpy as np
+        from mpi4py import MPI
 
-            except (ValueError, IndexError):
-                max_magvel = 0.0
+        owning_cells = self._get_owning_cells()
 
-        from mpi4py import MPI
+        with self.access():
+            coords = self.particle_coordinates.data
+            self.dt_adv_particles = np.full(coords.shape[0], np.inf)
+
+            if coords.shape[0] > 0:
+                vel = uw.function.evaluate(V_fn, coords, evalf=True)
+                magvel = np.linalg.norm(vel.reshape(coords.shape[0], -1), axis=1)
+
+                cells = owning_cells.copy()
+                lost = cells == -1
+                cells[lost] = self.mesh.get_closest_cells(coords[lost])
+                moving = magvel > 0.0
+                self.dt_adv_particles[moving] = (
+                    self.mesh._radii[cells[moving]] / magvel[moving]
+                )
 
-        max_magvel_glob = comm.allreduce(max_magvel, op=MPI.MAX)
+        if self.dt_adv_particles.shape[0] > 0:
+            dt_local = self.dt_adv_particles.min()
+        else:
+            dt_local = np.inf
 
-        min_dx = self.mesh.get_min_radius()
+        dt_glob = comm.allreduce(dt_local, op=MPI.MIN)
 
         # The assumption should be that we cross one or two elements (2-4 radii), not more,
         # in a single step (order 2, means one element per half-step or something
         # that we can broadly interpret that way)
 
-        if max_magvel_glob != 0.0:
-            return min_dx / max_magvel_glob
+        if np.isfinite(dt_glob):
+            return dt_glob
         else:
             return None
 
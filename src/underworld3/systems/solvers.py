@@ -1238,8 +1238,10 @@ class SNES_AdvectionDiffusion(SNES_Scalar):
 
         self._constitutive_model = None
 
-        # These are unique to the advection solver
+        # These are unique to the advection solver. The timestep is passed to the
+        # compiled functions as a PetscDS constant so it can change without a rebuild
         self._delta_t = expression(R"\Delta t", 0, "Physically motivated timestep")
+        self._constants.append(self._delta_t)
         self.is_setup = False
 
         self.restore_points_to_domain_func = restore_points_func
@@ -1355,7 +1357,7 @@ class SNES_AdvectionDiffusion(SNES_Scalar):
 
     @delta_t.setter
     def delta_t(self, value):
-        self.is_setup = False
+        # No rebuild required: delta_t is a PetscDS constant (see solve)
         self._delta_t.sym = value
 
     @timing.routine_timer_decorator
@@ -1368,71 +1370,45 @@ class SNES_AdvectionDiffusion(SNES_Scalar):
             - ${\delta t}_\textrm{diff}: a typical time for the diffusion front to propagate across an element
             - ${\delta t}_\textrm{adv}: a typical element-crossing time for a fluid parcel
 
-            returns (${\delta t}_\textrm{diff}, ${\delta t}_\textrm{adv})
+        The estimate is made element by element (see `mesh.estimate_dt_per_cell`)
+        and the per-cell values are retained as `self.dt_adv_cells` and
+        `self.dt_diff_cells`. Returns the global minimum of both limits.
         """
 
-        if isinstance(self.constitutive_model.Parameters.diffusivity, sympy.Expr):
-            if uw.function.fn_is_constant_expr(
-                self.constitutive_model.Parameters.diffusivity
-            ):
-                max_diffusivity = uw.function.evaluate(
-                    self.constitutive_model.Parameters.diffusivity,
-                    np.zeros((1, self.mesh.dim)),
-                )
-
-            else:
-                k = uw.function.evaluate(
-                    sympy.sympify(self.constitutive_model.Parameters.diffusivity),
-                    self.mesh._centroids,
-                    self.mesh.N,
-                )
-
-                max_diffusivity = k.max()
-        else:
-            k = self.constitutive_model.Parameters.diffusivity
-            max_diffusivity = k
-
         ### required modules
         from mpi4py import MPI
 
-        ## get global max dif value
         comm = uw.mpi.comm
-        diffusivity_glob = comm.allreduce(max_diffusivity, op=MPI.MAX)
 
-        ### get the velocity values
-        vel = uw.function.evaluate(
-            self.V_fn,
-            self.mesh._centroids,
-            self.mesh.N,
+        ## Element-by-element estimates (each cell uses its own size, velocity
+        ## and diffusivity). These are kept on the solver for diagnostics.
+
+        dt_adv_cells, dt_diff_cells = self.mesh.estimate_dt_per_cell(
+            V_fn=self.V_fn,
+            diffusivity=self.constitutive_model.Parameters.diffusivity,
         )
 
-        ### get global velocity from velocity field
-        max_magvel = np.linalg.norm(vel, axis=1).max()
-        max_magvel_glob = comm.allreduce(max_magvel, op=MPI.MAX)
+        self.dt_adv_cells = dt_adv_cells
+        self.dt_diff_cells = dt_diff_cells
 
-        ## get radius
-        min_dx = self.mesh.get_min_radius()
+        dt_adv_local = dt_adv_cells.min() if dt_adv_cells.shape[0] > 0 else np.inf
+        dt_diff_local = dt_diff_cells.min() if dt_diff_cells.shape[0] > 0 else np.inf
+
+        dt_adv_glob = comm.allreduce(dt_adv_local, op=MPI.MIN)
+        dt_diff_glob = comm.allreduce(dt_diff_local, op=MPI.MIN)
 
         ## estimate dt of adv and diff components
 
         self.dt_adv = 0.0
         self.dt_diff = 0.0
 
-        if max_magvel_glob == 0.0:
-            dt_diff = (min_dx**2) / diffusivity_glob
-            self.dt_diff = dt_diff
-            dt_estimate = dt_diff
-        elif diffusivity_glob == 0.0:
-            dt_adv = min_dx / max_magvel_glob
-            self.dt_adv = dt_adv
-            dt_estimate = dt_adv
-        else:
-            dt_diff = (min_dx**2) / diffusivity_glob
-            self.dt_diff = dt_diff
-            dt_adv = min_dx / max_magvel_glob
-            self.dt_adv = dt_adv
+        if np.isfinite(dt_adv_glob):
+            self.dt_adv = dt_adv_glob
 
-            dt_estimate = min(dt_diff, dt_adv)
+        if np.isfinite(dt_diff_glob):
+            self.dt_diff = dt_diff_glob
+
+        dt_estimate = min(dt_diff_glob, dt_adv_glob)
 
         return dt_estimate
 
@@ -1455,8 +1431,8 @@ class SNES_AdvectionDiffusion(SNES_Scalar):
             system solution. Otherwise, the current values of `self.u` will be used.
         """
 
-        if timestep is not None and timestep != self.delta_t:
-            self.delta_t = timestep  # this will force an initialisation because the functions need to be updated
+        if timestep is not None and timestep != self.delta_t.sym:
+            self.delta_t = timestep  # updates the PetscDS constant, no re-compilation
 
         if _force_setup:
             self.is_setup = False
@@ -1486,6 +1462,377 @@ class SNES_AdvectionDiffusion(SNES_Scalar):
 
         return
 
+    def _build_explicit_operator(self):
+        """
+        The spatial operator for explicit time integration is a Poisson-type system that
+        shares the unknown, diffusivity and boundary conditions of this solver:
+
+            f_0 = -f + (v . grad u),   F_1 = kappa grad u
+        """
+
+        operator = SNES_Poisson(self.mesh, u_Field=self.u, verbose=self.verbose)
+
+        # The model is shared: the setter re-targets it at the operator and resets
+        # its setup flag and order, so put this solver's state back afterwards.
+        model = self.constitutive_model
+        model_is_setup = model._solver_is_setup
+        model_order = model.order
+
+        operator.constitutive_model = model
+
+        model.Unknowns = self.Unknowns
+        model.order = model_order
+        model._solver_is_setup = model_is_setup
+
+        operator.petsc_options["snes_type"] = "ksponly"
+
+        operator.essential_bcs.extend(self.essential_bcs)
+        operator.natural_bcs.extend(self.natural_bcs)
+
+        grad_u = self.u.sym.jacobian(self.mesh.CoordinateSystem.N)
+        V = sympy.Matrix(self.V_fn).reshape(1, self.mesh.dim)
+        operator.f = self.f[0] - (V * grad_u.T)[0, 0]
+
+        self._explicit_operator = operator
+        self._explicit_operator_f = self.f
+        self._explicit_operator_fns = None
+
+        return operator
+
+    def _explicit_operator_pointwise_fns(self):
+        """
+        The pointwise functions of the explicit operator with every expression
+        (including the constitutive parameters) replaced by its current value. The
+        operator is compiled with these values, so it has to be rebuilt if they change.
+        """
+
+        operator = self._explicit_operator
+        unwrap = uw.function.expressions.unwrap
+
+        return (
+            unwrap(operator.F0.sym, keep_constants=False, return_self=False),
+            unwrap(operator.F1.sym, keep_constants=False, return_self=False),
+        )
+
+    @timing.routine_timer_decorator
+    def solve_explicit(
+        self,
+        timestep: float = None,
+        cfl: float = 0.5,
+        order: int = 3,
+        verbose=False,
+    ):
+        r"""
+        Advance the solution by `timestep` with an explicit, strong-stability-preserving
+        Runge-Kutta scheme (SSP-RK, `order` = 1, 2 or 3) applied to the semi-discrete system
+
+        $$
+            \mathbf{M}_L \frac{d\mathbf{u}}{dt} = -\mathbf{R}(\mathbf{u})
+        $$
+
+        where $\mathbf{R}$ is the residual of the (Eulerian) advection-diffusion operator
+        evaluated by the compiled pointwise functions and $\mathbf{M}_L$ is the lumped mass matrix.
+        No linear / non-linear solve is required. The step is sub-divided if it exceeds the
+        explicit stability limit `cfl` $\times$ `estimate_dt()` (scaled by the element degree).
+
+        This is suitable for advection-dominated problems where the timestep is already limited
+        by accuracy. The semi-Lagrangian history terms are not updated by explicit steps.
+
+        Returns the number of sub-steps taken.
+        """
+
+        if order not in (1, 2, 3):
+            raise RuntimeError(f"SSP-RK order must be 1, 2 or 3 (not {order})")
+
+        operator = getattr(self, "_explicit_operator", None)
+        if operator is None:
+            operator = self._build_explicit_operator()
+
+        if self._explicit_operator_f is not self.f:
+            grad_u = self.u.sym.jacobian(self.mesh.CoordinateSystem.N)
+            V = sympy.Matrix(self.V_fn).reshape(1, self.mesh.dim)
+            operator.f = self.f[0] - (V * grad_u.T)[0, 0]
+            self._explicit_operator_f = self.f
+
+        ## Stability limit for the explicit scheme (higher order elements
+        ## have a proportionally smaller effective element size)
+
+        self.estimate_dt()
+        degree = max(1, self.u.degree)
+
+        dt_limits = []
+        if self.dt_adv > 0.0:
+            dt_limits.append(self.dt_adv / degree)
+        if self.dt_diff > 0.0:
+            dt_limits.append(0.5 * self.dt_diff / degree**2)
+
+        dt_stable = cfl * min(dt_limits) if len(dt_limits) > 0 else None
+
+        if timestep is None:
+            if dt_stable is None:
+                raise RuntimeError(
+                    f"{self.name}: no velocity or diffusivity, a timestep must be provided"
+                )
+            timestep = dt_stable
+
+        if dt_stable is not None and timestep > dt_stable:
+            n_substeps = int(np.ceil(timestep / dt_stable))
+        else:
+            n_substeps = 1
+
+        dt = timestep / n_substeps
+
+        if verbose and uw.mpi.rank == 0:
+            print(
+                f"{self.name}: explicit SSP-RK{order}, {n_substeps} x dt = {dt:.3e}",
+                flush=True,
+            )
+
+        # The shared model's setup flag is also reset by the implicit solve, so the
+        # operator keeps its own record of what it was compiled with
+        fns = self._explicit_operator_pointwise_fns()
+        if self._explicit_operator_fns is None or fns != self._explicit_operator_fns:
+            operator.is_setup = False
+
+        operator._build(verbose)
+        operator._set_petsc_constants()
+
+        self._explicit_operator_fns = fns
+
+        inv_mass = operator._lumped_mass().copy()
+        inv_mass.reciprocal()
+
+        u0 = operator.dm.getGlobalVec()
+        u1 = u0.duplicate()
+        rhs = u0.duplicate()
+
+        operator._u_to_global(u0)
+
+        def euler_stage(u_in, u_out):
+            # u_out = u_in - dt M_L^{-1} R(u_in)
+            operator._evaluate_residual(u_in, rhs)
+            rhs.pointwiseMult(rhs, inv_mass)
+            u_in.copy(u_out)
+            u_out.axpy(-dt, rhs)
+
+        for step in range(n_substeps):
+            if order == 1:
+                euler_stage(u0, u0)
+
+            elif order == 2:
+                euler_stage(u0, u1)
+                euler_stage(u1, u1)
+                u1.axpby(0.5, 0.5, u0)  # u1 = 0.5 u0 + 0.5 u1
+                u1.copy(u0)
+
+            else:
+                euler_stage(u0, u1)
+                euler_stage(u1, u1)
+                u1.axpby(0.75, 0.25, u0)  # u1 = 0.75 u0 + 0.25 u1
+                euler_stage(u1, u1)
+                u1.axpby(1.0 / 3.0, 2.0 / 3.0, u0)  # u1 = 1/3 u0 + 2/3 u1
+                u1.copy(u0)
+
+        operator._u_from_global(u0)
+
+        u1.destroy()
+        rhs.destroy()
+        inv_mass.destroy()
+        operator.dm.restoreGlobalVec(u0)
+
+        return n_substeps
+
+    def _adaptive_history_variables(self):
+        """The mesh variables that are modified by a timestep (and need to be restored if it is rejected)"""
+
+        history_vars = [self.u]
+
+        for ddt in (self.DuDt, self.DFDt):
+            for psi_star in ddt.psi_star:
+                if not isinstance(psi_star, uw.discretisation._MeshVariable):
+                    raise RuntimeError(
+                        "Adaptive timestepping requires mesh-based history terms (SemiLagrangian DuDt / DFDt)"
+                    )
+                history_vars.append(psi_star)
+
+        return history_vars
+
+    @timing.routine_timer_decorator
+    def solve_adaptive(
+        self,
+        max_timestep: float = None,
+        rtol: float = 1.0e-3,
+        atol: float = 1.0e-6,
+        cfl: float = 1.0,
+        dt_min: float = None,
+        safety: float = 0.9,
+        max_growth: float = 2.0,
+        min_shrink: float = 0.2,
+        max_rejections: int = 10,
+        zero_init_guess: bool = True,
+        _evalf=False,
+        verbose=False,
+    ):
+        r"""
+        Take one error-controlled timestep and return the size of the step that was accepted.
+
+        The local truncation error is estimated by comparing the solution to a lower order
+        (linear extrapolation) predictor built from the two previous accepted steps
+
+        $$
+            u_p = u^n + \frac{\delta t}{\delta t_\textrm{prev}} \left( u^n - u^{n-1} \right),
+            \quad
+            E = \left\| \frac{u^{n+1} - u_p}{\textrm{atol} + \textrm{rtol} \, |u^{n+1}|} \right\|_\textrm{rms}
+        $$
+
+        Steps with $E > 1$ are rejected, the solution / history terms are restored and the
+        step is repeated with a smaller $\delta t$. The next step size is chosen from
+        $\delta t \, \textrm{safety} \, E^{-1/2}$ and is limited by `cfl` times the
+        `estimate_dt()` value. The timestep is a PetscDS constant, so changing it between
+        steps and retries does not re-compile the pointwise functions.
+
+        The suggested size of the next step is available as `self.dt_next`, and
+        the counts of accepted / rejected steps as `self.adaptive_steps_accepted`
+        and `self.adaptive_steps_rejected`.
+
+        Params
+        ------
+        max_timestep:
+            Upper bound on this step (e.g. to land exactly on an output time).
+        rtol, atol:
+            Relative and absolute tolerance for the local error.
+        cfl:
+            Multiple of `estimate_dt()` that limits the timestep.
+        dt_min:
+            Steps are not reduced below this value (the step is then accepted, which is
+            reported if `verbose`).
+
+        Only first order history terms (`order=1`) are supported: the higher order BDF /
+        Adams-Moulton coefficients assume a constant timestep.
+        """
+
+        from mpi4py import MPI
+
+        comm = uw.mpi.comm
+
+        if self.DuDt.order > 1 or self.DFDt.order > 1:
+            raise RuntimeError(
+                f"{self.name}: adaptive timestepping requires order 1 DuDt / DFDt "
+                f"(the order {max(self.DuDt.order, self.DFDt.order)} coefficients assume a constant timestep)"
+            )
+
+        if not hasattr(self, "adaptive_steps_accepted"):
+            self.adaptive_steps_accepted = 0
+            self.adaptive_steps_rejected = 0
+            self.dt_next = None
+            self._adaptive_u_prev = None
+            self._adaptive_dt_prev = None
+
+        dt_cfl = cfl * self.estimate_dt()
+
+        if self.dt_next is None:
+            dt = dt_cfl
+        else:
+            dt = min(self.dt_next, dt_cfl)
+
+        dt_unclipped = dt
+        if max_timestep is not None:
+            dt = min(dt, max_timestep)
+        clipped = dt < dt_unclipped
+
+        if not np.isfinite(dt):
+            raise RuntimeError(
+                f"{self.name}: unable to determine an initial timestep, please provide max_timestep"
+            )
+
+        if dt_min is None:
+            dt_min = 1.0e-6 * dt_cfl
+
+        history_vars = self._adaptive_history_variables()
+
+        with self.mesh.access():
+            saved_state = [var.data.copy() for var in history_vars]
+            u_n = self.u.data.copy()
+
+        rejections = 0
+
+        while True:
+            self.solve(
+                zero_init_guess=zero_init_guess,
+                timestep=dt,
+                _evalf=_evalf,
+                verbose=verbose,
+            )
+
+            # No error estimate is possible until there are two steps of history
+            if self._adaptive_u_prev is None:
+                error = None
+                break
+
+            with self.mesh.access():
+                u_new = self.u.data
+                u_pred = u_n + (dt / self._adaptive_dt_prev) * (u_n - self._adaptive_u_prev)
+                scaled = (u_new - u_pred) / (atol + rtol * np.abs(u_new))
+                local_sq = (scaled**2).sum()
+                local_count = scaled.size
+
+            error = np.sqrt(
+                comm.allreduce(local_sq, op=MPI.SUM)
+                / max(1, comm.allreduce(local_count, op=MPI.SUM))
+            )
+
+            if error <= 1.0:
+                break
+
+            if dt <= dt_min or rejections >= max_rejections:
+                if verbose and uw.mpi.rank == 0:
+                    print(
+                        f"{self.name}: accepting timestep {dt:.3e} with error estimate {error:.3e}",
+                        flush=True,
+                    )
+                break
+
+            # Reject: restore the solution and history terms, then retry
+            rejections += 1
+            self.adaptive_steps_rejected += 1
+
+            with self.mesh.access(*history_vars):
+                for var, data in zip(history_vars, saved_state):
+                    var.data[...] = data
+
+            dt = max(dt_min, dt * max(min_shrink, safety * error ** (-0.5)))
+
+            if verbose and uw.mpi.rank == 0:
+                print(
+                    f"{self.name}: rejected step (error {error:.3e}), retry with dt = {dt:.3e}",
+                    flush=True,
+                )
+
+        self.adaptive_steps_accepted += 1
+        self.adaptive_error = error
+
+        if error is None:
+            growth = 1.0
+        elif error == 0.0:
+            growth = max_growth
+        else:
+            growth = min(max_growth, safety * error ** (-0.5))
+
+        # Don't grow immediately after a rejected step
+        if rejections > 0:
+            growth = min(growth, 1.0)
+
+        # A step that was only shortened to hit max_timestep says nothing about
+        # the step size that the error control allows
+        if clipped and rejections == 0 and error is not None and error <= 1.0:
+            self.dt_next = min(max(dt * growth, dt_unclipped), dt_cfl)
+        else:
+            self.dt_next = min(dt * growth, dt_cfl)
+        self._adaptive_u_prev = u_n
+        self._adaptive_dt_prev = dt
+
+        return dt
+
 
 class SNES_Diffusion(SNES_Scalar):
     r"""
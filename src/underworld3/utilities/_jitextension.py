@@ -33,6 +33,23 @@ from collections import namedtuple
 _ext_dict = {}
 
 
+class PetscConstant(sympy.Symbol):
+    """
+    A symbol that is printed into the JIT code as an entry of the PetscDS
+    `constants[]` array. Values are supplied at solve time with
+    `PetscDSSetConstants`, so changing them does not require the
+    pointwise functions to be regenerated / recompiled.
+    """
+
+    def _ccode(self, printer):
+        return f"constants[{self.name.rsplit('_', 1)[-1]}]"
+
+
+def petsc_constant(index: int):
+    """Returns the symbol that maps to `constants[index]` in compiled functions"""
+    return PetscConstant(f"uw_petsc_constant_{index}")
+
+
 # Generates the C debugging string for the compiled function block
 def debugging_text(randstr, fn, fn_type, eqn_no):
     try:
@@ -122,6 +139,17 @@ def getext(
 
     fns = tuple(expanded_fns)
 
+    ## Record the mesh variables read by compiled functions so that any
+    ## (lazily updated) swarm proxies among them are rebuilt before a solve.
+
+    from underworld3.function._function import UnderworldAppliedFunction
+
+    for fn in fns:
+        if isinstance(fn, (sympy.Basic, sympy.MatrixBase)):
+            for varfn in fn.atoms(UnderworldAppliedFunction):
+                meshvar = varfn.meshvar()
+                meshvar.mesh._solver_variables.add(meshvar.clean_name)
+
     if debug and underworld3.mpi.rank==0:
         print(f"Expanded functions for compilation:")
         for i,fn in enumerate(fns):
@@ -79,6 +79,53 @@ def points_in_simplex3D(p, a, b, c, d):
     )
 
 
+def points_barycentric_in_simplices(p, vertices, degenerate_tolerance=1.0e-10):
+    """
+    p - numpy array of points (n x cdim)
+    vertices - the vertices of a simplex for each of the points (n x dim+1 x cdim)
+
+    returns:
+        numpy array (n x dim+1) of the barycentric coordinates of each point with respect to
+        its own simplex. These are all >= 0 if the point is in the simplex and the most negative
+        one identifies the face (opposite that vertex) that the point lies beyond.
+
+        If the simplices are embedded in a higher dimension (cdim > dim, e.g. a surface mesh),
+        the coordinates are the least-squares solution, i.e. those of the point projected onto
+        the plane of the simplex. Degenerate simplices (relative smallest singular value below
+        `degenerate_tolerance`) have no barycentric coordinates and their rows are NaN.
+    """
+
+    n = vertices.shape[0]
+    dim = vertices.shape[1] - 1
+    cdim = vertices.shape[2]
+
+    v0 = vertices[:, 0, :]
+    T = (vertices[:, 1:, :] - v0[:, np.newaxis, :]).transpose(0, 2, 1)
+    r = (p - v0)[:, :, np.newaxis]
+
+    if n == 0:
+        return np.zeros((0, dim + 1))
+
+    lam = np.full((n, dim), np.nan)
+
+    if cdim == dim:
+        try:
+            lam[...] = np.linalg.solve(T, r)[:, :, 0]
+        except np.linalg.LinAlgError:
+            # Only solve for the cells that are not singular
+            s = np.linalg.svd(T, compute_uv=False)
+            valid = s[:, -1] > degenerate_tolerance * s[:, 0]
+            lam[valid] = np.linalg.solve(T[valid], r[valid])[:, :, 0]
+
+    else:
+        U, s, Vt = np.linalg.svd(T, full_matrices=False)
+        valid = s[:, -1] > degenerate_tolerance * s[:, 0]
+        Utr = np.matmul(U[valid].transpose(0, 2, 1), r[valid])[:, :, 0] / s[valid]
+        lam[valid] = np.matmul(Vt[valid].transpose(0, 2, 1), Utr[:, :, np.newaxis])[:, :, 0]
+
+    return np.concatenate(((1.0 - lam.sum(axis=1))[:, np.newaxis], lam), axis=1)
+
+
 def distance_pointcloud_triangle(p, a, b, c):
     """
     p - numpy array of points in 3D
@@ -74,12 +74,7 @@ def mesh_to_pv_mesh(mesh, jupyter_backend=None):
     cell_num_points = mesh.element.entities[mesh.dim]
     face_num_points = mesh.element.face_entities[mesh.dim]
 
-    cell_points_list = []
-    for cell_id in range(cStart, cEnd):
-        cell_points = mesh.dm.getTransitiveClosure(cell_id)[0][-cell_num_points:]
-        cell_points_list.append(cell_points - pStart)
-
-    cells_array = np.array(cell_points_list, dtype=int)
+    cells_array = np.array(mesh.cell_vertices[:, -cell_num_points:], dtype=int)
     cells_size = np.full((cells_array.shape[0], 1), cell_num_points, dtype=int)
     cells_type = np.full((cells_array.shape[0], 1), vtk_cell_type, dtype=int)
 
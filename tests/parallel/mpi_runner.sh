@@ -24,3 +24,13 @@ mpirun -np 4 $PYTHON ./ptest_002_projection.py
 #mpirun -np 1 $PYTHON ./ptest_003_swarm_projection.py
 #echo "ptest 003 -np 4"
 #mpirun -np 4 $PYTHON ./ptest_003_swarm_projection.py
+
+echo "ptest 005 -np 1"
+mpirun -np 1 $PYTHON ./ptest_005_distributed_mesh_save_load.py
+echo "ptest 005 -np 4"
+mpirun -np 4 $PYTHON ./ptest_005_distributed_mesh_save_load.py
+
+echo "ptest 006 -np 1"
+mpirun -np 1 $PYTHON ./ptest_006_swarm_migrate.py
+echo "ptest 006 -np 4"
+mpirun -np 4 $PYTHON ./ptest_006_swarm_migrate.py
@@ -0,0 +1,41 @@
+import underworld3 as uw
+import numpy as np
+from mpi4py import MPI
+
+# Save a distributed (and refined) mesh on N processes and reload it on the
+# same number of processes. The stored partition is restored, so every
+# process should get back exactly the part of the mesh that it saved,
+# including the refined coordinates that the callback snapped to the
+# boundaries. The derived geometry is stored too and must pass the checksum
+# test on every process. Run on several processes (e.g. 4) to test the
+# collective write.
+
+comm = uw.mpi.comm
+filename = "ptest_005_annulus.h5"
+
+mesh = uw.meshing.Annulus(radiusOuter=1.0, radiusInner=0.5, cellSize=0.1, refinement=1)
+mesh.write_distributed(filename, store_geometry=True)
+
+mesh1 = uw.discretisation.Mesh(filename)
+
+same_chart = mesh1.dm.getChart() == mesh.dm.getChart()
+same_coords = mesh1.data.shape == mesh.data.shape and np.allclose(mesh1.data, mesh.data)
+
+# the stored geometry is accepted (checksum) and matches the original
+geometry_loaded = mesh1._mesh_sizes is not None and mesh1._load_geometry_arrays(filename)
+same_geometry = np.allclose(mesh1._centroids, mesh._centroids) and np.allclose(
+    mesh1.faces_outer_control_points, mesh.faces_outer_control_points
+)
+
+local_ok = same_chart and same_coords and geometry_loaded and same_geometry
+all_ok = comm.allreduce(int(local_ok), op=MPI.MIN)
+
+n_cells = mesh.dm.getHeightStratum(0)[1] - mesh.dm.getHeightStratum(0)[0]
+n_cells1 = mesh1.dm.getHeightStratum(0)[1] - mesh1.dm.getHeightStratum(0)[0]
+total = comm.allreduce(n_cells, op=MPI.SUM)
+total1 = comm.allreduce(n_cells1, op=MPI.SUM)
+
+if uw.mpi.rank == 0:
+    print(f"Saved {total} cells, reloaded {total1} cells on {uw.mpi.size} processes", flush=True)
+    assert all_ok, "Error: reloaded distributed mesh does not match the saved partition."
+    assert total == total1, "Error: cells lost in the distributed mesh reload."
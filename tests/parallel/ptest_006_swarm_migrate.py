@@ -0,0 +1,60 @@
+import underworld3 as uw
+import numpy as np
+from mpi4py import MPI
+
+# Move every particle of a swarm a long way (most of them to another
+# process) and check that the migration keeps them all, that each one lands
+# on the process that owns the cell it is in, and that the particle data
+# travels with it. Run this with 4 processes so that particles have to pass
+# over neighbouring partitions.
+
+comm = uw.mpi.comm
+
+shift = 0.37
+
+mesh = uw.meshing.UnstructuredSimplexBox(
+    minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 24.0, regular=False
+)
+
+swarm = uw.swarm.Swarm(mesh)
+x0 = uw.swarm.SwarmVariable("x0", swarm, 2, _proxy=False)
+swarm.populate(fill_param=2)
+
+with swarm.access(x0):
+    x0.data[...] = swarm.particle_coordinates.data[...]
+    n_before = swarm.particle_coordinates.data.shape[0]
+
+total_before = comm.allreduce(n_before, op=MPI.SUM)
+
+# Shift in x and y, wrapping around, so particles cross several partitions
+# (the swarm migrates when the coordinates are released)
+with swarm.access(swarm.particle_coordinates):
+    new_coords = swarm.particle_coordinates.data + shift
+    new_coords[new_coords >= 1.0] -= 1.0
+    swarm.particle_coordinates.data[...] = new_coords
+
+with swarm.access():
+    coords = swarm.particle_coordinates.data.copy()
+    origin = x0.data.copy()
+    n_after = coords.shape[0]
+
+total_after = comm.allreduce(n_after, op=MPI.SUM)
+
+# every particle is in a cell of the process that holds it
+owned = np.all(swarm._get_owning_cells() != -1)
+
+# and carries its own data
+expected = origin + shift
+expected[expected >= 1.0] -= 1.0
+carried = np.allclose(coords, expected)
+
+all_owned = comm.allreduce(int(owned), op=MPI.MIN)
+all_carried = comm.allreduce(int(carried), op=MPI.MIN)
+
+if uw.mpi.rank == 0:
+    print(f"Before migration; Total particles in all ranks: {total_before}", flush=True)
+    print(f"After migration; Total particles in all ranks: {total_after}", flush=True)
+
+    assert total_after == total_before, "Error: particles lost in swarm migration."
+    assert all_owned, "Error: migrated particles are not in a local cell."
+    assert all_carried, "Error: particle data did not migrate with the particles."
@@ -127,3 +127,467 @@ def test_create_solid_usbIB_3d_mesh():
 
     return    
     
+
+
+def test_mesh_cell_index_locates_centroids():
+    import numpy as np
+    from underworld3.meshing import UnstructuredSimplexBox, StructuredQuadBox
+
+    meshes = [
+        UnstructuredSimplexBox(minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 8.0),
+        UnstructuredSimplexBox(minCoords=(0.0, 0.0, 0.0), maxCoords=(1.0, 1.0, 1.0), cellSize=1.0 / 4.0),
+        StructuredQuadBox(elementRes=(8, 8)),
+        StructuredQuadBox(elementRes=(4, 4, 4)),
+    ]
+
+    for mesh in meshes:
+        cStart, cEnd = mesh.dm.getHeightStratum(0)
+        assert np.all(mesh.get_closest_cells(mesh._centroids) == np.arange(cStart, cEnd))
+        assert np.all(mesh.get_closest_local_cells(mesh._centroids) == np.arange(cStart, cEnd))
+
+    return
+
+
+def test_mesh_point_in_cell_after_deformation():
+    import numpy as np
+    from underworld3.meshing import StructuredQuadBox
+
+    mesh = StructuredQuadBox(elementRes=(8, 8))
+    cStart, cEnd = mesh.dm.getHeightStratum(0)
+
+    new_coords = mesh.data.copy()
+    new_coords[:, 1] *= 1.0 + 0.25 * new_coords[:, 0]
+    mesh.deform_mesh(new_coords)
+
+    # control points follow the deformed geometry
+    assert np.all(mesh.get_closest_local_cells(mesh._centroids) == np.arange(cStart, cEnd))
+
+    outside = mesh._centroids.copy()
+    outside[:, 1] += 10.0
+    assert np.all(mesh.test_if_points_in_cells(outside, np.arange(cStart, cEnd)) == False)
+
+    return
+
+
+def test_mesh_sizes_match_reference():
+    import numpy as np
+    import underworld3 as uw
+    from underworld3.meshing import UnstructuredSimplexBox, StructuredQuadBox
+
+    meshes = [
+        UnstructuredSimplexBox(minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 8.0),
+        StructuredQuadBox(elementRes=(4, 4, 4)),
+    ]
+
+    for mesh in meshes:
+        # cell-by-cell reference calculation
+        centroids_kd_tree = uw.kdtree.KDTree(mesh._centroids)
+        cStart, cEnd = mesh.dm.getHeightStratum(0)
+        pStart, pEnd = mesh.dm.getDepthStratum(0)
+
+        radii = np.empty(cEnd - cStart)
+        lengths = np.empty(cEnd - cStart)
+        min_sizes = np.empty(cEnd - cStart)
+
+        for cell in range(cEnd - cStart):
+            n = mesh.dm.getConeSize(cell)
+            points = mesh.dm.getTransitiveClosure(cell)[0][-n:]
+            distsq, _ = centroids_kd_tree.query(mesh.data[points - pStart], k=1, sqr_dists=True)
+            lengths[cell] = np.sqrt(distsq.max())
+            radii[cell] = np.sqrt(distsq.mean())
+            min_sizes[cell] = np.sqrt(distsq.min())
+
+        assert np.array_equal(mesh._radii, radii)
+        assert np.array_equal(mesh._search_lengths, lengths)
+        assert np.array_equal(mesh._min_size, min_sizes)
+
+    return
+
+
+def test_mesh_points_in_domain():
+    import numpy as np
+    from underworld3.meshing import UnstructuredSimplexBox, StructuredQuadBox
+
+    meshes = [
+        UnstructuredSimplexBox(minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 8.0),
+        StructuredQuadBox(elementRes=(4, 4, 4)),
+    ]
+
+    for mesh in meshes:
+        assert np.all(mesh.points_in_domain(mesh._centroids))
+
+        outside = mesh._centroids.copy()
+        outside[:, 0] += 2.0
+        assert not np.any(mesh.points_in_domain(outside))
+
+        # every boundary face has exactly one supporting cell
+        boundary_faces, boundary_face_cells = mesh._get_boundary_faces()
+        for face, cell in zip(boundary_faces, boundary_face_cells):
+            assert list(mesh.dm.getSupport(face)) == [cell]
+
+    return
+
+
+def test_mesh_connectivity_arrays():
+    import numpy as np
+    from underworld3.meshing import UnstructuredSimplexBox, StructuredQuadBox
+
+    meshes = [
+        UnstructuredSimplexBox(minCoords=(0.0, 0.0, 0.0), maxCoords=(1.0, 1.0, 1.0), cellSize=1.0 / 4.0),
+        StructuredQuadBox(elementRes=(8, 8)),
+    ]
+
+    for mesh in meshes:
+        cStart, cEnd = mesh.dm.getHeightStratum(0)
+        fStart, fEnd = mesh.dm.getHeightStratum(1)
+        pStart, pEnd = mesh.dm.getDepthStratum(0)
+
+        assert mesh.cell_vertices.shape == (cEnd - cStart, mesh.element.entities[mesh.dim])
+        assert mesh.face_vertices.shape[0] == fEnd - fStart
+
+        for cell in range(cStart, cEnd):
+            closure = mesh.dm.getTransitiveClosure(cell)[0]
+            assert np.array_equal(mesh.cell_vertices[cell - cStart], closure[(closure >= pStart) & (closure < pEnd)] - pStart)
+            assert np.array_equal(mesh.cell_faces[cell - cStart], mesh.dm.getCone(cell))
+
+        # cached, not recomputed
+        assert mesh.cell_vertices is mesh.cell_vertices
+        assert np.all(mesh.boundary_faces >= fStart) and np.all(mesh.boundary_faces < fEnd)
+
+    return
+
+
+def test_mesh_deform_refreshes_geometry():
+    import numpy as np
+    from underworld3.meshing import UnstructuredSimplexBox
+
+    mesh = UnstructuredSimplexBox(minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 8.0)
+    cStart, cEnd = mesh.dm.getHeightStratum(0)
+
+    cell_vertices = mesh.cell_vertices
+    centroids = mesh._centroids.copy()
+    max_radius = mesh.get_max_radius()
+
+    new_coords = mesh.data.copy()
+    new_coords[:, 1] *= 2.0
+    mesh.deform_mesh(new_coords)
+
+    # topology is retained, coordinate-derived data follow the new geometry
+    assert mesh.cell_vertices is cell_vertices
+    assert np.allclose(mesh._centroids, centroids * np.array((1.0, 2.0)))
+    assert mesh.get_max_radius() > max_radius
+    assert np.all(mesh.get_closest_local_cells(mesh._centroids) == np.arange(cStart, cEnd))
+
+    return
+
+
+def test_mesh_locate_random_points():
+    import numpy as np
+    from underworld3.meshing import UnstructuredSimplexBox, StructuredQuadBox
+
+    meshes = [
+        UnstructuredSimplexBox(minCoords=(0.0, 0.0, 0.0), maxCoords=(1.0, 1.0, 1.0), cellSize=1.0 / 4.0),
+        StructuredQuadBox(elementRes=(4, 4, 4)),
+    ]
+
+    rng = np.random.default_rng(0)
+
+    for mesh in meshes:
+        cStart, cEnd = mesh.dm.getHeightStratum(0)
+
+        points = rng.random((500, 3))
+        cells = mesh.get_closest_local_cells(points)
+
+        assert np.all(cells >= cStart)
+        assert np.all(mesh._points_in_cells_exact(points, cells))
+
+        # the walk reaches the owning cell from a distant starting guess
+        walked = mesh._locate_points_by_walking(points, np.full(points.shape[0], cStart), max_steps=100)
+        assert np.all(mesh._points_in_cells_exact(points, walked))
+
+        outside = points + 2.0
+        assert np.all(mesh.get_closest_local_cells(outside) == -1)
+
+    return
+
+
+def test_points_barycentric_in_simplices():
+    import numpy as np
+    from underworld3.utilities.geometry_tools import points_barycentric_in_simplices
+
+    # second triangle is degenerate - it must not spoil the others
+    vertices = np.array(
+        [
+            [[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]],
+            [[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]],
+            [[0.0, 0.0], [2.0, 0.0], [0.0, 2.0]],
+        ]
+    )
+    points = np.array([[0.2, 0.2], [0.5, 0.0], [3.0, 3.0]])
+
+    lam = points_barycentric_in_simplices(points, vertices)
+    assert np.allclose(lam[0], (0.6, 0.2, 0.2))
+    assert np.all(np.isnan(lam[1]))
+    assert np.allclose(lam[2], (-2.0, 1.5, 1.5))
+
+    # triangles embedded in 3D (surface meshes) - points are projected onto each plane
+    vertices = np.array(
+        [
+            [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+            [[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [0.0, 1.0, 1.0]],
+        ]
+    )
+    points = np.array([[0.2, 0.3, 0.5], [0.6, 0.6, 1.0]])
+
+    lam = points_barycentric_in_simplices(points, vertices)
+    assert np.allclose(lam[0], (0.5, 0.2, 0.3))
+    assert np.allclose(lam[1], (-0.2, 0.6, 0.6))
+
+    return
+
+
+def test_mesh_lattice_point_location():
+    import numpy as np
+    from underworld3.meshing import UnstructuredSimplexBox, StructuredQuadBox
+
+    meshes = [
+        UnstructuredSimplexBox(minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 8.0, regular=True),
+        StructuredQuadBox(elementRes=(8, 4), minCoords=(-1.0, 0.0), maxCoords=(1.0, 0.5)),
+        StructuredQuadBox(elementRes=(4, 4, 4)),
+    ]
+
+    rng = np.random.default_rng(0)
+
+    for mesh in meshes:
+        assert mesh._lattice is not None
+
+        points = mesh._centroids + 0.1 * (rng.random(mesh._centroids.shape) - 0.5) * mesh._radii.reshape(-1, 1)
+        cells = mesh.get_closest_local_cells(points)
+        assert np.all(mesh._points_in_cells_exact(points, cells))
+        assert np.all(mesh.get_closest_cells(points) == cells)
+        assert np.all(mesh.points_in_domain(points))
+        assert not np.any(mesh.points_in_domain(points + 5.0))
+
+        # deformed meshes use the generic point location
+        new_coords = mesh.data.copy()
+        new_coords[:, 0] *= 1.0 + 0.1 * new_coords[:, 1]
+        mesh.deform_mesh(new_coords)
+        assert mesh._lattice is None
+
+    return
+
+
+def test_mesh_access_sync_and_update_lvec():
+    import numpy as np
+    import underworld3 as uw
+    from underworld3.meshing import StructuredQuadBox
+
+    mesh = StructuredQuadBox(elementRes=(8, 8))
+
+    T = uw.discretisation.MeshVariable("T_sync", mesh, 1, degree=1)
+    S = uw.discretisation.MeshVariable("S_sync", mesh, 1, degree=1)
+
+    with mesh.access(T, S):
+        T.data[:, 0] = 1.0
+        S.data[:, 0] = 2.0
+
+    assert np.allclose(uw.function.evaluate(T.sym[0] + S.sym[0], mesh._centroids), 3.0)
+
+    # only T changes - S must be retained in the mesh vector
+    with mesh.access(T, defer_sync=True):
+        T.data[:, 0] = mesh.data[:, 0]
+
+    assert len(mesh._pending_ghost_sync) == 1
+
+    values = uw.function.evaluate(T.sym[0] + S.sym[0], mesh._centroids)
+    assert np.allclose(values, mesh._centroids[:, 0] + 2.0)
+    assert len(mesh._pending_ghost_sync) == 0
+
+    return
+
+
+def test_mesh_update_lvec_modified_fields():
+    import numpy as np
+    import underworld3 as uw
+    from underworld3.meshing import StructuredQuadBox
+
+    mesh = StructuredQuadBox(elementRes=(4, 4))
+
+    A = uw.discretisation.MeshVariable("A_lvec", mesh, 1, degree=1)
+    B = uw.discretisation.MeshVariable("B_lvec", mesh, 1, degree=1)
+    C = uw.discretisation.MeshVariable("C_lvec", mesh, 1, degree=1)
+
+    with mesh.access(A, B, C):
+        A.data[:, 0] = 1.0
+        B.data[:, 0] = 2.0
+        C.data[:, 0] = 3.0
+
+    def field_values():
+        decomposition = mesh._get_field_decomposition()
+        gvec = decomposition["gvec"]
+        values = {}
+        for var, iset in zip(mesh.vars.values(), decomposition["isets"]):
+            subvec = gvec.getSubVector(iset)
+            values[var.clean_name] = subvec.array.copy()
+            gvec.restoreSubVector(iset, subvec)
+        return values
+
+    mesh.update_lvec()
+    states = dict(mesh._get_field_decomposition()["states"])
+
+    with mesh.access(B):
+        B.data[:, 0] = 5.0
+
+    mesh.update_lvec()
+    new_states = mesh._get_field_decomposition()["states"]
+
+    # only B was copied in, A and C are retained
+    assert new_states[A.clean_name] == states[A.clean_name]
+    assert new_states[C.clean_name] == states[C.clean_name]
+    assert new_states[B.clean_name] != states[B.clean_name]
+    assert new_states[B.clean_name] == B._get_state()
+
+    values = field_values()
+    assert np.allclose(values[A.clean_name], 1.0)
+    assert np.allclose(values[B.clean_name], 5.0)
+    assert np.allclose(values[C.clean_name], 3.0)
+
+    # a further write after the intermediate update is picked up
+    with mesh.access(B):
+        B.data[:, 0] = 7.0
+
+    mesh.update_lvec()
+    values = field_values()
+    assert np.allclose(values[B.clean_name], 7.0)
+    assert np.allclose(values[A.clean_name], 1.0)
+
+    result = uw.function.evaluate(A.sym[0] + B.sym[0] + C.sym[0], mesh._centroids)
+    assert np.allclose(result, 11.0)
+
+    return
+
+
+def test_mesh_scoped_access():
+    import numpy as np
+    import underworld3 as uw
+    from underworld3.meshing import StructuredQuadBox
+
+    mesh = StructuredQuadBox(elementRes=(4, 4))
+
+    T = uw.discretisation.MeshVariable("T_scoped", mesh, 1, degree=1)
+    S = uw.discretisation.MeshVariable("S_scoped", mesh, 1, degree=1)
+
+    with mesh.access(write=[T]):
+        T.data[:, 0] = 1.0
+        assert not S._is_accessed
+
+    with mesh.access(read=[T, S]):
+        assert np.allclose(T.data, 1.0)
+        assert not T.data.flags.writeable
+
+    assert np.allclose(uw.function.evaluate(T.sym[0], mesh._centroids), 1.0)
+
+    return
+
+
+def test_mesh_coords_for_basis_cached():
+    import numpy as np
+    from underworld3.meshing import UnstructuredSimplexBox
+
+    mesh = UnstructuredSimplexBox(minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 8.0)
+
+    centroids = mesh._get_coords_for_basis(0, False)
+    dm = mesh._get_coordinate_interpolation(0, False)["dm"]
+
+    # repeated queries re-use the interpolation DM
+    assert np.allclose(mesh._get_coords_for_basis(0, False), centroids)
+    assert mesh._get_coordinate_interpolation(0, False)["dm"] is dm
+
+    new_coords = mesh.data.copy()
+    new_coords[:, 0] *= 3.0
+    mesh.deform_mesh(new_coords)
+
+    # ... but follow the deformation
+    assert np.allclose(mesh._get_coords_for_basis(0, False), centroids * np.array((3.0, 1.0)))
+
+    return
+
+
+def test_mesh_generation_cache():
+    import os
+    import numpy as np
+    from underworld3 import meshing
+
+    mesh_args = dict(minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 7.0)
+
+    mesh_0 = meshing.UnstructuredSimplexBox(**mesh_args)
+    cached = [
+        f for f in os.listdir(meshing.mesh_cache_directory) if f.startswith("uw_simplexbox_") and f.endswith(".msh")
+    ]
+    mtimes = {f: os.path.getmtime(os.path.join(meshing.mesh_cache_directory, f)) for f in cached}
+
+    # same arguments -> gmsh is skipped and the cached file is untouched
+    mesh_1 = meshing.UnstructuredSimplexBox(**mesh_args, degree=2)
+    for f, mtime in mtimes.items():
+        assert os.path.getmtime(os.path.join(meshing.mesh_cache_directory, f)) == mtime
+
+    assert mesh_0.dm.getChart() == mesh_1.dm.getChart()
+    assert np.allclose(mesh_0.data, mesh_1.data)
+
+    # different arguments -> different entry
+    mesh_2 = meshing.UnstructuredSimplexBox(**mesh_args, regular=True)
+    cached_2 = [
+        f for f in os.listdir(meshing.mesh_cache_directory) if f.startswith("uw_simplexbox_") and f.endswith(".msh")
+    ]
+    assert len(cached_2) == len(cached) + 1
+
+    return
+
+
+def test_mesh_cache_filename_keys():
+    import os
+    import numpy as np
+    from underworld3 import meshing
+
+    # arrays that only differ beyond the numpy repr summary
+    a = np.zeros(2000)
+    b = a.copy()
+    b[1000] = 1.0
+    assert repr(a) == repr(b)
+    assert meshing._mesh_cache_filename("test", centre=a) != meshing._mesh_cache_filename("test", centre=b)
+
+    # identical values give identical names, in any argument order
+    assert meshing._mesh_cache_filename("test", x=0.1, y=(1, 2)) == meshing._mesh_cache_filename(
+        "test", y=(1, 2), x=0.1
+    )
+
+    # callables are not cached
+    f = lambda x: x
+    g = lambda x: 2 * x
+    assert meshing._mesh_cache_filename("test", fn=f) == meshing._mesh_cache_filename("test", fn=g)
+    assert not meshing._mesh_cache_hit(meshing._mesh_cache_filename("test", fn=f))
+    assert os.path.dirname(os.path.abspath(meshing._mesh_cache_filename("test", fn=f))) != os.path.abspath(
+        meshing.mesh_cache_directory
+    )
+
+    return
+
+
+def test_mesh_refinement_hierarchy():
+    import numpy as np
+    import underworld3 as uw
+    from underworld3.meshing import Annulus
+
+    mesh = Annulus(radiusOuter=1.0, radiusInner=0.5, cellSize=0.2, refinement=2)
+
+    assert len(mesh.dm_hierarchy) == 3
+    assert [level for level, _, _ in mesh._refinement_timings] == [1, 2]
+
+    # boundary vertices on every level are snapped to the surface
+    for dm in mesh.dm_hierarchy:
+        coords = dm.getCoordinatesLocal().array.reshape(-1, 2)
+        upper = uw.cython.petsc_discretisation.petsc_dm_find_labeled_points_local(dm, "Upper")
+        assert len(upper) > 0
+        assert np.allclose(np.hypot(coords[upper, 0], coords[upper, 1]), 1.0)
+
+    return
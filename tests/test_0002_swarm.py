@@ -60,3 +60,303 @@ def test_addNPoints(setup_data):
         npts = swarm2.data.shape[0]
     assert npts == 10
 
+
+def test_scoped_access(setup_data):
+    import numpy as np
+
+    swarm = setup_data
+    a = swarm.add_variable(name="a", size=1)
+    b = swarm.add_variable(name="b", size=1)
+    swarm.populate(fill_param=2)
+
+    with swarm.access(write=[a]):
+        a.data[:, 0] = 1.0
+        # b was not requested
+        assert b._data is None
+
+    with swarm.access(read=[a, b]):
+        assert np.allclose(a.data, 1.0)
+        assert not b.data.flags.writeable
+
+
+def test_swarm_advection_rk4(setup_data):
+    import numpy as np
+    import sympy
+
+    swarm = setup_data
+    mesh = swarm.mesh
+    swarm.populate(fill_param=1)
+
+    # rigid rotation about the centre of the box
+    x, y = mesh.X
+    V_fn = sympy.Matrix([[-(y - 0.5), (x - 0.5)]])
+
+    with swarm.access():
+        X = swarm.particle_coordinates.data.copy()
+
+    # keep the rotated particles well inside the box
+    r = np.hypot(X[:, 0] - 0.5, X[:, 1] - 0.5)
+
+    swarm.advection(V_fn, 0.1, order=4, step_limit=False)
+
+    with swarm.access():
+        X1 = swarm.particle_coordinates.data.copy()
+
+    theta = 0.1
+    expected = np.empty_like(X)
+    expected[:, 0] = 0.5 + np.cos(theta) * (X[:, 0] - 0.5) - np.sin(theta) * (X[:, 1] - 0.5)
+    expected[:, 1] = 0.5 + np.sin(theta) * (X[:, 0] - 0.5) + np.cos(theta) * (X[:, 1] - 0.5)
+
+    # particles may be re-ordered, so compare the sets of points near the centre
+    import underworld3 as uw
+
+    inner = r < 0.4
+    d, _ = uw.kdtree.KDTree(X1).query(expected[inner], k=1)
+    assert np.all(d < 1.0e-6)
+
+
+def test_swarm_owning_cells(setup_data):
+    import numpy as np
+
+    swarm = setup_data
+    mesh = swarm.mesh
+    swarm.populate(fill_param=2)
+
+    cells = swarm._get_owning_cells()
+    with swarm.access():
+        coords = swarm.particle_coordinates.data.copy()
+
+    assert np.all(cells != -1)
+    assert np.all(mesh._points_in_cells_exact(coords, cells))
+
+    # cached until the particles move
+    assert swarm._get_owning_cells() is cells
+
+    with swarm.access(swarm.particle_coordinates):
+        swarm.particle_coordinates.data[:, 0] = 0.9 * swarm.particle_coordinates.data[:, 0] + 0.05
+
+    with swarm.access():
+        coords = swarm.particle_coordinates.data.copy()
+
+    cells = swarm._get_owning_cells()
+    assert np.all(cells != -1)
+    assert np.all(mesh._points_in_cells_exact(coords, cells))
+
+
+def test_swarm_migrate_partition_map(setup_data):
+    import numpy as np
+    import underworld3 as uw
+
+    swarm = setup_data
+    mesh = swarm.mesh
+    swarm.populate(fill_param=1)
+
+    with swarm.access():
+        coords = swarm.particle_coordinates.data.copy()
+
+    ranks = mesh._partition_lookup(coords)
+    assert ranks.shape == (coords.shape[0],)
+    assert np.all((ranks >= 0) & (ranks < uw.mpi.size))
+
+    # cached per mesh
+    assert mesh._get_partition_map() is mesh._get_partition_map()
+
+    # particles pushed out of the box are lost and removed on migration
+    n_local = coords.shape[0]
+    with swarm.access(swarm.particle_coordinates):
+        swarm.particle_coordinates.data[0:10, 0] += 2.0
+
+    swarm.migrate()
+
+    with swarm.access():
+        assert swarm.particle_coordinates.data.shape[0] == n_local - 10
+
+
+def test_swarm_remove_particles(setup_data):
+    import numpy as np
+    import underworld3 as uw
+    from petsc4py import PETSc
+
+    swarm = setup_data
+    var = uw.swarm.SwarmVariable("ids", swarm, 1, dtype=int, _proxy=False)
+    swarm.populate(fill_param=2)
+
+    with swarm.access(var):
+        n = var.data.shape[0]
+        var.data[:, 0] = np.arange(n)
+        coords = swarm.particle_coordinates.data.copy()
+
+    # DMSwarm_pid is a PetscInt64 field, petsc4py can only read it with 64-bit indices
+    check_pid = np.dtype(PETSc.IntType) == np.int64
+    if check_pid:
+        pid = swarm.dm.getField("DMSwarm_pid")
+        pid[:] = np.arange(n)
+        swarm.dm.restoreField("DMSwarm_pid")
+
+    mask = np.zeros(n, dtype=bool)
+    mask[::3] = True
+
+    assert swarm.remove_particles(mask) == np.count_nonzero(mask)
+
+    with swarm.access():
+        ids = var.data[:, 0].copy()
+        new_coords = swarm.particle_coordinates.data.copy()
+
+    # the survivors keep their own data
+    assert np.array_equal(np.sort(ids), np.where(~mask)[0])
+    assert np.allclose(new_coords, coords[ids])
+
+    if check_pid:
+        pid = swarm.dm.getField("DMSwarm_pid").copy()
+        swarm.dm.restoreField("DMSwarm_pid")
+        assert np.array_equal(pid, ids)
+
+    # owning cells are carried along with the particles
+    cells = swarm._get_owning_cells()
+    assert np.all(swarm.mesh._points_in_cells_exact(new_coords, cells))
+
+    with pytest.raises(RuntimeError):
+        swarm.remove_particles(np.zeros(n, dtype=bool))
+
+
+def test_swarm_lazy_proxy_update(setup_data):
+    import numpy as np
+    import underworld3 as uw
+
+    swarm = setup_data
+    mesh = swarm.mesh
+    var = swarm.add_variable(name="lazy", size=1)
+    swarm.populate(fill_param=2)
+
+    with swarm.access(var):
+        var.data[:, 0] = 2.0
+
+    # nothing has read the proxy yet
+    assert var._proxy_stale
+    assert var.proxy_rebuilds_avoided == 0
+
+    with swarm.access(var):
+        var.data[:, 0] = 3.0
+
+    assert var._proxy_stale
+    assert var.proxy_rebuilds_avoided == 1
+
+    # evaluation rebuilds the proxy on demand
+    coords = np.array([[0.25, 0.25], [0.5, 0.75]])
+    values = uw.function.evaluate(var.sym[0, 0], coords)
+
+    assert not var._proxy_stale
+    assert np.allclose(values, 3.0)
+
+    with mesh.access():
+        assert np.allclose(var._meshVar.data, 3.0)
+
+    # explicit requests are a no-op if the proxy is current
+    var.update_proxy()
+    assert not var._proxy_stale
+    assert var.proxy_rebuilds_avoided == 1
+
+
+def test_swarm_shared_neighbour_search(setup_data):
+    import numpy as np
+    import underworld3 as uw
+
+    swarm = setup_data
+    a = swarm.add_variable(name="a", size=1, proxy_degree=2)
+    b = swarm.add_variable(name="b", size=2, proxy_degree=2)
+    swarm.populate(fill_param=2)
+
+    with swarm.access(a, b):
+        a.data[:, 0] = swarm.particle_coordinates.data[:, 0]
+        b.data[...] = swarm.particle_coordinates.data[...]
+        X = swarm.particle_coordinates.data.copy()
+        A = a.data.copy()
+
+    a.update_proxy()
+    tree = swarm._index
+    n_queries = len(swarm._nnmapdict)
+
+    # b is rebuilt by its own update (not as a side effect of a's) ...
+    assert not a._proxy_stale
+    assert b._proxy_stale
+
+    # ... and with the same particles and proxy node set, nothing new is built
+    b.update_proxy()
+    assert not b._proxy_stale
+    assert swarm._index is tree
+    assert len(swarm._nnmapdict) == n_queries
+
+    # the shared search gives the same mapping as a dedicated one
+    nnn = swarm.mesh.dim + 1
+    coords = a._meshVar.coords
+    expected = uw.kdtree.KDTree(X).rbf_interpolator_local(coords, A, nnn, 2)
+    assert np.allclose(a.rbf_interpolate(coords, nnn=nnn), expected)
+
+    # moving the particles invalidates the tree
+    with swarm.access(swarm.particle_coordinates):
+        swarm.particle_coordinates.data[:, 0] *= 0.99
+
+    a.update_proxy()
+    assert swarm._index is not tree
+
+
+def test_swarm_proxy_evaluate_inside_mesh_access(setup_data):
+    import numpy as np
+    import underworld3 as uw
+
+    swarm = setup_data
+    mesh = swarm.mesh
+    var = swarm.add_variable(name="inside", size=1)
+    X = uw.discretisation.MeshVariable("X_inside", mesh, 1, degree=1)
+    swarm.populate(fill_param=2)
+
+    with swarm.access(var):
+        var.data[:, 0] = 4.0
+
+    assert var._proxy_stale
+
+    # the usual pattern: the proxy is opened (read-only) by the outer access
+    with mesh.access(X):
+        X.data[:, 0] = uw.function.evaluate(var.sym[0, 0], X.coords)
+
+    assert not var._proxy_stale
+
+    with mesh.access():
+        assert np.allclose(X.data, 4.0)
+        assert np.allclose(var._meshVar.data, 4.0)
+
+
+def test_swarm_proxy_rebuilds_are_independent(setup_data):
+    import numpy as np
+    import underworld3 as uw
+
+    swarm = setup_data
+    mesh = swarm.mesh
+    a = swarm.add_variable(name="a_indep", size=1)
+    b = swarm.add_variable(name="b_indep", size=1)
+    T = uw.discretisation.MeshVariable("T_indep", mesh, 1, degree=1)
+    swarm.populate(fill_param=2)
+
+    with swarm.access(a, b):
+        a.data[:, 0] = 1.0
+        b.data[:, 0] = 2.0
+
+    assert a._proxy_stale and b._proxy_stale
+
+    # evaluating one proxy does not rebuild the other
+    values = uw.function.evaluate(a.sym[0, 0], mesh._centroids)
+    assert np.allclose(values, 1.0)
+    assert not a._proxy_stale
+    assert b._proxy_stale
+
+    # nor does an (unscoped) access to another variable
+    with mesh.access(T):
+        T.data[:, 0] = 3.0
+
+    assert b._proxy_stale
+
+    # a proxy that is named is brought up to date
+    with mesh.access(read=[b._meshVar]):
+        assert np.allclose(b._meshVar.data, 2.0)
+
+    assert not b._proxy_stale
@@ -79,3 +79,63 @@ def test_swarmvariable_save_and_load(tmp_path):
 
     with swarm.access():
         assert np.allclose(var.data, var2.data)
+
+
+def test_distributed_mesh_save_and_load(tmp_path):
+    import underworld3
+    from underworld3.meshing import UnstructuredSimplexBox
+
+    mesh = UnstructuredSimplexBox(
+        minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 16.0, refinement=1
+    )
+
+    mesh.write_distributed(f"{tmp_path}/test.dist.h5")
+
+    # refinement is restored from the file
+    mesh1 = underworld3.discretisation.Mesh(f"{tmp_path}/test.dist.h5")
+
+    assert len(mesh1.dm_hierarchy) == 2
+    assert mesh1.dm.getChart() == mesh.dm.getChart()
+    assert np.fabs(mesh1.get_min_radius() - mesh.get_min_radius()) < 1.0e-5
+
+
+def test_distributed_mesh_geometry_reload(tmp_path):
+    import underworld3
+    from underworld3.meshing import UnstructuredSimplexBox
+
+    mesh = UnstructuredSimplexBox(
+        minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 16.0
+    )
+
+    mesh.write_distributed(f"{tmp_path}/test.geom.h5", store_geometry=True)
+
+    mesh1 = underworld3.discretisation.Mesh(f"{tmp_path}/test.geom.h5")
+
+    # restored rather than left to be rebuilt lazily
+    assert mesh1._index is not None
+    assert mesh1._mesh_sizes is not None
+
+    assert np.allclose(mesh1._radii, mesh._radii)
+    assert np.allclose(mesh1._centroids, mesh._centroids)
+    assert np.allclose(mesh1.faces_inner_control_points, mesh.faces_inner_control_points)
+
+    points = np.random.random((100, 2))
+    assert np.all(mesh1.get_closest_local_cells(points) == mesh.get_closest_local_cells(points))
+
+
+def test_distributed_mesh_refined_coordinates(tmp_path):
+    import underworld3
+    from underworld3.meshing import Annulus
+
+    # the refinement callback snaps the new boundary points to the circles
+    mesh = Annulus(radiusOuter=1.0, radiusInner=0.5, cellSize=0.2, refinement=1)
+
+    mesh.write_distributed(f"{tmp_path}/test.annulus.h5", store_geometry=True)
+
+    mesh1 = underworld3.discretisation.Mesh(f"{tmp_path}/test.annulus.h5")
+
+    assert np.allclose(mesh1.data, mesh.data)
+
+    # so the stored geometry is accepted
+    assert mesh1._mesh_sizes is not None
+    assert np.allclose(mesh1._centroids, mesh._centroids)
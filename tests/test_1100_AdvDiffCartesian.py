@@ -142,6 +142,177 @@ def test_advDiff_boxmesh(mesh):
     del adv_diff
 
 
+def test_advDiff_estimate_dt_per_cell():
+    mesh = unstructured_simplex_box_irregular
+
+    v = uw.discretisation.MeshVariable("U2", mesh, mesh.dim, degree=1)
+    T = uw.discretisation.MeshVariable("T2", mesh, 1, degree=u_degree)
+
+    adv_diff = uw.systems.AdvDiffusion(mesh, u_Field=T, V_fn=v)
+    adv_diff.constitutive_model = uw.constitutive_models.DiffusionModel
+    adv_diff.constitutive_model.Parameters.diffusivity = kappa
+
+    with mesh.access(v):
+        v.data[:, 1] = velocity
+
+    dt = adv_diff.estimate_dt()
+
+    # per-cell diagnostics are retained
+    assert adv_diff.dt_adv_cells.shape == mesh._radii.shape
+    assert adv_diff.dt_diff_cells.shape == mesh._radii.shape
+
+    # element-by-element limits can only relax the global (min radius / max velocity) value
+    min_dx = mesh.get_min_radius()
+    assert dt >= min(min_dx**2 / kappa, min_dx / velocity) * (1.0 - 1.0e-6)
+    assert np.isclose(dt, min(adv_diff.dt_adv, adv_diff.dt_diff))
+
+    del adv_diff
+
+
+def test_advDiff_adaptive_timestep():
+    mesh = meshStructuredQuadBox
+
+    v = uw.discretisation.MeshVariable("U3", mesh, mesh.dim, degree=1)
+    T = uw.discretisation.MeshVariable("T3", mesh, 1, degree=u_degree)
+
+    adv_diff = uw.systems.AdvDiffusion(mesh, u_Field=T, V_fn=v)
+    adv_diff.constitutive_model = uw.constitutive_models.DiffusionModel
+    adv_diff.constitutive_model.Parameters.diffusivity = kappa
+
+    adv_diff.add_dirichlet_bc(0.0, "Left")
+    adv_diff.add_dirichlet_bc(0.0, "Right")
+
+    with mesh.access(v):
+        v.data[:, 1] = velocity
+
+    U_start = U_a_x.subs({u: velocity, t: t_start, x: mesh.X[0], x0: 0.4, x1: 0.6})
+    with mesh.access(T):
+        T.data[:, 0] = uw.function.evaluate(U_start, T.coords)
+
+    # the timestep is a PetscDS constant - changing it must not re-compile
+    adv_diff.solve(timestep=1.0e-5)
+    n_extensions = len(uw.utilities._jitextension._ext_dict)
+
+    model_time = t_start + 1.0e-5
+    while model_time < t_end:
+        dt = adv_diff.solve_adaptive(max_timestep=t_end - model_time, rtol=1.0e-2)
+        model_time += dt
+
+    assert len(uw.utilities._jitextension._ext_dict) == n_extensions
+    assert adv_diff.adaptive_steps_accepted > 0
+
+    sample_x = np.arange(0, 1, mesh.get_min_radius())
+    sample_y = np.zeros_like(sample_x) + 0.5
+    sample_points = np.column_stack([sample_x, sample_y])
+
+    T_UW = uw.function.evaluate(T.sym[0], sample_points)
+    U_end = U_a_x.subs({u: velocity, t: model_time, x: mesh.X[0], x0: 0.4, x1: 0.6})
+    T_analytical = uw.function.evaluate(U_end, sample_points)
+
+    assert np.allclose(T_UW, T_analytical, atol=0.05)
+
+    del adv_diff
+
+
+def test_advDiff_adaptive_timestep_requires_order_1():
+    mesh = meshStructuredQuadBox
+
+    v = uw.discretisation.MeshVariable("U5", mesh, mesh.dim, degree=1)
+    T = uw.discretisation.MeshVariable("T5", mesh, 1, degree=u_degree)
+
+    adv_diff = uw.systems.AdvDiffusion(mesh, u_Field=T, V_fn=v, order=2)
+    adv_diff.constitutive_model = uw.constitutive_models.DiffusionModel
+    adv_diff.constitutive_model.Parameters.diffusivity = kappa
+
+    # the order 2 history coefficients assume a constant timestep
+    with pytest.raises(RuntimeError):
+        adv_diff.solve_adaptive(max_timestep=1.0e-3)
+
+    del adv_diff
+
+
+def test_advDiff_explicit():
+    mesh = unstructured_simplex_box_regular
+
+    v = uw.discretisation.MeshVariable("U4", mesh, mesh.dim, degree=1)
+    T = uw.discretisation.MeshVariable("T4", mesh, 1, degree=u_degree)
+
+    adv_diff = uw.systems.AdvDiffusion(mesh, u_Field=T, V_fn=v)
+    adv_diff.constitutive_model = uw.constitutive_models.DiffusionModel
+    adv_diff.constitutive_model.Parameters.diffusivity = kappa
+
+    adv_diff.add_dirichlet_bc(0.0, "Left")
+    adv_diff.add_dirichlet_bc(0.0, "Right")
+
+    with mesh.access(v):
+        v.data[:, 1] = velocity
+
+    U_start = U_a_x.subs({u: velocity, t: t_start, x: mesh.X[0], x0: 0.4, x1: 0.6})
+    with mesh.access(T):
+        T.data[:, 0] = uw.function.evaluate(U_start, T.coords)
+
+    model_order = adv_diff.constitutive_model.order
+
+    n_substeps = adv_diff.solve_explicit(timestep=t_end - t_start, order=3)
+    assert n_substeps >= 1
+
+    # the explicit operator shares the model but must not take it over
+    assert adv_diff.constitutive_model.order == model_order
+    assert adv_diff.constitutive_model.Unknowns is adv_diff.Unknowns
+
+    sample_x = np.arange(0, 1, mesh.get_min_radius())
+    sample_y = np.zeros_like(sample_x) + 0.5
+    sample_points = np.column_stack([sample_x, sample_y])
+
+    T_UW = uw.function.evaluate(T.sym[0], sample_points)
+    U_end = U_a_x.subs({u: velocity, t: t_end, x: mesh.X[0], x0: 0.4, x1: 0.6})
+    T_analytical = uw.function.evaluate(U_end, sample_points)
+
+    assert np.allclose(T_UW, T_analytical, atol=0.05)
+
+    del adv_diff
+
+
+def test_advDiff_explicit_parameter_change():
+    mesh = meshStructuredQuadBox
+
+    v = uw.discretisation.MeshVariable("U6", mesh, mesh.dim, degree=1)
+    T = uw.discretisation.MeshVariable("T6", mesh, 1, degree=1)
+
+    adv_diff = uw.systems.AdvDiffusion(mesh, u_Field=T, V_fn=v)
+    adv_diff.constitutive_model = uw.constitutive_models.DiffusionModel
+    adv_diff.constitutive_model.Parameters.diffusivity = 1.0
+
+    adv_diff.add_dirichlet_bc(0.0, "Left")
+    adv_diff.add_dirichlet_bc(0.0, "Right")
+
+    with mesh.access(v, T):
+        v.data[...] = 0.0
+        T.data[:, 0] = np.sin(np.pi * T.coords[:, 0])
+
+    def amplitude():
+        with mesh.access():
+            return T.data[:, 0].max()
+
+    # the decay rate of the sin(pi x) mode follows the diffusivity
+    dt = 0.01
+    T0 = amplitude()
+    adv_diff.solve_explicit(timestep=dt, order=3)
+    T1 = amplitude()
+
+    adv_diff.constitutive_model.Parameters.diffusivity = 2.0
+    adv_diff.solve_explicit(timestep=dt, order=3)
+    T2 = amplitude()
+
+    rate_1 = np.log(T0 / T1) / dt
+    rate_2 = np.log(T1 / T2) / dt
+
+    assert np.isclose(rate_1, np.pi**2, rtol=0.05)
+    assert np.isclose(rate_2, 2.0 * rate_1, rtol=0.05)
+
+    del adv_diff
+
+
 del meshStructuredQuadBox
 del unstructured_simplex_box_irregular
 del unstructured_simplex_box_regular